@@ -1,44 +1,170 @@
 from __future__ import annotations
 
+from typing import Any, Dict, Optional, Tuple
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_PORT, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PORT,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_ADAPTIVE_SCAN_INTERVAL,
+    CONF_BLUETOOTH_ADDRESS,
+    CONF_BLUETOOTH_KEEP_CONNECTED,
+    CONF_CAPTURE_FRAMES,
     CONF_DEVICE_TYPE,
+    CONF_REFRESH_FRESHNESS,
     CONF_SCAN_INTERVAL,
+    CONF_SHUTDOWN_TIMEOUT,
+    CONF_SLAVE_ID,
+    CONF_TIMESERIES,
+    CONF_TRANSPORT,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
+    DEFAULT_DEVICE_ID,
     DEFAULT_DEVICE_TYPE,
+    DEFAULT_REFRESH_FRESHNESS,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SHUTDOWN_TIMEOUT,
+    DEFAULT_TRANSPORT,
     DOMAIN,
     LOGGER,
 )
-from .uart import RenogyActiveUARTCoordinator
+from .services import async_setup_services
+from .uart import RenogyActiveUARTCoordinator, device_address
+
+PLATFORMS = [Platform.SENSOR, Platform.SWITCH]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Renogy UART integration services."""
+    async_setup_services(hass)
+    return True
 
-PLATFORMS = [Platform.SENSOR]
+
+def _entry_config(entry: ConfigEntry) -> Dict[str, Any]:
+    """Return the settings of an entry, with options overriding its data."""
+    return {**entry.data, **entry.options}
+
+
+def _adaptive_bounds(config: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """Return the adaptive interval bounds, or None when adaptive polling is off."""
+    if not config.get(CONF_ADAPTIVE_SCAN_INTERVAL, False):
+        return None
+    return (
+        config.get(CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL),
+        config.get(CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL),
+    )
+
+
+def _bluetooth_address(config: Dict[str, Any]) -> Optional[str]:
+    """Return the address of the BT module to fail over to, if any."""
+    return (config.get(CONF_BLUETOOTH_ADDRESS) or "").strip().upper() or None
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Renogy UART integration from a config entry."""
-    port = entry.data[CONF_PORT]
-    scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-    device_type = entry.data.get(CONF_DEVICE_TYPE, DEFAULT_DEVICE_TYPE)
-
-    LOGGER.info(
-        "Setting up Renogy UART device on %s with scan interval %ss", port, scan_interval
-        )
+    config = _entry_config(entry)
+    port = config[CONF_PORT]
+    scan_interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    device_type = config.get(CONF_DEVICE_TYPE, DEFAULT_DEVICE_TYPE)
+    transport = config.get(CONF_TRANSPORT, DEFAULT_TRANSPORT)
 
     coordinator = RenogyActiveUARTCoordinator(
-        hass, port, device_type, scan_interval
+        hass,
+        port,
+        device_type,
+        scan_interval,
+        transport=transport,
+        host=config.get(CONF_HOST),
+        slave_id=config.get(CONF_SLAVE_ID, DEFAULT_DEVICE_ID),
+        adaptive_bounds=_adaptive_bounds(config),
+        bluetooth_address=_bluetooth_address(config),
+        bluetooth_keep_connected=config.get(CONF_BLUETOOTH_KEEP_CONNECTED, True),
+        capture_frames=config.get(CONF_CAPTURE_FRAMES, False),
+        shutdown_timeout=config.get(CONF_SHUTDOWN_TIMEOUT, DEFAULT_SHUTDOWN_TIMEOUT),
+        refresh_freshness=config.get(CONF_REFRESH_FRESHNESS, DEFAULT_REFRESH_FRESHNESS),
+    )
+    LOGGER.info(
+        "Setting up Renogy device on %s (%s) with scan interval %ss",
+        coordinator.address,
+        transport,
+        scan_interval,
     )
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_set_timeseries(config.get(CONF_TIMESERIES, False))
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await coordinator.async_close()
+        raise
+    coordinator.async_start_polling()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    async def _async_stop(_: Event) -> None:
+        """Bound the wait for an in-flight poll when Home Assistant stops."""
+        await coordinator.async_shutdown()
+
+    # Not async_listen_once: its remover must not be called after it fired
+    entry.async_on_unload(
+        hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, _async_stop)
+    )
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running coordinator.
+
+    Only a different connection, slave ID, device type or Bluetooth setting needs
+    the entry to be reloaded; polling, capture, history and shutdown settings take
+    effect without touching the shared bus.
+    """
+    coordinator: RenogyActiveUARTCoordinator = hass.data[DOMAIN][entry.entry_id]
+    config = _entry_config(entry)
+    address = device_address(
+        config.get(CONF_TRANSPORT, DEFAULT_TRANSPORT),
+        config[CONF_PORT],
+        config.get(CONF_HOST),
+        config.get(CONF_SLAVE_ID, DEFAULT_DEVICE_ID),
+    )
+    device_type = config.get(CONF_DEVICE_TYPE, DEFAULT_DEVICE_TYPE)
+    if (
+        address != coordinator.address
+        or device_type != coordinator.device.device_type
+        or _bluetooth_address(config) != coordinator.bluetooth_address
+        or config.get(CONF_BLUETOOTH_KEEP_CONNECTED, True)
+        != coordinator.bluetooth_keep_connected
+    ):
+        LOGGER.info("Reloading Renogy device %s for its new settings", coordinator.address)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    coordinator.async_set_polling(
+        config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        _adaptive_bounds(config),
+        config.get(CONF_REFRESH_FRESHNESS, DEFAULT_REFRESH_FRESHNESS),
+    )
+    coordinator.shutdown_timeout = config.get(
+        CONF_SHUTDOWN_TIMEOUT, DEFAULT_SHUTDOWN_TIMEOUT
+    )
+    await coordinator.async_set_capture(config.get(CONF_CAPTURE_FRAMES, False))
+    await coordinator.async_set_timeseries(config.get(CONF_TIMESERIES, False))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a Renogy UART config entry."""
     coordinator: RenogyActiveUARTCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
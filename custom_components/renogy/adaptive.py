@@ -0,0 +1,89 @@
+"""Adaptive scan interval driven by solar activity and signal variability."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Mapping, Optional
+
+# Signals watched for activity -> floor of the scale their variation is measured against
+ADAPTIVE_SIGNALS: Dict[str, float] = {
+    "pv_power": 10.0,  # W
+    "load_power": 5.0,  # W
+    "battery_current": 0.5,  # A
+}
+# Signals whose change marks a state transition worth sampling quickly
+ADAPTIVE_STATE_KEYS = ("charging_status", "load_status")
+# Number of recent samples the variability is computed over
+ADAPTIVE_WINDOW = 5
+# Relative standard deviation at which the shortest interval is used
+ADAPTIVE_FULL_ACTIVITY = 0.2
+# Largest factor the interval may grow by per poll; shortening is immediate
+ADAPTIVE_MAX_GROWTH = 1.5
+# Sun elevation band (degrees) treated as dawn/dusk
+SUN_NIGHT_ELEVATION = -6.0
+SUN_TWILIGHT_ELEVATION = 10.0
+# Minimum activity assumed around sunrise and sunset
+TWILIGHT_ACTIVITY = 0.5
+
+
+class AdaptiveInterval:
+    """Choose the next scan interval from recent device activity.
+
+    Activity is the largest relative variability of the watched signals over
+    the last few polls, forced to full on charging or load state changes. The
+    interval moves geometrically between the bounds: full activity polls at
+    the shortest interval, none at the longest. The sun's elevation, when
+    known, serves as a prior that keeps sampling fast around dawn and dusk.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float) -> None:
+        """Initialize the adaptive interval."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self._samples: Dict[str, Deque[float]] = {
+            key: deque(maxlen=ADAPTIVE_WINDOW) for key in ADAPTIVE_SIGNALS
+        }
+        self._states: Dict[str, Any] = {}
+
+    def activity(
+        self, data: Mapping[str, Any], sun_elevation: Optional[float] = None
+    ) -> float:
+        """Record a snapshot and return the current activity between 0 and 1."""
+        activity = 0.0
+        for key, floor in ADAPTIVE_SIGNALS.items():
+            value = data.get(key)
+            if not isinstance(value, (int, float)):
+                continue
+            samples = self._samples[key]
+            samples.append(float(value))
+            if len(samples) < 2:
+                continue
+            mean = sum(samples) / len(samples)
+            deviation = math.sqrt(sum((x - mean) ** 2 for x in samples) / len(samples))
+            activity = max(activity, deviation / max(abs(mean), floor) / ADAPTIVE_FULL_ACTIVITY)
+
+        for key in ADAPTIVE_STATE_KEYS:
+            if key not in data:
+                continue
+            if key in self._states and self._states[key] != data[key]:
+                activity = 1.0
+            self._states[key] = data[key]
+
+        if (
+            sun_elevation is not None
+            and SUN_NIGHT_ELEVATION <= sun_elevation < SUN_TWILIGHT_ELEVATION
+        ):
+            activity = max(activity, TWILIGHT_ACTIVITY)
+
+        return min(activity, 1.0)
+
+    def update(
+        self, data: Mapping[str, Any], sun_elevation: Optional[float] = None
+    ) -> float:
+        """Record a snapshot and return the interval until the next poll."""
+        activity = self.activity(data, sun_elevation)
+        target = self.min_interval * (self.max_interval / self.min_interval) ** (1 - activity)
+        self.interval = min(target, self.interval * ADAPTIVE_MAX_GROWTH)
+        return self.interval
@@ -5,11 +5,11 @@ import logging
 import re
 import traceback
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from bleak.backends.device import BLEDevice
 from bleak.exc import BleakError
-from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
+from bluetooth_data_tools import monotonic_time_coarse
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth import (
     BluetoothChange,
@@ -20,19 +20,38 @@ from homeassistant.components.bluetooth.active_update_coordinator import (
     ActiveBluetoothDataUpdateCoordinator,
 )
 from homeassistant.core import CoreState, HomeAssistant, callback
-from homeassistant.helpers.event import async_track_time_interval
 
 from .const import (
+    BLE_ADAPTER_RSSI_MARGIN,
     COMMANDS,
     DEFAULT_DEVICE_ID,
     DEFAULT_DEVICE_TYPE,
+    DEFAULT_REFRESH_FRESHNESS,
     DEFAULT_SCAN_INTERVAL,
     LOGGER,
-    MAX_NOTIFICATION_WAIT_TIME,
-    RENOGY_READ_CHAR_UUID,
-    RENOGY_WRITE_CHAR_UUID,
-    UNAVAILABLE_RETRY_INTERVAL,
 )
+from .ble_session import RenogyBleSession
+from .ble_signal import (
+    KEY_BLE_SIGNAL_FAILURES,
+    interval_factor,
+    poll_blocker,
+    poll_priority,
+    signal_weak,
+)
+from .ble_slots import KEY_BLE_SLOT_WAIT, async_get_ble_slots
+from .device import RenogyDevice
+from .modbus import (
+    build_rtu_frame,
+    check_pdu,
+    decode_registers,
+    modbus_crc,
+    read_pdu,
+    write_register_pdu,
+    write_registers_pdu,
+)
+from .phase import async_get_phase_planner, next_refresh
+from .scheduler import Priority
+from .singleflight import SingleFlight
 
 try:
     from renogy_ble import RenogyParser
@@ -44,22 +63,6 @@ except ImportError:
     PARSER_AVAILABLE = False
 
 
-def modbus_crc(data: bytes) -> tuple:
-    """Calculate the Modbus CRC16 of the given data.
-
-    Returns a tuple (crc_low, crc_high) where the low byte is sent first.
-    """
-    crc = 0xFFFF
-    for pos in data:
-        crc ^= pos
-        for _ in range(8):
-            if crc & 0x0001:
-                crc = (crc >> 1) ^ 0xA001
-            else:
-                crc >>= 1
-    return (crc & 0xFF, (crc >> 8) & 0xFF)
-
-
 def create_modbus_read_request(
     device_id: int, function_code: int, register: int, word_count: int
 ) -> bytearray:
@@ -97,7 +100,7 @@ def clean_device_name(name: str) -> str:
         return ""
 
 
-class RenogyBLEDevice:
+class RenogyBLEDevice(RenogyDevice):
     """Representation of a Renogy BLE device."""
 
     def __init__(
@@ -107,98 +110,35 @@ class RenogyBLEDevice:
         device_type: str = DEFAULT_DEVICE_TYPE,
     ):
         """Initialize the Renogy BLE device."""
+        super().__init__(
+            ble_device.address,
+            clean_device_name(ble_device.name) or "Unknown Renogy Device",
+            device_type,
+        )
         self.ble_device = ble_device
-        self.address = ble_device.address
-
-        cleaned_name = clean_device_name(ble_device.name)
-        self.name = cleaned_name or "Unknown Renogy Device"
 
         # Use the provided advertisement RSSI if available, otherwise set to None
         self.rssi = advertisement_rssi
         self.last_seen = datetime.now()
         # To store last received data
         self.data: Optional[Dict[str, Any]] = None
-        # Track consecutive failures
-        self.failure_count = 0
-        # Maximum allowed failures before marking device unavailable
-        self.max_failures = 3
-        # Device availability tracking
-        self.available = True
-        # Parsed data from device
-        self.parsed_data: Dict[str, Any] = {}
-        # Device type - set from configuration
-        self.device_type = device_type
-        # Track when device was last marked as unavailable
-        self.last_unavailable_time: Optional[datetime] = None
-
-    @property
-    def is_available(self) -> bool:
-        """Return True if device is available."""
-        return self.available and self.failure_count < self.max_failures
-
-    @property
-    def should_retry_connection(self) -> bool:
-        """Check if we should retry connecting to an unavailable device."""
-        if self.is_available:
-            return True
+        # Failed polls blamed on a weak signal rather than on the device
+        self.signal_failures = 0
 
-        # If we've never set an unavailable time, set it now
-        if self.last_unavailable_time is None:
-            self.last_unavailable_time = datetime.now()
-            return False
+    def record_signal_failure(self, error: Optional[Exception] = None) -> None:
+        """Count a failed poll on a weak signal without holding it against the device.
 
-        # Check if enough time has elapsed since the last poll
-        retry_time = self.last_unavailable_time + timedelta(
-            minutes=UNAVAILABLE_RETRY_INTERVAL
+        Such failures do not mark the device unavailable; Home Assistant does
+        that once it stops receiving its advertisements.
+        """
+        self.signal_failures += 1
+        LOGGER.info(
+            "Communication failure with Renogy device %s at %s dBm, counted as a signal failure (#%s).%s",
+            self.name,
+            self.rssi,
+            self.signal_failures,
+            f" Error message: {error}" if error else "",
         )
-        if datetime.now() >= retry_time:
-            LOGGER.debug(
-                "Retry interval reached for unavailable device %s. Attempting reconnection...",
-                self.name,
-            )
-            # Reset the unavailable time for the next retry interval
-            self.last_unavailable_time = datetime.now()
-            return True
-
-        return False
-
-    def update_availability(
-        self, success: bool, error: Optional[Exception] = None
-    ) -> None:
-        """Update the availability based on success/failure of communication."""
-        if success:
-            if self.failure_count > 0:
-                LOGGER.info(
-                    "Device %s communication restored after %s consecutive failures",
-                    self.name,
-                    self.failure_count,
-                )
-            self.failure_count = 0
-            if not self.available:
-                LOGGER.info("Device %s is now available", self.name)
-                self.available = True
-                self.last_unavailable_time = None
-        else:
-            self.failure_count += 1
-            error_msg = f" Error message: {str(error)}" if error else ""
-            LOGGER.info(
-                "Communication failure with Renogy device: %s. (Consecutive polling failure #%s. Device will be marked unavailable after %s failures.)%s",
-                self.name,
-                self.failure_count,
-                self.max_failures,
-                error_msg,
-            )
-
-            if self.failure_count >= self.max_failures and self.available:
-                error_msg = f". Error message: {str(error)}" if error else ""
-                LOGGER.error(
-                    "Renogy device %s marked unavailable after %s consecutive polling failures%s",
-                    self.name,
-                    self.max_failures,
-                    error_msg,
-                )
-                self.available = False
-                self.last_unavailable_time = datetime.now()
 
     def update_parsed_data(
         self, raw_data: bytes, register: int, cmd_name: str = "unknown"
@@ -304,6 +244,106 @@ class RenogyBLEDevice:
             return False
 
 
+class RenogyBleLink:
+    """Register reads and writes through a BT module, as a failover transport.
+
+    The connection is opened on first use together with its adapter slot.
+    In keep-connected mode it is held while the link is in use, and the
+    failover closes it when traffic moves back to the primary; otherwise
+    it is closed at the end of every poll.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, address: str, keep_connected: bool = True
+    ) -> None:
+        """Initialize the link."""
+        self.name = f"bluetooth:{address}"
+        self.address = address
+        self._hass = hass
+        self._session = RenogyBleSession(address, keep_connected)
+        self._slots = async_get_ble_slots(hass)
+        # One request at a time over the session
+        self._lock = asyncio.Lock()
+        # Seconds connecting waited for an adapter slot, until the next poll reports it
+        self.slot_wait = 0.0
+        # Requests that failed while the signal was weak
+        self.signal_failures = 0
+
+    async def _async_connect(self, priority: Priority) -> None:
+        """Connect through the adapter hearing the device, holding one of its slots."""
+        if self._session.connected:
+            return
+        service_info = bluetooth.async_last_service_info(
+            self._hass, self.address, connectable=True
+        )
+        if service_info is None:
+            raise BleakError(f"Device {self.address} is not in range")
+        age = monotonic_time_coarse() - service_info.time
+        if (reason := poll_blocker(service_info.rssi, age)) is not None:
+            raise BleakError(f"Not connecting to {self.address}: {reason}")
+        # The session holds the slot until the connection closes or drops
+        lease = await self._slots.async_acquire(service_info.source, priority)
+        self.slot_wait += lease.waited
+        await self._session.async_connect(service_info.device, lease)
+
+    async def _async_request(self, pdu: bytes, priority: Priority) -> bytes:
+        """Send a request PDU to the device and return the response PDU."""
+        async with self._lock:
+            try:
+                await self._async_connect(priority)
+                response = await self._session.async_request(
+                    build_rtu_frame(DEFAULT_DEVICE_ID, pdu)
+                )
+            except BleakError:
+                await self._session.async_disconnect()
+                self._count_signal_failure()
+                raise
+            except TimeoutError:
+                # The session has already dropped itself if the module went silent
+                self._count_signal_failure()
+                raise
+        response_pdu = response[1:-2]
+        check_pdu(pdu, response_pdu)
+        return response_pdu
+
+    def _count_signal_failure(self) -> None:
+        """Count a failed request if the signal was weak, as it likely caused it."""
+        service_info = bluetooth.async_last_service_info(
+            self._hass, self.address, connectable=True
+        )
+        if service_info is not None and signal_weak(service_info.rssi):
+            self.signal_failures += 1
+
+    async def async_read_registers(
+        self, register: int, word_count: int, priority: Priority
+    ) -> List[int]:
+        """Read a block of holding registers."""
+        return decode_registers(
+            await self._async_request(read_pdu(register, word_count), priority)
+        )
+
+    async def async_write_register(
+        self, register: int, value: int, priority: Priority
+    ) -> None:
+        """Write a single holding register."""
+        await self._async_request(write_register_pdu(register, value), priority)
+
+    async def async_write_registers(
+        self, register: int, values: List[int], priority: Priority
+    ) -> None:
+        """Write a block of holding registers."""
+        await self._async_request(write_registers_pdu(register, values), priority)
+
+    async def async_release(self) -> None:
+        """End a poll, closing the connection unless it is kept."""
+        async with self._lock:
+            await self._session.async_release()
+
+    async def async_close(self) -> None:
+        """Close the connection."""
+        await self._session.async_disconnect()
+
+
 class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
     """Class to manage fetching Renogy BLE data via active connections."""
 
@@ -316,6 +356,8 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
         scan_interval: int = DEFAULT_SCAN_INTERVAL,
         device_type: str = DEFAULT_DEVICE_TYPE,
         device_data_callback: Optional[Callable[[RenogyBLEDevice], None]] = None,
+        keep_connected: bool = False,
+        refresh_freshness: float = DEFAULT_REFRESH_FRESHNESS,
     ):
         """Initialize the coordinator."""
         super().__init__(
@@ -349,6 +391,24 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
         # Add connection lock to prevent multiple concurrent connections
         self._connection_lock = asyncio.Lock()
         self._connection_in_progress = False
+        # Concurrent refresh requests share one poll
+        self._refresh: SingleFlight[None] = SingleFlight(
+            hass, f"Renogy BLE {address} poll", refresh_freshness
+        )
+        # GATT connection, held across polls in keep-connected mode
+        self._session = RenogyBleSession(address, keep_connected)
+        # Connection slots shared with the other devices on each adapter
+        self._slots = async_get_ble_slots(hass)
+        # Seconds the last poll waited for a connection slot
+        self.slot_wait = 0.0
+        # Task currently reading the device, cancelled when polling stops
+        self._poll_task: Optional[asyncio.Task] = None
+
+        # Each BLE device gets its own phase so connections are spread out
+        self._phase_planner = async_get_phase_planner(hass)
+        self._unregister_phase = self._phase_planner.async_register(
+            address, f"bluetooth:{address}", self._async_phase_changed
+        )
 
     @property
     def device_type(self) -> str:
@@ -364,13 +424,6 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
         """Request a refresh."""
         self.logger.debug("Manual refresh requested for device %s", self.address)
 
-        # If a connection is already in progress, don't start another one
-        if self._connection_in_progress:
-            self.logger.debug(
-                "Connection already in progress, skipping refresh request"
-            )
-            return
-
         # Get the last available service info for this device
         service_info = bluetooth.async_last_service_info(self.hass, self.address)
         if not service_info:
@@ -418,23 +471,59 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
         for update_callback in self._listeners:
             update_callback()
 
+    @callback
+    def _async_phase_changed(self) -> None:
+        """Move the pending refresh to the device's new phase."""
+        if self._unsub_refresh:
+            self._schedule_refresh()
+
     def _schedule_refresh(self) -> None:
-        """Schedule a refresh with the update interval."""
+        """Schedule the next refresh at the device's phase within the interval."""
         if self._unsub_refresh:
             self._unsub_refresh()
             self._unsub_refresh = None
 
-        # Schedule the next refresh based on our scan interval
-        self._unsub_refresh = async_track_time_interval(
-            self.hass, self._handle_refresh_interval, self.update_interval
+        loop = self.hass.loop
+        interval = self.update_interval.total_seconds()
+        when = next_refresh(
+            loop.time(), interval, self._phase_planner.offset(self.address, interval)
+        )
+        self._unsub_refresh = loop.call_at(when, self._async_handle_phase_tick).cancel
+        self.logger.debug(
+            "Scheduled next refresh in %.1f seconds", when - loop.time()
         )
-        self.logger.debug("Scheduled next refresh in %s seconds", self.scan_interval)
+
+    @callback
+    def _async_handle_phase_tick(self) -> None:
+        """Start the scheduled refresh and schedule the next one."""
+        self._unsub_refresh = None
+        self.hass.async_create_task(self._handle_refresh_interval())
+        self._schedule_refresh()
 
     async def _handle_refresh_interval(self, _now=None):
         """Handle a refresh interval occurring."""
+        service_info = bluetooth.async_last_service_info(self.hass, self.address)
+        if service_info is not None:
+            if (reason := self._poll_blocker(service_info)) is not None:
+                self.logger.debug("Not polling %s: %s", self.address, reason)
+                return
+            # Weak devices skip ticks until their longer spacing has passed
+            spacing = self.scan_interval * interval_factor(service_info.rssi)
+            if (
+                self.last_poll_time is not None
+                and (datetime.now() - self.last_poll_time).total_seconds()
+                < spacing - self.scan_interval / 2
+            ):
+                return
         self.logger.debug("Regular interval refresh for %s", self.address)
         await self.async_request_refresh()
 
+    def _poll_blocker(self, service_info: BluetoothServiceInfoBleak) -> Optional[str]:
+        """Return why connecting to the device is not worth trying, or None."""
+        return poll_blocker(
+            service_info.rssi, monotonic_time_coarse() - service_info.time
+        )
+
     def async_start(self) -> Callable[[], None]:
         """Start polling."""
         self.logger.debug("Starting polling for device %s", self.address)
@@ -470,6 +559,15 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
         if self._unsub_refresh:
             self._unsub_refresh()
             self._unsub_refresh = None
+        self._unregister_phase()
+
+        # Don't let a connection attempt or a silent device hold up the unload
+        if self._poll_task is not None and not self._poll_task.done():
+            self.logger.debug("Cancelling in-flight poll of %s", self.address)
+            self._poll_task.cancel()
+        self._poll_task = None
+        if self._session.connected:
+            self.hass.async_create_task(self._session.async_disconnect())
 
         self._async_cancel_bluetooth_subscription()
 
@@ -502,6 +600,11 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
             self.logger.debug("Connection already in progress, skipping poll")
             return False
 
+        # Don't burn connection attempts on stale or out-of-range devices
+        if (reason := self._poll_blocker(service_info)) is not None:
+            self.logger.debug("Not polling %s: %s", service_info.address, reason)
+            return False
+
         # If we've never polled or it's been longer than the scan interval, poll
         if last_poll is None:
             self.logger.debug("First poll for device %s", service_info.address)
@@ -509,7 +612,9 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
 
         # Check if enough time has elapsed since the last poll
         time_since_poll = datetime.now().timestamp() - last_poll
-        should_poll = time_since_poll >= self.scan_interval
+        should_poll = time_since_poll >= self.scan_interval * interval_factor(
+            service_info.rssi
+        )
 
         if should_poll:
             self.logger.debug(
@@ -525,6 +630,7 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
         async with self._connection_lock:
             try:
                 self._connection_in_progress = True
+                self._poll_task = asyncio.current_task()
                 success = False
                 error = None
 
@@ -584,81 +690,38 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
                     device.address,
                 )
 
-                # Use bleak-retry-connector for more robust connection
+                # Reuses the kept session, or connects for this poll
                 try:
-                    # Establish connection with retry capability
-                    client = await establish_connection(
-                        BleakClientWithServiceCache,
-                        service_info.device,
-                        device.name or device.address,
-                        max_attempts=3,
-                    )
+                    await self._async_connect(service_info)
 
                     any_command_succeeded = False
 
                     try:
-                        self.logger.debug("Connected to device %s", device.name)
-
-                        # Create an event that will be set when notification data is received
-                        notification_event = asyncio.Event()
-                        notification_data = bytearray()
-
-                        def notification_handler(sender, data):
-                            notification_data.extend(data)
-                            notification_event.set()
-
-                        await client.start_notify(
-                            RENOGY_READ_CHAR_UUID, notification_handler
+                        commands = COMMANDS[self.device_type]
+                        requests = [
+                            create_modbus_read_request(DEFAULT_DEVICE_ID, *cmd)
+                            for cmd in commands.values()
+                        ]
+                        self.logger.debug(
+                            "Sending %s commands to %s", len(requests), device.name
                         )
+                        responses = await self._session.async_request_many(requests)
 
-                        for cmd_name, cmd in COMMANDS[self.device_type].items():
-                            notification_data.clear()
-                            notification_event.clear()
-
-                            modbus_request = create_modbus_read_request(
-                                DEFAULT_DEVICE_ID, *cmd
-                            )
-                            self.logger.debug(
-                                "Sending %s command: %s",
-                                cmd_name,
-                                list(modbus_request),
-                            )
-                            await client.write_gatt_char(
-                                RENOGY_WRITE_CHAR_UUID, modbus_request
-                            )
-
-                            # Expected length: 3 header bytes + 2*word_count data + 2‑byte CRC
-                            word_count = cmd[2]
-                            expected_len = 3 + word_count * 2 + 2
-                            start_time = self.hass.loop.time()
-
-                            try:
-                                while len(notification_data) < expected_len:
-                                    remaining = MAX_NOTIFICATION_WAIT_TIME - (
-                                        self.hass.loop.time() - start_time
-                                    )
-                                    if remaining <= 0:
-                                        raise asyncio.TimeoutError()
-                                    await asyncio.wait_for(
-                                        notification_event.wait(), remaining
-                                    )
-                                    notification_event.clear()
-                            except asyncio.TimeoutError:
+                        for (cmd_name, cmd), result_data in zip(
+                            commands.items(), responses
+                        ):
+                            if result_data is None:
                                 self.logger.info(
-                                    "Timeout – only %s / %s bytes received for %s from device %s",
-                                    len(notification_data),
-                                    expected_len,
+                                    "Timeout waiting for %s from device %s",
                                     cmd_name,
                                     device.name,
                                 )
                                 continue
 
-                            result_data = bytes(notification_data[:expected_len])
                             self.logger.debug(
-                                "Received %s data length: %s (expected %s)",
+                                "Received %s data length: %s",
                                 cmd_name,
                                 len(result_data),
-                                expected_len,
                             )
 
                             cmd_success = device.update_parsed_data(
@@ -679,7 +742,6 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
                                     device.name,
                                 )
 
-                        await client.stop_notify(RENOGY_READ_CHAR_UUID)
                         success = any_command_succeeded
                         if not success:
                             error = Exception("No commands completed successfully")
@@ -690,30 +752,16 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
                         )
                         error = e
                         success = False
+                        await self._session.async_disconnect()
                     except Exception as e:
                         self.logger.error(
                             "Error reading data from device %s: %s", device.name, str(e)
                         )
                         error = e
                         success = False
+                        await self._session.async_disconnect()
                     finally:
-                        # BleakClientWithServiceCache handles disconnect in context manager
-                        # but we need to ensure the client is disconnected
-                        if client.is_connected:
-                            try:
-                                await client.disconnect()
-                                self.logger.debug(
-                                    "Disconnected from device %s", device.name
-                                )
-                            except Exception as e:
-                                self.logger.debug(
-                                    "Error disconnecting from device %s: %s",
-                                    device.name,
-                                    str(e),
-                                )
-                                # Don't override previous errors with disconnect errors
-                                if error is None:
-                                    error = e
+                        await self._session.async_release()
 
                 except (BleakError, asyncio.TimeoutError) as connection_error:
                     self.logger.info(
@@ -725,25 +773,78 @@ class RenogyActiveBluetoothCoordinator(ActiveBluetoothDataUpdateCoordinator):
                     success = False
 
                 # Always update the device availability and last_update_success
-                device.update_availability(success, error)
+                if not success and signal_weak(device.rssi):
+                    device.record_signal_failure(error)
+                else:
+                    device.update_availability(success, error)
                 self.last_update_success = success
 
                 # Update coordinator data if successful
                 if success and device.parsed_data:
                     self.data = dict(device.parsed_data)
+                    self.data[KEY_BLE_SLOT_WAIT] = self.slot_wait
+                    self.data[KEY_BLE_SIGNAL_FAILURES] = device.signal_failures
                     self.logger.debug("Updated coordinator data: %s", self.data)
 
                 return success
             finally:
                 self._connection_in_progress = False
+                self._poll_task = None
+
+    async def _async_connect(self, service_info: BluetoothServiceInfoBleak) -> None:
+        """Connect through an adapter once one of its slots is free.
+
+        A kept session already has its connection, and its slot, and polls
+        without waiting. Otherwise the session holds the slot until the
+        connection closes or drops.
+        """
+        if self._session.connected:
+            self.slot_wait = 0.0
+            return
+
+        paths = {
+            scanner_device.scanner.source: scanner_device
+            for scanner_device in bluetooth.async_scanner_devices_by_address(
+                self.hass, self.address, connectable=True
+            )
+        }
+        # Weak devices only connect through the adapter hearing them best
+        rssi = service_info.rssi
+        if paths:
+            source = self._slots.choose(
+                [(source, path.advertisement.rssi) for source, path in paths.items()],
+                margin=0 if signal_weak(rssi) else BLE_ADAPTER_RSSI_MARGIN,
+            )
+            ble_device = paths[source].ble_device
+        else:
+            source, ble_device = service_info.source, service_info.device
+
+        lease = await self._slots.async_acquire(source, poll_priority(rssi))
+        self.slot_wait = lease.waited
+        self.logger.debug(
+            "Connecting to %s through %s after waiting %.1fs for a slot",
+            self.address,
+            source,
+            lease.waited,
+        )
+        await self._session.async_connect(ble_device, lease)
 
     async def _async_poll(self, service_info: BluetoothServiceInfoBleak) -> None:
-        """Poll the device."""
-        # If a connection is already in progress, don't start another one
-        if self._connection_in_progress:
-            self.logger.debug("Connection already in progress, skipping poll")
+        """Poll the device, sharing a poll already in flight.
+
+        A request shortly after a successful poll is served from its data.
+        """
+        if (
+            self._refresh.task is None
+            and self._refresh.fresh
+            and self.last_update_success
+        ):
+            self.logger.debug("Serving refresh of %s from the last poll", self.address)
             return
+        await self._refresh.async_run(self._async_poll_device(service_info))
 
+    async def _async_poll_device(self, service_info: BluetoothServiceInfoBleak) -> None:
+        """Connect to the device and read it."""
         self.last_poll_time = datetime.now()
         self.logger.debug(
             "Polling device: %s (%s)", service_info.name, service_info.address
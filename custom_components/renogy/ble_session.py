@@ -0,0 +1,256 @@
+"""GATT sessions with Renogy BT-1/BT-2 modules."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from bleak.backends.device import BLEDevice
+from bleak.exc import BleakError
+from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
+
+from .const import (
+    BLE_RECONNECT_BACKOFF_MAX,
+    BLE_RECONNECT_BACKOFF_MIN,
+    LOGGER,
+    MAX_NOTIFICATION_WAIT_TIME,
+    RENOGY_READ_CHAR_UUID,
+    RENOGY_WRITE_CHAR_UUID,
+)
+from .modbus import RtuFrameReassembler, rtu_response_matches
+
+if TYPE_CHECKING:
+    from .ble_slots import SlotLease
+
+
+class RenogyBleSession:
+    """A GATT connection and notification subscription to one BT module.
+
+    By default the connection is opened for each poll and closed after it.
+    In keep-connected mode it is held across polls, which saves the
+    connection setup that dominates each poll. A session that stops
+    answering while still reporting itself connected is treated as dropped,
+    and reconnecting after a failure backs off exponentially.
+
+    Responses are reassembled from notifications as a byte stream, so a
+    batch of requests can be sent back-to-back and the responses matched in
+    order. Modules that do not queue requests fall back to lockstep.
+
+    The adapter slot a connection was opened with is held by the session
+    and given back when the connection closes or drops, so a kept
+    connection keeps counting against the adapter's capacity.
+    """
+
+    def __init__(self, name: str, keep_connected: bool = False) -> None:
+        """Initialize the session."""
+        self.name = name
+        self.keep_connected = keep_connected
+        self._client: Optional[BleakClientWithServiceCache] = None
+        # Adapter slot held by the open connection
+        self._lease: Optional[SlotLease] = None
+        self._reassembler = RtuFrameReassembler()
+        self._frames: asyncio.Queue[bytes] = asyncio.Queue()
+        # Bytes received over the session, to tell a silent link from a slow one
+        self._received = 0
+        # Cleared for good once the module fails to answer a pipelined batch
+        self.pipelining = True
+        self._backoff = 0.0
+        self._next_attempt = 0.0
+
+    @property
+    def connected(self) -> bool:
+        """Return whether the GATT connection is up."""
+        return self._client is not None and self._client.is_connected
+
+    def _on_notification(self, _sender: object, data: bytearray) -> None:
+        """Collect a response fragment."""
+        self._received += len(data)
+        for frame in self._reassembler.feed(data):
+            self._frames.put_nowait(frame)
+
+    def _on_disconnected(self, client: BleakClientWithServiceCache) -> None:
+        """Forget a connection the device or adapter dropped."""
+        if client is self._client:
+            LOGGER.debug("BLE session with %s was disconnected", self.name)
+            self._client = None
+            self._release_slot()
+
+    def _release_slot(self) -> None:
+        """Give back the adapter slot of the connection."""
+        lease, self._lease = self._lease, None
+        if lease is not None:
+            lease.release()
+
+    async def async_connect(
+        self, ble_device: BLEDevice, lease: Optional[SlotLease] = None
+    ) -> None:
+        """Open the connection and subscribe to notifications, unless already open.
+
+        The session takes over `lease`, the adapter slot to connect with,
+        releasing it at once if no connection is made.
+        """
+        try:
+            await self._async_connect(ble_device)
+        except BaseException:
+            if lease is not None:
+                lease.release()
+            raise
+        if lease is None or lease is self._lease:
+            return
+        if self._lease is None and self._client is not None:
+            self._lease = lease
+        else:
+            # Already connected with a slot of its own
+            lease.release()
+
+    async def _async_connect(self, ble_device: BLEDevice) -> None:
+        """Open the connection, unless already open."""
+        if self.connected:
+            return
+        loop = asyncio.get_running_loop()
+        if self.keep_connected and (wait := self._next_attempt - loop.time()) > 0:
+            raise BleakError(f"Reconnecting to {self.name} in {wait:.0f}s")
+
+        client = None
+        try:
+            client = await establish_connection(
+                BleakClientWithServiceCache,
+                ble_device,
+                self.name,
+                disconnected_callback=self._on_disconnected,
+                max_attempts=3,
+            )
+            await client.start_notify(RENOGY_READ_CHAR_UUID, self._on_notification)
+        except (BleakError, asyncio.TimeoutError):
+            if client is not None:
+                await self._async_disconnect_client(client)
+            self._backoff = min(
+                max(self._backoff * 2, BLE_RECONNECT_BACKOFF_MIN),
+                BLE_RECONNECT_BACKOFF_MAX,
+            )
+            self._next_attempt = loop.time() + self._backoff
+            raise
+        self._client = client
+        self._backoff = 0.0
+        LOGGER.debug("Connected to device %s", self.name)
+
+    def _reset(self) -> None:
+        """Drop responses and fragments left over from earlier requests."""
+        self._reassembler.clear()
+        while not self._frames.empty():
+            self._frames.get_nowait()
+
+    async def _async_write(self, frame: bytes) -> None:
+        """Send a request frame."""
+        if self._client is None:
+            raise BleakError(f"Not connected to {self.name}")
+        await self._client.write_gatt_char(RENOGY_WRITE_CHAR_UUID, frame)
+
+    async def _async_response_to(self, request: bytes) -> Optional[bytes]:
+        """Wait for the response to a request, skipping stale ones."""
+        try:
+            async with asyncio.timeout(MAX_NOTIFICATION_WAIT_TIME):
+                while True:
+                    response = await self._frames.get()
+                    if rtu_response_matches(request, response):
+                        return response
+                    LOGGER.debug("Skipping stale response from %s", self.name)
+        except TimeoutError:
+            return None
+
+    async def async_request(self, frame: bytes) -> bytes:
+        """Send a request and return the response frame, or raise TimeoutError.
+
+        A request that gets no answer at all drops the session, since a link
+        that is up but silent is not going to recover on its own.
+        """
+        self._reset()
+        received = self._received
+        await self._async_write(frame)
+        if (response := await self._async_response_to(frame)) is not None:
+            return response
+        await self._async_handle_silence(received)
+        raise TimeoutError(f"No response from {self.name}")
+
+    async def async_request_many(
+        self, frames: Sequence[bytes]
+    ) -> List[Optional[bytes]]:
+        """Send a batch of requests and return their responses, None if unanswered.
+
+        The batch is pipelined while the module keeps up. If any response is
+        missing or out of order, the batch is repeated in lockstep and later
+        batches are sent in lockstep too. Responses are only told apart by
+        their function and length, so after a missing one nothing is sent
+        until the responses still in flight have arrived and been dropped.
+        """
+        if self.pipelining and len(frames) > 1:
+            self._reset()
+            for frame in frames:
+                await self._async_write(frame)
+            responses = [await self._async_response_to(frame) for frame in frames]
+            if all(response is not None for response in responses):
+                return responses
+            LOGGER.debug(
+                "%s does not answer pipelined requests, falling back to lockstep",
+                self.name,
+            )
+            self.pipelining = False
+            await self._async_drain()
+
+        responses = []
+        for frame in frames:
+            self._reset()
+            received = self._received
+            await self._async_write(frame)
+            responses.append(response := await self._async_response_to(frame))
+            if response is None:
+                if await self._async_handle_silence(received):
+                    return responses + [None] * (len(frames) - len(responses))
+                await self._async_drain()
+        return responses
+
+    async def _async_drain(self) -> None:
+        """Wait until no more responses arrive, then drop the ones that did.
+
+        A late response to an abandoned request can have the same shape as
+        the response to the next one, e.g. two single-register reads.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + MAX_NOTIFICATION_WAIT_TIME
+        while loop.time() < deadline:
+            received = self._received
+            await asyncio.sleep(MAX_NOTIFICATION_WAIT_TIME / 2)
+            if self._received == received:
+                break
+        self._reset()
+
+    async def _async_handle_silence(self, received: int) -> bool:
+        """Drop the session if nothing came back since; return whether it was."""
+        if self._received != received:
+            return False
+        LOGGER.debug("BLE session with %s went silent, dropping it", self.name)
+        await self.async_disconnect()
+        return True
+
+    async def async_release(self) -> None:
+        """End a poll, closing the connection unless it is kept."""
+        if not self.keep_connected:
+            await self.async_disconnect()
+
+    async def async_disconnect(self) -> None:
+        """Close the connection."""
+        client, self._client = self._client, None
+        try:
+            if client is not None:
+                await self._async_disconnect_client(client)
+        finally:
+            self._release_slot()
+
+    async def _async_disconnect_client(self, client: BleakClientWithServiceCache) -> None:
+        """Disconnect a client, ignoring errors from a connection already gone."""
+        try:
+            if client.is_connected:
+                await client.disconnect()
+            LOGGER.debug("Disconnected from device %s", self.name)
+        except BleakError as err:
+            LOGGER.debug("Error disconnecting from device %s: %s", self.name, err)
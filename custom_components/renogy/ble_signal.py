@@ -0,0 +1,47 @@
+"""Gating and prioritization of BLE polls by signal strength and freshness."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from .const import (
+    BLE_STALE_ADVERTISEMENT,
+    BLE_UNUSABLE_RSSI,
+    BLE_WEAK_INTERVAL_FACTOR,
+    BLE_WEAK_RSSI,
+)
+from .scheduler import Priority
+
+# Snapshot key of the number of polls that failed while the signal was weak
+KEY_BLE_SIGNAL_FAILURES = "ble_signal_failures"
+
+
+def signal_weak(rssi: Optional[int]) -> bool:
+    """Return whether a failure at this RSSI is likely the signal's fault."""
+    return rssi is not None and rssi < BLE_WEAK_RSSI
+
+
+def interval_factor(rssi: Optional[int]) -> float:
+    """Return how many scan intervals apart a device should be polled.
+
+    Strong devices are polled every interval; below the weak threshold the
+    spacing grows linearly up to BLE_WEAK_INTERVAL_FACTOR at the unusable one.
+    """
+    if not signal_weak(rssi):
+        return 1.0
+    weakness = (BLE_WEAK_RSSI - rssi) / (BLE_WEAK_RSSI - BLE_UNUSABLE_RSSI)
+    return 1.0 + (BLE_WEAK_INTERVAL_FACTOR - 1.0) * min(weakness, 1.0)
+
+
+def poll_blocker(rssi: Optional[int], advertisement_age: float) -> Optional[str]:
+    """Return why a connection attempt is not worth making, or None."""
+    if advertisement_age > BLE_STALE_ADVERTISEMENT:
+        return f"not seen for {advertisement_age:.0f}s"
+    if rssi is not None and rssi <= BLE_UNUSABLE_RSSI:
+        return f"signal too weak ({rssi} dBm)"
+    return None
+
+
+def poll_priority(rssi: Optional[int]) -> Priority:
+    """Return the priority of a device's poll for a connection slot."""
+    return Priority.BACKGROUND if signal_weak(rssi) else Priority.POLL
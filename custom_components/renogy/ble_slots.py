@@ -0,0 +1,123 @@
+"""Connection slots shared by the Renogy BLE devices on each adapter or proxy."""
+
+from __future__ import annotations
+
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Sequence, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    BLE_ADAPTER_RSSI_MARGIN,
+    BLE_CONNECTIONS_PER_ADAPTER,
+    DATA_BLE_SLOTS,
+)
+from .scheduler import Priority, TransactionScheduler
+
+# Snapshot key of the time the last poll waited for a connection slot
+KEY_BLE_SLOT_WAIT = "ble_slot_wait"
+
+
+class SlotLease:
+    """A connection slot on an adapter, held until released."""
+
+    def __init__(self, scheduler: TransactionScheduler, waited: float) -> None:
+        """Initialize a lease on a slot just granted."""
+        self._scheduler: Optional[TransactionScheduler] = scheduler
+        # Seconds spent waiting for the slot
+        self.waited = waited
+
+    @property
+    def held(self) -> bool:
+        """Return whether the slot is still held."""
+        return self._scheduler is not None
+
+    def release(self) -> None:
+        """Give the slot back; releasing it again does nothing."""
+        if self._scheduler is not None:
+            scheduler, self._scheduler = self._scheduler, None
+            scheduler.release()
+
+
+class BleSlotScheduler:
+    """Limit the active BLE connections through each adapter or proxy.
+
+    Adapters and ESPHome proxies only have a few connection slots, and
+    connecting to more devices at once than they have fails all of them.
+    Polls waiting for a slot are served by priority and then in arrival
+    order, so every device gets its turn.
+    """
+
+    def __init__(self, capacity: int = BLE_CONNECTIONS_PER_ADAPTER) -> None:
+        """Initialize the scheduler."""
+        self._capacity = capacity
+        self._adapters: Dict[str, TransactionScheduler] = {}
+
+    def _scheduler(self, source: str) -> TransactionScheduler:
+        """Return the slots of an adapter."""
+        if (scheduler := self._adapters.get(source)) is None:
+            scheduler = self._adapters[source] = TransactionScheduler(self._capacity)
+        return scheduler
+
+    def depth(self, source: str) -> int:
+        """Return the number of polls waiting for a slot on an adapter."""
+        return self._scheduler(source).depth
+
+    def choose(
+        self,
+        candidates: Sequence[Tuple[str, Optional[int]]],
+        margin: float = BLE_ADAPTER_RSSI_MARGIN,
+    ) -> str:
+        """Return the adapter to connect through, from (source, RSSI) pairs.
+
+        The adapter hearing the device best is used, unless its slots are
+        taken and another adapter hearing it within `margin` dB has one free.
+        """
+        ranked = sorted(
+            candidates,
+            key=lambda candidate: candidate[1] if candidate[1] is not None else -999,
+            reverse=True,
+        )
+        best_source, best_rssi = ranked[0]
+        for source, rssi in ranked:
+            if best_rssi is not None and (
+                rssi is None or best_rssi - rssi > margin
+            ):
+                break
+            scheduler = self._scheduler(source)
+            if scheduler.active < self._capacity and not scheduler.depth:
+                return source
+        return best_source
+
+    async def async_acquire(
+        self, source: str, priority: Priority = Priority.POLL
+    ) -> SlotLease:
+        """Take a connection slot on an adapter, to hold while connected.
+
+        A connection kept open across polls must keep its lease until it
+        closes, so the slot still counts against the adapter meanwhile.
+        """
+        start = time.monotonic()
+        scheduler = self._scheduler(source)
+        await scheduler.acquire(priority)
+        return SlotLease(scheduler, time.monotonic() - start)
+
+    @asynccontextmanager
+    async def slot(
+        self, source: str, priority: Priority = Priority.POLL
+    ) -> AsyncIterator[float]:
+        """Hold a connection slot on an adapter, yielding the seconds waited."""
+        lease = await self.async_acquire(source, priority)
+        try:
+            yield lease.waited
+        finally:
+            lease.release()
+
+
+@callback
+def async_get_ble_slots(hass: HomeAssistant) -> BleSlotScheduler:
+    """Return the slot scheduler shared by all BLE devices."""
+    if (slots := hass.data.get(DATA_BLE_SLOTS)) is None:
+        slots = hass.data[DATA_BLE_SLOTS] = BleSlotScheduler()
+    return slots
@@ -0,0 +1,147 @@
+"""Shared Modbus buses for Renogy devices."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .capture import FrameRecorder
+from .const import (
+    CAPTURE_DIRECTORY,
+    DATA_BUSES,
+    DATA_TRANSACTION_LIMITER,
+    LOGGER,
+    MAX_CONCURRENT_TRANSACTIONS,
+)
+from .scheduler import Priority, TransactionScheduler
+from .transport import StreamTransport, bus_key, create_transport
+
+# Snapshot key of the number of transactions found waiting for the bus during a poll
+KEY_BUS_QUEUE_DEPTH = "bus_queue_depth"
+
+
+class RenogyBus:
+    """A Modbus connection shared by every device on one port or gateway.
+
+    Transactions on one bus are strictly serialized by its scheduler, while
+    different buses run concurrently up to the global transaction limit.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        transport: str,
+        port: str | int,
+        host: Optional[str],
+        limiter: TransactionScheduler,
+    ) -> None:
+        """Initialize the bus."""
+        self.key = key
+        self.users = 0
+        self.scheduler = TransactionScheduler()
+        self._limiter = limiter
+        self._transport = create_transport(transport, port, host)
+        # Devices on the bus that asked for its frames to be captured
+        self._capture_users = 0
+
+    @asynccontextmanager
+    async def _transaction(self, priority: Priority) -> AsyncIterator[None]:
+        """Hold this bus, then one of the global transaction slots."""
+        async with self.scheduler.transaction(priority):
+            async with self._limiter.transaction(priority):
+                yield
+
+    async def async_read_registers(
+        self,
+        device_id: int,
+        register: int,
+        word_count: int,
+        priority: Priority = Priority.POLL,
+    ) -> List[int]:
+        """Read a block of holding registers (function 0x03)."""
+        async with self._transaction(priority):
+            return await self._transport.async_read_registers(
+                device_id, register, word_count
+            )
+
+    async def async_write_register(
+        self,
+        device_id: int,
+        register: int,
+        value: int,
+        priority: Priority = Priority.CONTROL,
+    ) -> None:
+        """Write a single holding register (function 0x06)."""
+        async with self._transaction(priority):
+            await self._transport.async_write_register(device_id, register, value)
+
+    async def async_write_registers(
+        self,
+        device_id: int,
+        register: int,
+        values: List[int],
+        priority: Priority = Priority.CONTROL,
+    ) -> None:
+        """Write a block of holding registers in one transaction (function 0x10)."""
+        async with self._transaction(priority):
+            await self._transport.async_write_registers(device_id, register, values)
+
+    @callback
+    def async_start_capture(self, hass: HomeAssistant) -> None:
+        """Capture the raw frames on the bus, on behalf of one more device.
+
+        Only the native transports see raw frames; with pymodbus nothing is
+        captured.
+        """
+        self._capture_users += 1
+        if self._capture_users > 1 or not isinstance(self._transport, StreamTransport):
+            return
+        path = hass.config.path(CAPTURE_DIRECTORY, f"{slugify(self.key)}.bin")
+        LOGGER.info("Capturing frames on %s to %s", self.key, path)
+        self._transport.recorder = FrameRecorder(hass, path, self._transport.framing)
+
+    async def async_stop_capture(self) -> None:
+        """Stop capturing once no device on the bus wants it, closing the file."""
+        self._capture_users -= 1
+        if self._capture_users or not isinstance(self._transport, StreamTransport):
+            return
+        recorder, self._transport.recorder = self._transport.recorder, None
+        if recorder is not None:
+            LOGGER.info("Stopped capturing frames on %s", self.key)
+            await recorder.async_close()
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._transport.close()
+
+
+@callback
+def async_acquire_bus(
+    hass: HomeAssistant, transport: str, port: str | int, host: Optional[str] = None
+) -> RenogyBus:
+    """Return the shared bus for an endpoint, creating it on first use."""
+    buses: Dict[str, RenogyBus] = hass.data.setdefault(DATA_BUSES, {})
+    key = bus_key(transport, port, host)
+    if (bus := buses.get(key)) is None:
+        LOGGER.debug("Creating shared bus for %s", key)
+        limiter = hass.data.setdefault(
+            DATA_TRANSACTION_LIMITER,
+            TransactionScheduler(MAX_CONCURRENT_TRANSACTIONS),
+        )
+        bus = buses[key] = RenogyBus(key, transport, port, host, limiter)
+    bus.users += 1
+    return bus
+
+
+@callback
+def async_release_bus(hass: HomeAssistant, bus: RenogyBus) -> None:
+    """Release a bus, closing it once its last user is gone."""
+    bus.users -= 1
+    if bus.users > 0:
+        return
+    LOGGER.debug("Closing shared bus for %s", bus.key)
+    hass.data.get(DATA_BUSES, {}).pop(bus.key, None)
+    bus.close()
@@ -0,0 +1,282 @@
+"""Compact binary capture of raw Modbus frames, and offline replay.
+
+A capture file starts with a 16-byte header (magic and framing), followed by
+one record per frame: a little-endian header of monotonic timestamp (double),
+direction (byte) and frame length (unsigned short), then the frame exactly
+as it went over the wire. Files are append-only, rotate at a size limit and
+are read back through mmap.
+
+Replay a capture through the decoder with:
+
+    python -m custom_components.renogy.capture FILE [--device-type TYPE] [--benchmark]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from .const import (
+    CAPTURE_BACKUPS,
+    CAPTURE_FLUSH_BYTES,
+    CAPTURE_FLUSH_DELAY,
+    CAPTURE_MAX_BYTES,
+    DEFAULT_DEVICE_TYPE,
+)
+from .modbus import EXCEPTION_FLAG, MBAP_HEADER, READ_FUNCTIONS
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+CAPTURE_MAGIC = b"RNGYCAP1"
+# magic, framing, reserved
+FILE_HEADER = struct.Struct("<8sB7x")
+# monotonic timestamp, direction, frame length
+RECORD_HEADER = struct.Struct("<dBH")
+
+# Framing of the captured frames
+FRAMING_RTU = 0
+FRAMING_TCP = 1
+
+DIRECTION_REQUEST = 0
+DIRECTION_RESPONSE = 1
+
+
+class CaptureError(Exception):
+    """A capture file is not readable."""
+
+
+class CapturedFrame(NamedTuple):
+    """A frame read back from a capture."""
+
+    timestamp: float
+    direction: int
+    frame: bytes
+
+
+class FrameRecorder:
+    """Append raw frames to a rotating capture file.
+
+    Recording a frame only appends its packed header and bytes to an
+    in-memory buffer. The buffer is written from the executor once it
+    reaches CAPTURE_FLUSH_BYTES or CAPTURE_FLUSH_DELAY seconds after its
+    first frame, so the event loop never touches the file.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str,
+        framing: int = FRAMING_RTU,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+        backups: int = CAPTURE_BACKUPS,
+    ) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self.path = path
+        self._framing = framing
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._buffer = bytearray()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Serializes writes, so buffers reach the file in order
+        self._write_lock = asyncio.Lock()
+        self._file: Optional[BinaryIO] = None
+        self.frames = 0
+
+    def record(self, direction: int, frame: bytes) -> None:
+        """Buffer a frame for writing."""
+        buffer = self._buffer
+        buffer += RECORD_HEADER.pack(time.monotonic(), direction, len(frame))
+        buffer += frame
+        self.frames += 1
+        if len(buffer) >= CAPTURE_FLUSH_BYTES:
+            self._schedule_flush(0)
+        elif self._flush_handle is None:
+            self._schedule_flush(CAPTURE_FLUSH_DELAY)
+
+    def _schedule_flush(self, delay: float) -> None:
+        """Write the buffer after `delay` seconds."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = self._hass.loop.call_later(delay, self._start_flush)
+
+    def _start_flush(self) -> None:
+        """Start writing the buffer."""
+        self._flush_handle = None
+        self._hass.async_create_task(self.async_flush(), eager_start=True)
+
+    async def async_flush(self) -> None:
+        """Write the buffered frames to the file."""
+        async with self._write_lock:
+            if not self._buffer:
+                return
+            data, self._buffer = bytes(self._buffer), bytearray()
+            await self._hass.async_add_executor_job(self._write, data)
+
+    async def async_close(self) -> None:
+        """Write what is buffered and close the file."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await self.async_flush()
+        async with self._write_lock:
+            await self._hass.async_add_executor_job(self._close_file)
+
+    def _write(self, data: bytes) -> None:
+        """Append records to the file, rotating it first if it would grow too big."""
+        if self._file is None:
+            self._open()
+        elif self._file.tell() + len(data) > self._max_bytes:
+            self._close_file()
+            self._rotate()
+            self._open()
+        self._file.write(data)
+        self._file.flush()
+
+    def _open(self) -> None:
+        """Open the file for appending, writing its header if it is new."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "ab")  # noqa: SIM115 - kept open across writes
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(CAPTURE_MAGIC, self._framing))
+
+    def _rotate(self) -> None:
+        """Shift FILE to FILE.1, FILE.1 to FILE.2 and so on, dropping the oldest."""
+        for index in range(self._backups - 1, 0, -1):
+            if os.path.exists(source := f"{self.path}.{index}"):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self._backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _close_file(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_capture(path: str) -> tuple[int, Iterator[CapturedFrame]]:
+    """Return the framing of a capture and an iterator over its frames.
+
+    A record cut short at the end of the file, as left by a crash, is ignored.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < FILE_HEADER.size:
+            raise CaptureError(f"{path} is not a frame capture")
+        captured = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, framing = FILE_HEADER.unpack_from(captured)
+    if magic != CAPTURE_MAGIC:
+        captured.close()
+        raise CaptureError(f"{path} is not a frame capture")
+
+    def frames() -> Iterator[CapturedFrame]:
+        offset = FILE_HEADER.size
+        size = len(captured)
+        try:
+            while offset + RECORD_HEADER.size <= size:
+                timestamp, direction, length = RECORD_HEADER.unpack_from(
+                    captured, offset
+                )
+                offset += RECORD_HEADER.size
+                if offset + length > size:
+                    return
+                yield CapturedFrame(
+                    timestamp, direction, captured[offset : offset + length]
+                )
+                offset += length
+        finally:
+            captured.close()
+
+    return framing, frames()
+
+
+def _unit_and_pdu(framing: int, frame: bytes) -> tuple[int, bytes]:
+    """Return the unit ID and PDU of a frame."""
+    if framing == FRAMING_TCP:
+        # The MBAP header ends with the unit ID
+        return frame[MBAP_HEADER.size - 1], frame[MBAP_HEADER.size :]
+    return frame[0], frame[1:-2]
+
+
+def replay(
+    path: str, device_type: str = DEFAULT_DEVICE_TYPE, parser: Any = None
+) -> Iterator[tuple[float, int, Dict[str, Any]]]:
+    """Feed the responses of a capture through the decoder.
+
+    Yields (timestamp, register, values) for each read response, the register
+    taken from the read request it answers.
+    """
+    if parser is None:
+        from renogy_ble import RenogyParser
+
+        parser = RenogyParser()
+    framing, frames = read_capture(path)
+    register: Optional[int] = None
+    for timestamp, direction, frame in frames:
+        unit, pdu = _unit_and_pdu(framing, frame)
+        if len(pdu) < 3:
+            continue
+        if direction == DIRECTION_REQUEST:
+            register = (
+                int.from_bytes(pdu[1:3], "big") if pdu[0] in READ_FUNCTIONS else None
+            )
+            continue
+        if register is None or pdu[0] & EXCEPTION_FLAG or pdu[0] not in READ_FUNCTIONS:
+            continue
+        values = parser.parse(bytes([unit]) + pdu, device_type, register)
+        yield timestamp, register, values
+        register = None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Replay a capture, printing the decoded values or the decoding rate."""
+    args = argparse.ArgumentParser(description=main.__doc__)
+    args.add_argument("capture", help="capture file to replay")
+    args.add_argument("--device-type", default=DEFAULT_DEVICE_TYPE)
+    args.add_argument(
+        "--benchmark", action="store_true", help="report the decoding rate only"
+    )
+    options = args.parse_args(argv)
+    try:
+        start = time.perf_counter()
+        count = 0
+        for timestamp, register, values in replay(options.capture, options.device_type):
+            count += 1
+            if not options.benchmark:
+                print(
+                    json.dumps(
+                        {"timestamp": timestamp, "register": register, **values},
+                        default=str,
+                    )
+                )
+        elapsed = time.perf_counter() - start
+    except (CaptureError, OSError) as err:
+        print(f"Cannot replay {options.capture}: {err}", file=sys.stderr)
+        return 1
+    if options.benchmark:
+        rate = count / elapsed if elapsed else 0.0
+        print(f"{count} responses decoded in {elapsed:.3f}s ({rate:.0f}/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,118 @@
 from __future__ import annotations
 
+import re
 from typing import Any
 
 import voluptuous as vol
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.core import callback
 
 from .const import (
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_ADAPTIVE_SCAN_INTERVAL,
+    CONF_BLUETOOTH_ADDRESS,
+    CONF_BLUETOOTH_KEEP_CONNECTED,
+    CONF_CAPTURE_FRAMES,
     CONF_DEVICE_TYPE,
+    CONF_REFRESH_FRESHNESS,
+    CONF_SHUTDOWN_TIMEOUT,
+    CONF_SLAVE_ID,
+    CONF_TIMESERIES,
+    CONF_TRANSPORT,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
+    DEFAULT_DEVICE_ID,
     DEFAULT_DEVICE_TYPE,
+    DEFAULT_REFRESH_FRESHNESS,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SHUTDOWN_TIMEOUT,
+    DEFAULT_TCP_PORT,
+    DEFAULT_TRANSPORT,
     DEVICE_TYPES,
     DOMAIN,
     LOGGER,
     MAX_SCAN_INTERVAL,
     MIN_SCAN_INTERVAL,
+    TRANSPORT_RTU_OVER_TCP,
+    TRANSPORT_SERIAL,
+    TRANSPORT_TCP,
+    TRANSPORTS,
 )
+from .uart import device_address
+
+SERIAL_SCHEMA = {vol.Required(CONF_PORT): str}
+NETWORK_SCHEMA = {
+    vol.Required(CONF_HOST): str,
+    vol.Optional(CONF_PORT, default=DEFAULT_TCP_PORT): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=65535)
+    ),
+}
+TRANSPORT_SCHEMAS = {
+    TRANSPORT_SERIAL: SERIAL_SCHEMA,
+    TRANSPORT_RTU_OVER_TCP: NETWORK_SCHEMA,
+    TRANSPORT_TCP: NETWORK_SCHEMA,
+}
+
+# Options shared by every transport
+DEVICE_SCHEMA = {
+    vol.Optional(CONF_DEVICE_TYPE, default=DEFAULT_DEVICE_TYPE): vol.In(DEVICE_TYPES),
+    vol.Optional(CONF_SLAVE_ID, default=DEFAULT_DEVICE_ID): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=255)
+    ),
+    vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
+    ),
+    vol.Optional(CONF_ADAPTIVE_SCAN_INTERVAL, default=False): bool,
+    vol.Optional(
+        CONF_ADAPTIVE_MIN_INTERVAL, default=DEFAULT_ADAPTIVE_MIN_INTERVAL
+    ): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
+    ),
+    vol.Optional(
+        CONF_ADAPTIVE_MAX_INTERVAL, default=DEFAULT_ADAPTIVE_MAX_INTERVAL
+    ): vol.All(
+        vol.Coerce(int),
+        vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
+    ),
+    # A BT module on the same device to fail over to
+    vol.Optional(CONF_BLUETOOTH_ADDRESS): str,
+    vol.Optional(CONF_BLUETOOTH_KEEP_CONNECTED, default=True): bool,
+    vol.Optional(CONF_CAPTURE_FRAMES, default=False): bool,
+    vol.Optional(CONF_TIMESERIES, default=False): bool,
+}
+
+# Options only offered once a device is set up
+TUNING_SCHEMA = {
+    vol.Optional(CONF_SHUTDOWN_TIMEOUT, default=DEFAULT_SHUTDOWN_TIMEOUT): vol.All(
+        vol.Coerce(float), vol.Range(min=0.5, max=30)
+    ),
+    vol.Optional(CONF_REFRESH_FRESHNESS, default=DEFAULT_REFRESH_FRESHNESS): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=MIN_SCAN_INTERVAL)
+    ),
+}
+
+BLUETOOTH_ADDRESS = re.compile(r"[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}")
+
+
+def _validate_device(user_input: dict[str, Any]) -> dict[str, str]:
+    """Return the form errors of the device options."""
+    if user_input.get(
+        CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL
+    ) > user_input.get(CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL):
+        return {CONF_ADAPTIVE_MIN_INTERVAL: "invalid_adaptive_bounds"}
+    address = user_input.get(CONF_BLUETOOTH_ADDRESS, "").strip()
+    if address and not BLUETOOTH_ADDRESS.fullmatch(address):
+        return {CONF_BLUETOOTH_ADDRESS: "invalid_bluetooth_address"}
+    return {}
 
 
 class RenogyConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -23,28 +120,100 @@ class RenogyConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> RenogyOptionsFlow:
+        """Return the options flow of an entry."""
+        return RenogyOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
+        """Choose how the device is connected."""
+        return self.async_show_menu(step_id="user", menu_options=TRANSPORTS)
+
+    async def async_step_serial(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Configure a device on a local serial port."""
+        errors: dict[str, str] = {}
+        if user_input is not None and not (errors := _validate_device(user_input)):
+            return self._async_create_device_entry(TRANSPORT_SERIAL, user_input)
+
+        return self.async_show_form(
+            step_id=TRANSPORT_SERIAL,
+            data_schema=vol.Schema({**SERIAL_SCHEMA, **DEVICE_SCHEMA}),
+            errors=errors,
+        )
+
+    async def async_step_rtu_over_tcp(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Configure a device behind a serial gateway forwarding raw RTU frames."""
+        return self._async_step_network(TRANSPORT_RTU_OVER_TCP, user_input)
+
+    async def async_step_tcp(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Configure a device behind a Modbus TCP gateway."""
+        return self._async_step_network(TRANSPORT_TCP, user_input)
+
+    def _async_step_network(
+        self, transport: str, user_input: dict[str, Any] | None
+    ) -> ConfigFlowResult:
+        """Show or handle the form of a TCP transport."""
         errors: dict[str, str] = {}
+        if user_input is not None and not (errors := _validate_device(user_input)):
+            return self._async_create_device_entry(transport, user_input)
 
-        if user_input is not None:
-            LOGGER.debug("Configuring Renogy device on port %s", user_input[CONF_PORT])
-            return self.async_create_entry(title=user_input[CONF_PORT], data=user_input)
-
-        data_schema = vol.Schema(
-            {
-                vol.Required(CONF_PORT): str,
-                vol.Optional(CONF_DEVICE_TYPE, default=DEFAULT_DEVICE_TYPE): vol.In(DEVICE_TYPES),
-                vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
-                    vol.Coerce(int),
-                    vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
-                ),
-            }
+        return self.async_show_form(
+            step_id=transport,
+            data_schema=vol.Schema({**NETWORK_SCHEMA, **DEVICE_SCHEMA}),
+            errors=errors,
         )
 
+    def _async_create_device_entry(
+        self, transport: str, user_input: dict[str, Any]
+    ) -> ConfigFlowResult:
+        """Create the config entry of a device."""
+        address = device_address(
+            transport,
+            user_input[CONF_PORT],
+            user_input.get(CONF_HOST),
+            user_input.get(CONF_SLAVE_ID, DEFAULT_DEVICE_ID),
+        )
+        LOGGER.debug("Configuring Renogy device on %s (%s)", address, transport)
+        return self.async_create_entry(
+            title=address, data={CONF_TRANSPORT: transport, **user_input}
+        )
+
+
+class RenogyOptionsFlow(OptionsFlow):
+    """Change the settings of a configured device.
+
+    Polling settings are applied to the running coordinator; changing the
+    connection, slave ID, device type or Bluetooth settings reloads the entry.
+    """
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Show or handle the device settings."""
+        errors: dict[str, str] = {}
+        if user_input is not None and not (errors := _validate_device(user_input)):
+            # A cleared address is left out of the input but must override the data
+            return self.async_create_entry(
+                data={CONF_BLUETOOTH_ADDRESS: "", **user_input}
+            )
+
+        transport = self.config_entry.data.get(CONF_TRANSPORT, DEFAULT_TRANSPORT)
+        schema = vol.Schema(
+            {**TRANSPORT_SCHEMAS[transport], **DEVICE_SCHEMA, **TUNING_SCHEMA}
+        )
         return self.async_show_form(
-            step_id="user",
-            data_schema=data_schema,
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                schema, {**self.config_entry.data, **self.config_entry.options}
+            ),
             errors=errors,
         )
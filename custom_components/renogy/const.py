@@ -11,10 +11,40 @@ LOGGER = logging.getLogger(__name__)
 DEFAULT_SCAN_INTERVAL = 60  # seconds
 MIN_SCAN_INTERVAL = 10  # seconds
 MAX_SCAN_INTERVAL = 600  # seconds
+# Default bounds of the adaptive scan interval
+DEFAULT_ADAPTIVE_MIN_INTERVAL = 10  # seconds
+DEFAULT_ADAPTIVE_MAX_INTERVAL = 300  # seconds
+
+# Longest an unload or shutdown waits for an in-flight poll before cancelling it
+DEFAULT_SHUTDOWN_TIMEOUT = 2.0  # seconds
+# Refresh requests this soon after a successful poll are served from its result
+DEFAULT_REFRESH_FRESHNESS = 5.0  # seconds
+
+# Power samples further apart than this many scan intervals are not integrated across
+ENERGY_MAX_GAP_INTERVALS = 3
 
 # Configuration parameters
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_DEVICE_TYPE = "device_type"  # New constant for device type
+CONF_ADAPTIVE_SCAN_INTERVAL = "adaptive_scan_interval"
+CONF_ADAPTIVE_MIN_INTERVAL = "adaptive_min_interval"
+CONF_ADAPTIVE_MAX_INTERVAL = "adaptive_max_interval"
+CONF_TRANSPORT = "transport"
+CONF_SLAVE_ID = "slave_id"
+CONF_BLUETOOTH_ADDRESS = "bluetooth_address"
+CONF_BLUETOOTH_KEEP_CONNECTED = "bluetooth_keep_connected"
+CONF_CAPTURE_FRAMES = "capture_frames"
+CONF_TIMESERIES = "timeseries"
+CONF_SHUTDOWN_TIMEOUT = "shutdown_timeout"
+CONF_REFRESH_FRESHNESS = "refresh_freshness"
+
+# Transports
+TRANSPORT_SERIAL = "serial"
+TRANSPORT_RTU_OVER_TCP = "rtu_over_tcp"
+TRANSPORT_TCP = "tcp"
+TRANSPORTS = [TRANSPORT_SERIAL, TRANSPORT_RTU_OVER_TCP, TRANSPORT_TCP]
+DEFAULT_TRANSPORT = TRANSPORT_SERIAL
+DEFAULT_TCP_PORT = 502
 
 # Device info
 ATTR_MANUFACTURER = "Renogy"
@@ -34,9 +64,67 @@ DEFAULT_DEVICE_TYPE = DeviceType.CONTROLLER.value
 # List of fully supported device types (currently only controller)
 SUPPORTED_DEVICE_TYPES = [DeviceType.CONTROLLER.value]
 
+# Raw frame captures, under the Home Assistant config directory
+CAPTURE_DIRECTORY = "renogy_captures"
+# A capture file is rotated at this size, keeping this many older files
+CAPTURE_MAX_BYTES = 4 * 1024 * 1024
+CAPTURE_BACKUPS = 3
+# Captured frames are written once this much is buffered, or after the delay
+CAPTURE_FLUSH_BYTES = 64 * 1024
+CAPTURE_FLUSH_DELAY = 5.0  # seconds
+
+# High-rate history files, under the Home Assistant config directory
+TIMESERIES_DIRECTORY = "renogy_timeseries"
+
+# Weight of the newest sample in a transport's latency and success rate averages
+FAILOVER_EWMA_ALPHA = 0.3
+# A transport that failed is only tried first again after this, doubling per failure
+FAILOVER_BACKOFF_MIN = 30.0  # seconds
+FAILOVER_BACKOFF_MAX = 600.0  # seconds
+# The primary transport is used unless another scores this many times better
+FAILOVER_PRIMARY_BIAS = 2.0
+
 # Time in minutes to wait before attempting to reconnect to unavailable devices
 UNAVAILABLE_RETRY_INTERVAL = 10
 
+# hass.data key of the shared buses, keyed by serial port or gateway
+DATA_BUSES = f"{DOMAIN}_buses"
+
+# hass.data key of the scheduler bounding in-flight transactions across all buses
+DATA_TRANSACTION_LIMITER = f"{DOMAIN}_transaction_limiter"
+# Transactions in flight at once across all ports and gateways
+MAX_CONCURRENT_TRANSACTIONS = 4
+
+# hass.data key of the planner assigning poll phases to devices
+DATA_PHASE_PLANNER = f"{DOMAIN}_phase_planner"
+
+# hass.data key of the scheduler handing out BLE connection slots per adapter or proxy
+DATA_BLE_SLOTS = f"{DOMAIN}_ble_slots"
+# Active connections at once through one Bluetooth adapter or proxy
+BLE_CONNECTIONS_PER_ADAPTER = 2
+# An adapter with a free slot is preferred if its RSSI is within this of the best
+BLE_ADAPTER_RSSI_MARGIN = 10  # dB
+# Below this RSSI a device is polled less often and only through its best adapter
+BLE_WEAK_RSSI = -85  # dBm
+# At or below this RSSI connection attempts are not made at all
+BLE_UNUSABLE_RSSI = -95  # dBm
+# Polls of the weakest usable devices are spaced this many scan intervals apart
+BLE_WEAK_INTERVAL_FACTOR = 4.0
+# Devices that have not advertised for this long are not polled
+BLE_STALE_ADVERTISEMENT = 120  # seconds
+
+# Dispatcher signal sent with the set of newly reported keys, formatted with the device address
+SIGNAL_NEW_KEYS = f"{DOMAIN}_new_keys_{{}}"
+
+# BLE characteristics used by Renogy BT modules
+RENOGY_READ_CHAR_UUID = "0000fff1-0000-1000-8000-00805f9b34fb"
+RENOGY_WRITE_CHAR_UUID = "0000ffd1-0000-1000-8000-00805f9b34fb"
+# Seconds to wait for a BLE notification carrying a response
+MAX_NOTIFICATION_WAIT_TIME = 2.0
+# Bounds of the backoff between reconnects of a kept BLE session
+BLE_RECONNECT_BACKOFF_MIN = 5.0  # seconds
+BLE_RECONNECT_BACKOFF_MAX = 300.0  # seconds
+
 # Default device ID for Renogy devices
 DEFAULT_DEVICE_ID = 0xFF
 
@@ -49,3 +137,12 @@ COMMANDS = {
         "pv": (3, 256, 34),
     },
 }
+
+# Register switching the load output on (1) or off (0) when in manual mode
+LOAD_CONTROL_REGISTER = 0x010A
+
+# Register holding the nominal battery capacity (Ah)
+BATTERY_CAPACITY_REGISTER = 0xE002
+
+# Register holding the controller fault bits; read as part of the pv block
+FAULT_REGISTER = 0x0121
@@ -0,0 +1,82 @@
+"""Values derived from each decoded snapshot."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional
+
+KEY_BATTERY_CAPACITY = "battery_capacity"
+KEY_BATTERY_POWER = "battery_power"
+KEY_CHARGING_EFFICIENCY = "charging_efficiency"
+KEY_TIME_TO_FULL = "time_to_full"
+KEY_TIME_TO_EMPTY = "time_to_empty"
+KEY_LOAD_SHARE = "load_share"
+
+# Below this PV power, ratios against it are too noisy to be meaningful
+MIN_RATIO_PV_POWER = 5.0  # W
+# Below this net current, the battery is considered idle
+MIN_NET_CURRENT = 0.05  # A
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    """Return a percentage of the PV power, or None when PV is negligible."""
+    if denominator < MIN_RATIO_PV_POWER:
+        return None
+    return min(max(numerator / denominator * 100, 0.0), 100.0)
+
+
+def net_battery_current(data: Mapping[str, Any]) -> Optional[float]:
+    """Return the current into the battery, negative while it discharges.
+
+    Controllers report the charging current into the battery and the load
+    output current separately; the battery's net current is their difference.
+    """
+    current = data.get("battery_current")
+    if current is None:
+        return None
+    return current - (data.get("load_current") or 0.0)
+
+
+def battery_power(data: Mapping[str, Any]) -> Optional[float]:
+    """Return the net power into the battery, negative while it discharges."""
+    voltage = data.get("battery_voltage")
+    net_current = net_battery_current(data)
+    if voltage is None or net_current is None:
+        return None
+    return voltage * net_current
+
+
+def derive(data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return the values derived from a snapshot.
+
+    A key is only returned when the readings it depends on are reported, so
+    devices without them never get the derived entity. Its value is None
+    while it is undefined (e.g. efficiency at night).
+    """
+    derived: Dict[str, Any] = {}
+    voltage = data.get("battery_voltage")
+    current = data.get("battery_current")
+    pv_power = data.get("pv_power")
+    load_power = data.get("load_power")
+
+    if voltage is not None and current is not None:
+        derived[KEY_BATTERY_POWER] = battery_power(data)
+        if pv_power is not None:
+            # The share of PV power reaching the battery, before the load takes its part
+            derived[KEY_CHARGING_EFFICIENCY] = _ratio(voltage * current, pv_power)
+
+    if pv_power is not None and load_power is not None:
+        derived[KEY_LOAD_SHARE] = _ratio(load_power, pv_power)
+
+    capacity = data.get(KEY_BATTERY_CAPACITY)
+    soc = data.get("battery_percentage")
+    if capacity and soc is not None and current is not None:
+        net_current = net_battery_current(data)
+        time_to_full = time_to_empty = None
+        if net_current > MIN_NET_CURRENT:
+            time_to_full = capacity * (100 - soc) / 100 / net_current
+        elif net_current < -MIN_NET_CURRENT:
+            time_to_empty = capacity * soc / 100 / -net_current
+        derived[KEY_TIME_TO_FULL] = time_to_full
+        derived[KEY_TIME_TO_EMPTY] = time_to_empty
+
+    return derived
@@ -0,0 +1,103 @@
+"""Availability tracking shared by Renogy devices on every transport."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from .const import DEFAULT_DEVICE_TYPE, LOGGER, UNAVAILABLE_RETRY_INTERVAL
+
+
+class RenogyDevice:
+    """A Renogy device and the health of communication with it.
+
+    After `max_failures` consecutive failed polls the device is marked
+    unavailable, and is then only retried every UNAVAILABLE_RETRY_INTERVAL
+    minutes until a poll succeeds again.
+    """
+
+    def __init__(
+        self, address: str, name: str, device_type: str = DEFAULT_DEVICE_TYPE
+    ) -> None:
+        """Initialize the device."""
+        self.address = address
+        self.name = name
+        self.device_type = device_type
+        # Track consecutive failures
+        self.failure_count = 0
+        # Maximum allowed failures before marking device unavailable
+        self.max_failures = 3
+        # Device availability tracking
+        self.available = True
+        # Parsed data from device
+        self.parsed_data: Dict[str, Any] = {}
+        # Track when device was last marked as unavailable
+        self.last_unavailable_time: Optional[datetime] = None
+
+    @property
+    def is_available(self) -> bool:
+        """Return True if device communication is healthy."""
+        return self.available and self.failure_count < self.max_failures
+
+    @property
+    def should_retry_connection(self) -> bool:
+        """Determine if we should attempt to reconnect to an unavailable device."""
+        if self.is_available:
+            return True
+
+        # If we've never set an unavailable time, set it now
+        if self.last_unavailable_time is None:
+            self.last_unavailable_time = datetime.now()
+            return False
+
+        retry_time = self.last_unavailable_time + timedelta(
+            minutes=UNAVAILABLE_RETRY_INTERVAL
+        )
+        if datetime.now() >= retry_time:
+            LOGGER.debug(
+                "Retry interval reached for unavailable device %s. Attempting reconnection...",
+                self.name,
+            )
+            # Reset the unavailable time for the next retry interval
+            self.last_unavailable_time = datetime.now()
+            return True
+
+        return False
+
+    def update_availability(
+        self, success: bool, error: Optional[Exception] = None
+    ) -> None:
+        """Update availability based on communication success."""
+        if success:
+            if self.failure_count > 0:
+                LOGGER.info(
+                    "Device %s communication restored after %s consecutive failures",
+                    self.name,
+                    self.failure_count,
+                )
+            self.failure_count = 0
+            if not self.available:
+                LOGGER.info("Device %s is now available", self.name)
+                self.available = True
+                self.last_unavailable_time = None
+        else:
+            self.failure_count += 1
+            error_msg = f" Error message: {str(error)}" if error else ""
+            LOGGER.info(
+                "Communication failure with Renogy device: %s. (Consecutive polling failure #%s. Device will be marked unavailable after %s failures.)%s",
+                self.name,
+                self.failure_count,
+                self.max_failures,
+                error_msg,
+            )
+
+            if self.failure_count >= self.max_failures and self.available:
+                error_msg = f". Error message: {str(error)}" if error else ""
+                LOGGER.error(
+                    "Renogy device %s marked unavailable after %s consecutive polling failures%s",
+                    self.name,
+                    self.max_failures,
+                    error_msg,
+                )
+                self.available = False
+                self.last_unavailable_time = datetime.now()
@@ -0,0 +1,68 @@
+"""Local energy integration from sampled power readings."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional
+
+from .derived import battery_power
+
+# Keys of the locally integrated energy totals (Wh)
+KEY_PV_ENERGY = "pv_energy"
+KEY_LOAD_ENERGY = "load_energy"
+KEY_BATTERY_ENERGY = "battery_energy"
+
+
+# Energy key -> function returning the power (W) it integrates from a snapshot
+ENERGY_SOURCES: Dict[str, Callable[[Dict[str, Any]], Optional[float]]] = {
+    KEY_PV_ENERGY: lambda data: data.get("pv_power"),
+    KEY_LOAD_ENERGY: lambda data: data.get("load_power"),
+    # Energy charged into the battery; the integrator counts discharging as zero
+    KEY_BATTERY_ENERGY: battery_power,
+}
+
+
+class EnergyIntegrator:
+    """Integrate power samples into energy using a trapezoidal Riemann sum."""
+
+    def __init__(self) -> None:
+        """Initialize the integrator."""
+        self.total = 0.0  # Wh
+        self._last_time: Optional[float] = None
+        self._last_power: Optional[float] = None
+        self._restored = False
+
+    def add_sample(self, power: Optional[float], timestamp: float, max_gap: float) -> float:
+        """Add a power sample (W) taken at a monotonic timestamp (s).
+
+        Samples further apart than max_gap seconds are not integrated across;
+        the new sample only becomes the baseline for the next one.
+        """
+        if power is None:
+            self.reset()
+            return self.total
+
+        power = max(float(power), 0.0)
+        if self._last_time is not None:
+            elapsed = timestamp - self._last_time
+            if 0 < elapsed <= max_gap:
+                self.total += (self._last_power + power) / 2 * elapsed / 3600
+
+        self._last_time = timestamp
+        self._last_power = power
+        return self.total
+
+    def reset(self) -> None:
+        """Forget the last sample so the next one starts a new segment."""
+        self._last_time = None
+        self._last_power = None
+
+    def restore(self, total: float) -> None:
+        """Carry over a total persisted before a restart.
+
+        Only the first restore is applied so re-adding an entity cannot
+        double count.
+        """
+        if self._restored:
+            return
+        self._restored = True
+        self.total += max(total, 0.0)
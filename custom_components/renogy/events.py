@@ -0,0 +1,91 @@
+"""State transition and fault events detected by the coordinator."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .const import DOMAIN
+
+KEY_FAULTS = "faults"
+
+# Fault bits of register 0x0121 (bits 16-30 of the 32-bit fault word 0x0121-0x0122)
+FAULT_BITS: Dict[int, str] = {
+    0: "battery_over_discharge",
+    1: "battery_over_voltage",
+    2: "battery_under_voltage_warning",
+    3: "load_short_circuit",
+    4: "load_overpower",
+    5: "controller_over_temperature",
+    6: "ambient_over_temperature",
+    7: "pv_input_overpower",
+    8: "pv_input_short_circuit",
+    9: "pv_input_over_voltage",
+    10: "pv_counter_current",
+    11: "pv_working_point_over_voltage",
+    12: "pv_reverse_connection",
+    13: "anti_reverse_mos_short_circuit",
+    14: "charge_mos_short_circuit",
+}
+
+TRIGGER_CHARGING_STATUS_CHANGED = "charging_status_changed"
+TRIGGER_LOAD_STATUS_CHANGED = "load_status_changed"
+TRIGGER_FAULT_RAISED = "fault_raised"
+TRIGGER_FAULT_CLEARED = "fault_cleared"
+TRIGGER_TYPES = (
+    TRIGGER_CHARGING_STATUS_CHANGED,
+    TRIGGER_LOAD_STATUS_CHANGED,
+    TRIGGER_FAULT_RAISED,
+    TRIGGER_FAULT_CLEARED,
+)
+
+# Snapshot key -> trigger fired when its value changes
+STATUS_TRIGGERS: Dict[str, str] = {
+    "charging_status": TRIGGER_CHARGING_STATUS_CHANGED,
+    "load_status": TRIGGER_LOAD_STATUS_CHANGED,
+}
+
+ATTR_OLD_STATE = "old_state"
+ATTR_NEW_STATE = "new_state"
+ATTR_FAULT = "fault"
+
+
+def event_type(trigger_type: str) -> str:
+    """Return the bus event fired for a trigger type."""
+    return f"{DOMAIN}_{trigger_type}"
+
+
+def decode_faults(word: int) -> List[str]:
+    """Return the names of the faults set in a fault register."""
+    return [name for bit, name in FAULT_BITS.items() if word & (1 << bit)]
+
+
+def watched_states(data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return the values of a snapshot that transitions are detected on."""
+    states = {key: data[key] for key in STATUS_TRIGGERS if key in data}
+    if KEY_FAULTS in data:
+        states[KEY_FAULTS] = frozenset(data[KEY_FAULTS])
+    return states
+
+
+def detect_transitions(
+    old: Optional[Mapping[str, Any]], new: Mapping[str, Any]
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Return the (trigger type, event data) of every transition from old to new.
+
+    Nothing is reported against an unknown previous state, so the first poll
+    after startup does not fire events.
+    """
+    if old is None:
+        return []
+    transitions: List[Tuple[str, Dict[str, Any]]] = []
+    for key, trigger_type in STATUS_TRIGGERS.items():
+        if key in old and key in new and old[key] != new[key]:
+            transitions.append(
+                (trigger_type, {ATTR_OLD_STATE: old[key], ATTR_NEW_STATE: new[key]})
+            )
+    if KEY_FAULTS in old and KEY_FAULTS in new:
+        for fault in sorted(new[KEY_FAULTS] - old[KEY_FAULTS]):
+            transitions.append((TRIGGER_FAULT_RAISED, {ATTR_FAULT: fault}))
+        for fault in sorted(old[KEY_FAULTS] - new[KEY_FAULTS]):
+            transitions.append((TRIGGER_FAULT_CLEARED, {ATTR_FAULT: fault}))
+    return transitions
@@ -0,0 +1,254 @@
+"""Failover between the transports reaching the same Renogy device."""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Protocol, Sequence, TypeVar
+
+from .bus import RenogyBus
+from .const import (
+    FAILOVER_BACKOFF_MAX,
+    FAILOVER_BACKOFF_MIN,
+    FAILOVER_EWMA_ALPHA,
+    FAILOVER_PRIMARY_BIAS,
+    LOGGER,
+)
+from .modbus import ModbusExceptionResponse
+from .scheduler import Priority
+
+_T = TypeVar("_T")
+
+# Snapshot key of the transport the last poll was read over
+KEY_ACTIVE_TRANSPORT = "active_transport"
+
+
+class RegisterLink(Protocol):
+    """A transport reaching one device."""
+
+    name: str
+
+    async def async_read_registers(
+        self, register: int, word_count: int, priority: Priority
+    ) -> List[int]:
+        """Read a block of holding registers."""
+
+    async def async_write_register(
+        self, register: int, value: int, priority: Priority
+    ) -> None:
+        """Write a single holding register."""
+
+    async def async_write_registers(
+        self, register: int, values: List[int], priority: Priority
+    ) -> None:
+        """Write a block of holding registers."""
+
+    async def async_close(self) -> None:
+        """Release what the link holds open for the device."""
+
+
+class BusLink:
+    """A device at its slave ID on a shared Modbus bus."""
+
+    def __init__(self, bus: RenogyBus, slave_id: int) -> None:
+        """Initialize the link."""
+        self.name = bus.key
+        self._bus = bus
+        self._slave_id = slave_id
+
+    async def async_read_registers(
+        self, register: int, word_count: int, priority: Priority
+    ) -> List[int]:
+        """Read a block of holding registers."""
+        return await self._bus.async_read_registers(
+            self._slave_id, register, word_count, priority
+        )
+
+    async def async_write_register(
+        self, register: int, value: int, priority: Priority
+    ) -> None:
+        """Write a single holding register."""
+        await self._bus.async_write_register(self._slave_id, register, value, priority)
+
+    async def async_write_registers(
+        self, register: int, values: List[int], priority: Priority
+    ) -> None:
+        """Write a block of holding registers."""
+        await self._bus.async_write_registers(
+            self._slave_id, register, values, priority
+        )
+
+    async def async_close(self) -> None:
+        """Nothing to release; the bus is released with the coordinator."""
+
+
+class TransportHealth:
+    """Recent latency and success rate of one transport.
+
+    Both are exponentially weighted moving averages, so a transport that
+    recovers earns its score back over a few transactions. After a failure
+    the transport is not tried first again until its backoff has passed.
+    """
+
+    def __init__(self, alpha: float = FAILOVER_EWMA_ALPHA) -> None:
+        """Initialize the health of an untried transport."""
+        self._alpha = alpha
+        self.success_rate = 1.0
+        # Unknown until the first successful transaction
+        self.latency: Optional[float] = None
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def record_success(self, latency: float) -> None:
+        """Record a transaction that succeeded after `latency` seconds."""
+        self.success_rate += self._alpha * (1.0 - self.success_rate)
+        self.latency = (
+            latency
+            if self.latency is None
+            else self.latency + self._alpha * (latency - self.latency)
+        )
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def record_failure(self, now: float) -> None:
+        """Record a failed transaction and back off from the transport."""
+        self.success_rate -= self._alpha * self.success_rate
+        self.failures += 1
+        backoff = min(
+            FAILOVER_BACKOFF_MIN * 2 ** (self.failures - 1), FAILOVER_BACKOFF_MAX
+        )
+        self.retry_at = now + backoff
+
+    def ready(self, now: float) -> bool:
+        """Return whether the transport's backoff has passed."""
+        return now >= self.retry_at
+
+    @property
+    def score(self) -> float:
+        """Return the expected seconds per successful transaction; lower is better.
+
+        Untried transports score worst, so a fallback only gets traffic once
+        the transports known to work fail.
+        """
+        if self.latency is None:
+            return math.inf
+        return self.latency / max(self.success_rate, 0.01)
+
+
+class FailoverLink:
+    """Reach a device over the healthiest of several transports.
+
+    The first link is the primary. Each transaction goes to the link with
+    the best score, the primary's being divided by `primary_bias` so traffic
+    only moves off it when another link is clearly better. A transaction
+    that fails is retried on the next link right away, so a poll losing its
+    transport part-way through still reads every block. Once the primary's
+    backoff has passed it is tried first again, and traffic fails back as
+    soon as it answers.
+    """
+
+    def __init__(
+        self,
+        links: Sequence[RegisterLink],
+        primary_bias: float = FAILOVER_PRIMARY_BIAS,
+    ) -> None:
+        """Initialize failover across the links, primary first."""
+        self.links = list(links)
+        self.health: Dict[RegisterLink, TransportHealth] = {
+            link: TransportHealth() for link in self.links
+        }
+        self._primary_bias = primary_bias
+        # The link the last successful transaction went over
+        self.active = self.links[0]
+
+    @property
+    def name(self) -> str:
+        """Return the name of the active link."""
+        return self.active.name
+
+    def ranked(self, now: float) -> List[RegisterLink]:
+        """Return the links in the order to try them.
+
+        Links still backing off come last, soonest ready first, so a
+        transaction is never refused while any link might answer.
+        """
+        primary = self.links[0]
+
+        def score(link: RegisterLink) -> float:
+            health = self.health[link]
+            if link is not primary:
+                return health.score
+            # The primary is trusted until it has proven slower
+            if health.latency is None:
+                return 0.0
+            return health.score / self._primary_bias
+
+        ready = [link for link in self.links if self.health[link].ready(now)]
+        waiting = [link for link in self.links if link not in ready]
+        return sorted(ready, key=score) + sorted(
+            waiting, key=lambda link: self.health[link].retry_at
+        )
+
+    async def _async_transact(
+        self, transaction: Callable[[RegisterLink], Awaitable[_T]]
+    ) -> _T:
+        """Run a transaction over the best link, failing over on errors."""
+        error: Optional[Exception] = None
+        for link in self.ranked(time.monotonic()):
+            start = time.monotonic()
+            try:
+                result = await transaction(link)
+            except ModbusExceptionResponse:
+                # The link delivered the device's answer; another link would
+                # only get the same refusal
+                self.health[link].record_success(time.monotonic() - start)
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                self.health[link].record_failure(time.monotonic())
+                LOGGER.debug("Transaction over %s failed: %s", link.name, err)
+                error = err
+                continue
+            self.health[link].record_success(time.monotonic() - start)
+            if link is not self.active:
+                await self._async_switch(link)
+            return result
+        assert error is not None
+        raise error
+
+    async def _async_switch(self, link: RegisterLink) -> None:
+        """Make a link the active one, releasing the one it replaces."""
+        previous, self.active = self.active, link
+        if link is self.links[0]:
+            LOGGER.info("Failed back from %s to primary %s", previous.name, link.name)
+        else:
+            LOGGER.warning("Failed over from %s to %s", previous.name, link.name)
+        await previous.async_close()
+
+    async def async_read_registers(
+        self, register: int, word_count: int, priority: Priority
+    ) -> List[int]:
+        """Read a block of holding registers."""
+        return await self._async_transact(
+            lambda link: link.async_read_registers(register, word_count, priority)
+        )
+
+    async def async_write_register(
+        self, register: int, value: int, priority: Priority
+    ) -> None:
+        """Write a single holding register."""
+        await self._async_transact(
+            lambda link: link.async_write_register(register, value, priority)
+        )
+
+    async def async_write_registers(
+        self, register: int, values: List[int], priority: Priority
+    ) -> None:
+        """Write a block of holding registers."""
+        await self._async_transact(
+            lambda link: link.async_write_registers(register, values, priority)
+        )
+
+    async def async_close(self) -> None:
+        """Release every link."""
+        for link in self.links:
+            await link.async_close()
@@ -0,0 +1,196 @@
+"""Backfill of controller daily history into long-term statistics."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN, LOGGER
+from .scheduler import Priority
+
+if TYPE_CHECKING:
+    from .uart import RenogyActiveUARTCoordinator
+
+# Register holding the number of days the controller has been operating
+OPERATING_DAYS_REGISTER = 0x0115
+# Daily history records start here, newest first: record k is k days ago
+HISTORY_START_REGISTER = 0xF000
+HISTORY_RECORD_WORDS = 10
+# Largest read we issue; 12 records fit well under the Modbus limit of 125 words
+HISTORY_MAX_READ_WORDS = 120
+DEFAULT_HISTORY_DAYS = 30
+MAX_HISTORY_DAYS = 365
+
+# Field -> (word offset in record, scale)
+HISTORY_FIELDS: Dict[str, Tuple[int, float]] = {
+    "battery_min_voltage": (0, 0.1),
+    "battery_max_voltage": (1, 0.1),
+    "max_charging_current": (2, 0.01),
+    "max_discharging_current": (3, 0.01),
+    "max_charging_power": (4, 1),
+    "max_discharging_power": (5, 1),
+    "charging_amp_hours": (6, 1),
+    "discharging_amp_hours": (7, 1),
+    "power_generation": (8, 1),
+    "power_consumption": (9, 1),
+}
+
+
+@dataclass(frozen=True)
+class HistoryStatistic:
+    """A long-term statistic imported from the daily history."""
+
+    field: str
+    name: str
+    unit: Optional[str]
+    has_sum: bool
+
+
+HISTORY_STATISTICS: Tuple[HistoryStatistic, ...] = (
+    HistoryStatistic("power_generation", "Power Generation", UnitOfEnergy.WATT_HOUR, True),
+    HistoryStatistic("power_consumption", "Power Consumption", UnitOfEnergy.WATT_HOUR, True),
+    HistoryStatistic("charging_amp_hours", "Charging Amp Hours", "Ah", True),
+    HistoryStatistic("discharging_amp_hours", "Discharging Amp Hours", "Ah", True),
+    HistoryStatistic("max_charging_power", "Max Charging Power", UnitOfPower.WATT, False),
+    HistoryStatistic("max_discharging_power", "Max Discharging Power", UnitOfPower.WATT, False),
+)
+
+
+def history_reads(days: int) -> List[Tuple[int, int]]:
+    """Return coalesced (register, word_count) reads covering records 0..days-1."""
+    total_words = days * HISTORY_RECORD_WORDS
+    reads = []
+    for offset in range(0, total_words, HISTORY_MAX_READ_WORDS):
+        reads.append(
+            (
+                HISTORY_START_REGISTER + offset,
+                min(HISTORY_MAX_READ_WORDS, total_words - offset),
+            )
+        )
+    return reads
+
+
+def decode_history(registers: Sequence[int]) -> List[Dict[str, float]]:
+    """Decode consecutive daily records, newest first."""
+    records = []
+    for start in range(0, len(registers) - HISTORY_RECORD_WORDS + 1, HISTORY_RECORD_WORDS):
+        record = registers[start : start + HISTORY_RECORD_WORDS]
+        records.append(
+            {field: record[index] * scale for field, (index, scale) in HISTORY_FIELDS.items()}
+        )
+    return records
+
+
+def statistic_id(address: str, field: str) -> str:
+    """Return the external statistic ID of a history field for a device."""
+    return f"{DOMAIN}:{slugify(address)}_{field}"
+
+
+def day_start(day: date) -> datetime:
+    """Return the hour-aligned UTC start used for a day's statistics row."""
+    start = dt_util.as_utc(dt_util.start_of_local_day(day))
+    return start.replace(minute=0, second=0, microsecond=0)
+
+
+async def async_read_history(
+    coordinator: RenogyActiveUARTCoordinator, days: int
+) -> List[Dict[str, float]]:
+    """Read and decode up to `days` daily records from the controller."""
+    (operating_days,) = await coordinator.async_read_registers(
+        OPERATING_DAYS_REGISTER, 1, Priority.BACKGROUND
+    )
+    days = min(days, operating_days)
+    registers: List[int] = []
+    for register, word_count in history_reads(days):
+        registers.extend(
+            await coordinator.async_read_registers(
+                register, word_count, Priority.BACKGROUND
+            )
+        )
+    return decode_history(registers)
+
+
+async def async_import_history(
+    hass: HomeAssistant,
+    coordinator: RenogyActiveUARTCoordinator,
+    days: int = DEFAULT_HISTORY_DAYS,
+) -> int:
+    """Import completed days of controller history into long-term statistics.
+
+    Days already present in the statistics are skipped, so repeated runs only
+    import new days. Returns the number of days imported.
+    """
+    records = await async_read_history(coordinator, days)
+    today = dt_util.now().date()
+    # Record 0 is the current, still incomplete, day
+    completed = [
+        (day_start(today - timedelta(days=age)), record)
+        for age, record in enumerate(records)
+        if age > 0
+    ]
+    completed.reverse()
+
+    imported = 0
+    for statistic in HISTORY_STATISTICS:
+        stat_id = statistic_id(coordinator.address, statistic.field)
+        last = await get_instance(hass).async_add_executor_job(
+            get_last_statistics, hass, 1, stat_id, True, {"sum"}
+        )
+        last_start: Optional[float] = None
+        total = 0.0
+        if last.get(stat_id):
+            last_start = last[stat_id][0]["start"]
+            total = last[stat_id][0].get("sum") or 0.0
+
+        rows: List[StatisticData] = []
+        for start, record in completed:
+            if last_start is not None and start.timestamp() <= last_start:
+                continue
+            value = record[statistic.field]
+            if statistic.has_sum:
+                total += value
+                rows.append(StatisticData(start=start, state=value, sum=total))
+            else:
+                rows.append(StatisticData(start=start, mean=value, min=value, max=value))
+
+        if not rows:
+            continue
+
+        metadata = StatisticMetaData(
+            has_mean=not statistic.has_sum,
+            mean_type=(
+                StatisticMeanType.NONE
+                if statistic.has_sum
+                else StatisticMeanType.ARITHMETIC
+            ),
+            has_sum=statistic.has_sum,
+            name=f"{coordinator.device.name} {statistic.name}",
+            source=DOMAIN,
+            statistic_id=stat_id,
+            unit_of_measurement=statistic.unit,
+        )
+        async_add_external_statistics(hass, metadata, rows)
+        imported = max(imported, len(rows))
+
+    LOGGER.info(
+        "Imported %s days of history from %s into long-term statistics",
+        imported,
+        coordinator.address,
+    )
+    return imported
@@ -0,0 +1,227 @@
+"""Modbus RTU and TCP framing shared by the Renogy transports."""
+
+from __future__ import annotations
+
+import struct
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+FUNCTION_READ_HOLDING_REGISTERS = 0x03
+FUNCTION_READ_INPUT_REGISTERS = 0x04
+FUNCTION_WRITE_REGISTER = 0x06
+FUNCTION_WRITE_REGISTERS = 0x10
+READ_FUNCTIONS = (FUNCTION_READ_HOLDING_REGISTERS, FUNCTION_READ_INPUT_REGISTERS)
+WRITE_FUNCTIONS = (FUNCTION_WRITE_REGISTER, FUNCTION_WRITE_REGISTERS)
+
+# Exception responses set the high bit of the function code
+EXCEPTION_FLAG = 0x80
+# device_id + function + exception code + CRC
+EXCEPTION_RESPONSE_LENGTH = 5
+# function + exception code
+EXCEPTION_RESPONSE_PDU_LENGTH = 2
+# Write responses echo the function, address and value or count
+WRITE_RESPONSE_PDU_LENGTH = 5
+# transaction ID, protocol ID, length, unit ID
+MBAP_HEADER = struct.Struct(">HHHB")
+MODBUS_TCP_PROTOCOL = 0
+# Largest PDU a Modbus frame carries; the MBAP length also counts the unit ID
+MAX_PDU_LENGTH = 253
+# Bits per character on the wire: start + 8 data + stop (+ parity or second stop)
+BITS_PER_CHARACTER = 11
+# Above 19200 baud the spec fixes the inter-frame silence at 1.75 ms
+FIXED_SILENCE_BAUDRATE = 19200
+FIXED_SILENCE = 0.00175
+
+
+class ModbusError(Exception):
+    """A Modbus transaction failed."""
+
+
+class ModbusExceptionResponse(ModbusError):
+    """The device answered a request with a Modbus exception response."""
+
+
+def modbus_crc(data: bytes) -> tuple:
+    """Calculate the Modbus CRC16 of the given data.
+
+    Returns a tuple (crc_low, crc_high) where the low byte is sent first.
+    """
+    crc = 0xFFFF
+    for pos in data:
+        crc ^= pos
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+    return (crc & 0xFF, (crc >> 8) & 0xFF)
+
+
+def _with_crc(frame: bytes) -> bytes:
+    """Append the CRC to a frame."""
+    return frame + bytes(modbus_crc(frame))
+
+
+def check_crc(frame: bytes) -> bool:
+    """Return True if the trailing CRC of a frame is valid."""
+    return len(frame) > 2 and bytes(modbus_crc(frame[:-2])) == frame[-2:]
+
+
+def frame_silence(baudrate: int) -> float:
+    """Return the minimum silence between frames (3.5 characters) in seconds."""
+    if baudrate > FIXED_SILENCE_BAUDRATE:
+        return FIXED_SILENCE
+    return 3.5 * BITS_PER_CHARACTER / baudrate
+
+
+@lru_cache(maxsize=64)
+def read_pdu(register: int, word_count: int) -> bytes:
+    """Build a read holding registers request PDU.
+
+    Polls repeat the same few requests, so PDUs are computed once.
+    """
+    return (
+        bytes([FUNCTION_READ_HOLDING_REGISTERS])
+        + register.to_bytes(2, "big")
+        + word_count.to_bytes(2, "big")
+    )
+
+
+def write_register_pdu(register: int, value: int) -> bytes:
+    """Build a write single register request PDU."""
+    return (
+        bytes([FUNCTION_WRITE_REGISTER])
+        + register.to_bytes(2, "big")
+        + value.to_bytes(2, "big")
+    )
+
+
+def write_registers_pdu(register: int, values: Sequence[int]) -> bytes:
+    """Build a write multiple registers request PDU."""
+    return (
+        bytes([FUNCTION_WRITE_REGISTERS])
+        + register.to_bytes(2, "big")
+        + len(values).to_bytes(2, "big")
+        + bytes([len(values) * 2])
+        + b"".join(value.to_bytes(2, "big") for value in values)
+    )
+
+
+def read_response_pdu_length(word_count: int) -> int:
+    """Return the PDU length of a read holding registers response."""
+    # function + byte count + data
+    return 2 + word_count * 2
+
+
+@lru_cache(maxsize=64)
+def build_rtu_frame(device_id: int, pdu: bytes) -> bytes:
+    """Build an RTU frame: device ID, PDU and CRC."""
+    return _with_crc(bytes([device_id]) + pdu)
+
+
+def build_read_request(device_id: int, register: int, word_count: int) -> bytes:
+    """Build a read holding registers RTU request frame."""
+    return build_rtu_frame(device_id, read_pdu(register, word_count))
+
+
+def build_write_registers_request(
+    device_id: int, register: int, values: Sequence[int]
+) -> bytes:
+    """Build a write multiple registers RTU request frame."""
+    return build_rtu_frame(device_id, write_registers_pdu(register, values))
+
+
+def build_tcp_frame(transaction_id: int, unit_id: int, pdu: bytes) -> bytes:
+    """Build a Modbus TCP frame: MBAP header and PDU."""
+    return MBAP_HEADER.pack(transaction_id, MODBUS_TCP_PROTOCOL, len(pdu) + 1, unit_id) + pdu
+
+
+def check_pdu(request_pdu: bytes, response_pdu: bytes) -> None:
+    """Validate a response PDU against the request it answers."""
+    if response_pdu[0] == request_pdu[0] | EXCEPTION_FLAG:
+        raise ModbusExceptionResponse(
+            f"Device returned exception code {response_pdu[1]}"
+        )
+    if response_pdu[0] != request_pdu[0]:
+        raise ModbusError(f"Unexpected function code {response_pdu[0]} in response")
+
+
+def decode_registers(response_pdu: bytes) -> List[int]:
+    """Return the register values of a read holding registers response PDU."""
+    byte_count = response_pdu[1]
+    data = response_pdu[2 : 2 + byte_count]
+    return [int.from_bytes(data[i : i + 2], "big") for i in range(0, byte_count, 2)]
+
+
+def rtu_response_length(header: bytes) -> Optional[int]:
+    """Return the length of the RTU response frame a header starts.
+
+    Returns None while more bytes are needed to tell, and 0 when the header
+    cannot start a response to any request this integration sends.
+    """
+    if len(header) < 2:
+        return None
+    function = header[1]
+    if function & EXCEPTION_FLAG:
+        if function & ~EXCEPTION_FLAG not in READ_FUNCTIONS + WRITE_FUNCTIONS:
+            return 0
+        return EXCEPTION_RESPONSE_LENGTH
+    if function in WRITE_FUNCTIONS:
+        # device_id + PDU + CRC
+        return 1 + WRITE_RESPONSE_PDU_LENGTH + 2
+    if function not in READ_FUNCTIONS:
+        return 0
+    if len(header) < 3:
+        return None
+    # device_id + function + byte count + data + CRC
+    return 3 + header[2] + 2
+
+
+def rtu_response_matches(request: bytes, response: bytes) -> bool:
+    """Return whether an RTU response frame answers a request frame."""
+    if response[1] & ~EXCEPTION_FLAG != request[1]:
+        return False
+    if request[1] in READ_FUNCTIONS and not response[1] & EXCEPTION_FLAG:
+        return response[2] == 2 * int.from_bytes(request[4:6], "big")
+    return True
+
+
+class RtuFrameReassembler:
+    """Split a stream of RTU response bytes into CRC-checked frames.
+
+    Frames may be split over several chunks, or several may arrive in one
+    chunk. The length of each frame is read from its header; bytes that do
+    not start a frame with a valid CRC are skipped one at a time until the
+    stream is back in sync.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the reassembler."""
+        self._buffer = bytearray()
+
+    @property
+    def pending(self) -> int:
+        """Return the number of bytes of an incomplete frame."""
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add received bytes and return the frames they complete."""
+        self._buffer.extend(data)
+        frames: List[bytes] = []
+        while (length := rtu_response_length(self._buffer)) is not None:
+            if length == 0:
+                del self._buffer[0]
+                continue
+            if len(self._buffer) < length:
+                break
+            frame = bytes(self._buffer[:length])
+            if check_crc(frame):
+                frames.append(frame)
+                del self._buffer[:length]
+            else:
+                del self._buffer[0]
+        return frames
+
+    def clear(self) -> None:
+        """Drop any incomplete frame."""
+        self._buffer.clear()
@@ -0,0 +1,86 @@
+"""Phase-aligned poll scheduling across Renogy devices."""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_PHASE_PLANNER, LOGGER
+
+# Time reserved for one device's poll when packing devices on a shared bus
+POLL_SLOT_SECONDS = 1.0
+
+
+def next_refresh(now: float, interval: float, offset: float) -> float:
+    """Return the first time after `now` that falls on the given phase.
+
+    Ticks are at least half an interval after `now`, so a refresh that ran
+    early (e.g. on request) does not trigger another one right away.
+    """
+    ticks = math.ceil((now + interval / 2 - offset) / interval)
+    return offset + ticks * interval
+
+
+class PhasePlanner:
+    """Assign every polled device a deterministic phase within its interval.
+
+    Groups (devices sharing a bus) are spread evenly over the interval and
+    the devices of a group are packed back-to-back, so buses never poll at
+    the same moment and a bus works through its devices in one burst. Phases
+    are recomputed whenever a device is added or removed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the planner."""
+        self._members: Dict[str, Tuple[str, Callable[[], None]]] = {}
+        # member -> (fraction of the interval of its group, slot within the group)
+        self._phases: Dict[str, Tuple[float, int]] = {}
+
+    @callback
+    def async_register(
+        self, member: str, group: str, on_change: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Add a device; `on_change` is called when its phase moves."""
+        self._members[member] = (group, on_change)
+        self._async_rebalance()
+
+        @callback
+        def _async_unregister() -> None:
+            if self._members.pop(member, None) is not None:
+                self._phases.pop(member, None)
+                self._async_rebalance()
+
+        return _async_unregister
+
+    def offset(self, member: str, interval: float) -> float:
+        """Return the phase offset of a device in seconds."""
+        fraction, slot = self._phases.get(member, (0.0, 0))
+        return (fraction * interval + slot * POLL_SLOT_SECONDS) % interval
+
+    @callback
+    def _async_rebalance(self) -> None:
+        """Recompute all phases and notify devices whose phase changed."""
+        groups: Dict[str, list] = {}
+        for member, (group, _) in self._members.items():
+            groups.setdefault(group, []).append(member)
+
+        phases = {}
+        for index, group in enumerate(sorted(groups)):
+            for slot, member in enumerate(sorted(groups[group])):
+                phases[member] = (index / len(groups), slot)
+
+        changed = [member for member, phase in phases.items() if self._phases.get(member) != phase]
+        self._phases = phases
+        for member in changed:
+            LOGGER.debug("Poll phase of %s is now %s", member, phases[member])
+            self._members[member][1]()
+
+
+@callback
+def async_get_phase_planner(hass: HomeAssistant) -> PhasePlanner:
+    """Return the planner shared by all devices."""
+    if (planner := hass.data.get(DATA_PHASE_PLANNER)) is None:
+        planner = hass.data[DATA_PHASE_PLANNER] = PhasePlanner()
+    return planner
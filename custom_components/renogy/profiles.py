@@ -0,0 +1,203 @@
+"""Charge parameter profiles for Renogy charge controllers."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Mapping, Sequence, Tuple
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import LOGGER
+from .scheduler import Priority
+
+if TYPE_CHECKING:
+    from .uart import RenogyActiveUARTCoordinator
+
+# Contiguous block of charge settings, 0xE002 (capacity) to 0xE014 (temp. compensation)
+CHARGE_SETTINGS_REGISTER = 0xE002
+CHARGE_SETTINGS_WORDS = 19
+
+# Writable setting -> (register, scale of one raw unit)
+CHARGE_SETTINGS: Dict[str, Tuple[int, float]] = {
+    "battery_capacity": (0xE002, 1),
+    "battery_type": (0xE004, 1),
+    "overvoltage_threshold": (0xE005, 0.1),
+    "charging_limit_voltage": (0xE006, 0.1),
+    "equalizing_charging_voltage": (0xE007, 0.1),
+    "boost_charging_voltage": (0xE008, 0.1),
+    "floating_charging_voltage": (0xE009, 0.1),
+    "boost_charging_recovery_voltage": (0xE00A, 0.1),
+    "over_discharge_recovery_voltage": (0xE00B, 0.1),
+    "under_voltage_warning_level": (0xE00C, 0.1),
+    "over_discharge_voltage": (0xE00D, 0.1),
+    "discharging_limit_voltage": (0xE00E, 0.1),
+    "over_discharge_time_delay": (0xE010, 1),
+    "equalizing_charging_time": (0xE011, 1),
+    "boost_charging_time": (0xE012, 1),
+    "equalizing_charging_interval": (0xE013, 1),
+    "temperature_compensation_factor": (0xE014, 1),
+}
+
+# Battery type codes, as decoded by renogy-ble
+BATTERY_TYPE_OPEN = 1
+BATTERY_TYPE_SEALED = 2
+BATTERY_TYPE_GEL = 3
+BATTERY_TYPE_LITHIUM = 4
+BATTERY_TYPE_CUSTOM = 5
+
+# Named profiles. Preset battery types use the controller's built-in voltages;
+# custom profiles carry their own (12 V system) voltages.
+CHARGE_PROFILES: Dict[str, Dict[str, float]] = {
+    "flooded": {"battery_type": BATTERY_TYPE_OPEN},
+    "sealed": {"battery_type": BATTERY_TYPE_SEALED},
+    "gel": {"battery_type": BATTERY_TYPE_GEL},
+    "lithium": {"battery_type": BATTERY_TYPE_LITHIUM},
+    "lifepo4_12v": {
+        "battery_type": BATTERY_TYPE_CUSTOM,
+        "overvoltage_threshold": 15.0,
+        "charging_limit_voltage": 14.6,
+        "equalizing_charging_voltage": 14.4,
+        "boost_charging_voltage": 14.4,
+        "floating_charging_voltage": 13.6,
+        "boost_charging_recovery_voltage": 13.2,
+        "over_discharge_recovery_voltage": 12.6,
+        "under_voltage_warning_level": 12.0,
+        "over_discharge_voltage": 11.1,
+        "discharging_limit_voltage": 10.6,
+        "over_discharge_time_delay": 5,
+        "equalizing_charging_time": 0,
+        "boost_charging_time": 120,
+        "equalizing_charging_interval": 0,
+        "temperature_compensation_factor": 0,
+    },
+}
+
+_WRITABLE_REGISTERS = frozenset(register for register, _ in CHARGE_SETTINGS.values())
+
+
+def encode_profile(profile: Mapping[str, float]) -> Dict[int, int]:
+    """Return the raw register values of a profile."""
+    encoded = {}
+    for name, value in profile.items():
+        register, scale = CHARGE_SETTINGS[name]
+        encoded[register] = round(value / scale)
+    return encoded
+
+
+def plan_writes(
+    current: Sequence[int], desired: Mapping[int, int]
+) -> List[Tuple[int, List[int]]]:
+    """Return the multi-register writes that bring `current` to `desired`.
+
+    Changed registers are coalesced into runs of contiguous writable
+    registers; unchanged registers between changes are rewritten with their
+    current value so each run is a single function 0x10 write.
+    """
+    values = list(current)
+    changed = set()
+    for register, value in desired.items():
+        index = register - CHARGE_SETTINGS_REGISTER
+        if values[index] != value:
+            values[index] = value
+            changed.add(register)
+
+    writes: List[Tuple[int, List[int]]] = []
+    run_start = None
+    run_has_change = False
+    for offset in range(CHARGE_SETTINGS_WORDS + 1):
+        register = CHARGE_SETTINGS_REGISTER + offset
+        if register in _WRITABLE_REGISTERS:
+            if run_start is None:
+                run_start = register
+                run_has_change = False
+            run_has_change |= register in changed
+            continue
+        if run_start is not None and run_has_change:
+            # Trim unchanged registers from both ends of the run
+            run = [r for r in range(run_start, register) if r in changed]
+            first, last = run[0], run[-1]
+            writes.append(
+                (
+                    first,
+                    values[
+                        first - CHARGE_SETTINGS_REGISTER : last - CHARGE_SETTINGS_REGISTER + 1
+                    ],
+                )
+            )
+        run_start = None
+    return writes
+
+
+async def async_apply_profile(
+    coordinator: RenogyActiveUARTCoordinator, profile: Mapping[str, float]
+) -> List[str]:
+    """Write a charge profile to the controller and verify it by reading back.
+
+    Only changed registers are written. If a write fails, the registers
+    already written are restored to their previous values. Returns the names
+    of the settings that were changed.
+    """
+    desired = encode_profile(profile)
+    current = await coordinator.async_read_registers(
+        CHARGE_SETTINGS_REGISTER, CHARGE_SETTINGS_WORDS, Priority.ON_DEMAND
+    )
+    writes = plan_writes(current, desired)
+    changed = [
+        name
+        for name, (register, _) in CHARGE_SETTINGS.items()
+        if register in desired
+        and current[register - CHARGE_SETTINGS_REGISTER] != desired[register]
+    ]
+    if not writes:
+        LOGGER.debug("Charge profile already applied on %s", coordinator.address)
+        return changed
+
+    # Includes the write in progress, which may have been applied before it failed
+    attempted: List[Tuple[int, List[int]]] = []
+    try:
+        for register, values in writes:
+            attempted.append((register, values))
+            await coordinator.async_write_registers(register, values)
+    except Exception as err:
+        LOGGER.error(
+            "Writing charge profile to %s failed, restoring previous settings: %s",
+            coordinator.address,
+            err,
+        )
+        # Every block is restored even if another fails, and the original error wins
+        for register, values in reversed(attempted):
+            start = register - CHARGE_SETTINGS_REGISTER
+            try:
+                await coordinator.async_write_registers(
+                    register, list(current[start : start + len(values)])
+                )
+            except Exception as restore_err:
+                LOGGER.error(
+                    "Restoring registers 0x%04X-0x%04X on %s failed: %s",
+                    register,
+                    register + len(values) - 1,
+                    coordinator.address,
+                    restore_err,
+                )
+        raise
+
+    readback = await coordinator.async_read_registers(
+        CHARGE_SETTINGS_REGISTER, CHARGE_SETTINGS_WORDS, Priority.ON_DEMAND
+    )
+    mismatched = [
+        name
+        for name, (register, _) in CHARGE_SETTINGS.items()
+        if register in desired
+        and readback[register - CHARGE_SETTINGS_REGISTER] != desired[register]
+    ]
+    if mismatched:
+        raise HomeAssistantError(
+            f"Controller did not accept settings: {', '.join(mismatched)}"
+        )
+
+    LOGGER.info(
+        "Applied charge profile to %s in %s writes, changed: %s",
+        coordinator.address,
+        len(writes),
+        ", ".join(changed),
+    )
+    return changed
@@ -0,0 +1,178 @@
+"""Rolling statistics over the last hour of a device's values."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from typing import Any, Deque, Dict, Mapping, Optional, Sequence, Tuple
+
+from .const import MIN_SCAN_INTERVAL
+
+# Span of the rolling statistics, matching the suffix of their keys
+ROLLING_WINDOW = 3600.0  # seconds
+ROLLING_SUFFIX = "1h"
+# Snapshots this soon after the last sample add none, so refreshes faster
+# than the shortest poll interval cannot drop the oldest samples early
+ROLLING_SPACING = MIN_SCAN_INTERVAL / 2  # seconds
+# Samples kept per value; enough for a window of samples at that spacing
+ROLLING_CAPACITY = int(ROLLING_WINDOW // ROLLING_SPACING)
+
+# Values with rolling statistics
+ROLLING_SOURCES = (
+    "battery_voltage",
+    "battery_current",
+    "battery_power",
+    "pv_voltage",
+    "pv_power",
+    "load_power",
+)
+
+STAT_MIN = "min"
+STAT_MAX = "max"
+STAT_MEAN = "mean"
+STAT_STDDEV = "stddev"
+ROLLING_STATS = (STAT_MIN, STAT_MAX, STAT_MEAN, STAT_STDDEV)
+
+
+def rolling_key(key: str, stat: str) -> str:
+    """Return the snapshot key of a statistic of a value, e.g. pv_power_max_1h."""
+    return f"{key}_{stat}_{ROLLING_SUFFIX}"
+
+
+class RollingWindow:
+    """Minimum, maximum, mean and standard deviation over a sliding time window.
+
+    Samples are kept in fixed-size arrays used as a ring. The sum and sum of
+    squares are updated as samples enter and leave, and the minimum and
+    maximum are the heads of monotonic deques, so adding a sample takes
+    amortized constant time however many the window holds. The sums are
+    recomputed each time the ring wraps, so rounding errors cannot build up.
+    """
+
+    def __init__(
+        self, window: float = ROLLING_WINDOW, capacity: int = ROLLING_CAPACITY
+    ) -> None:
+        """Initialize an empty window."""
+        self.window = window
+        self._capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        # Ring position of the oldest sample
+        self._head = 0
+        self.count = 0
+        # Samples ever added; identifies samples in the deques
+        self._added = 0
+        self._sum = 0.0
+        self._sum_squares = 0.0
+        # (sample number, value), values increasing from the left
+        self._minima: Deque[Tuple[int, float]] = deque()
+        # (sample number, value), values decreasing from the left
+        self._maxima: Deque[Tuple[int, float]] = deque()
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample taken at a monotonic timestamp (s)."""
+        self.expire(timestamp)
+        if self.count == self._capacity:
+            self._evict()
+        tail = (self._head + self.count) % self._capacity
+        self._timestamps[tail] = timestamp
+        self._values[tail] = value
+        self.count += 1
+        self._sum += value
+        self._sum_squares += value * value
+
+        number = self._added
+        self._added += 1
+        while self._minima and self._minima[-1][1] >= value:
+            self._minima.pop()
+        self._minima.append((number, value))
+        while self._maxima and self._maxima[-1][1] <= value:
+            self._maxima.pop()
+        self._maxima.append((number, value))
+
+    def expire(self, now: float) -> None:
+        """Drop the samples that have left the window."""
+        oldest = now - self.window
+        while self.count and self._timestamps[self._head] <= oldest:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the oldest sample."""
+        number = self._added - self.count
+        value = self._values[self._head]
+        self._head = (self._head + 1) % self._capacity
+        self.count -= 1
+        self._sum -= value
+        self._sum_squares -= value * value
+        if self._minima[0][0] == number:
+            self._minima.popleft()
+        if self._maxima[0][0] == number:
+            self._maxima.popleft()
+        if self._head == 0 or not self.count:
+            self._resum()
+
+    def _resum(self) -> None:
+        """Recompute the sums from the samples held."""
+        values = [
+            self._values[(self._head + position) % self._capacity]
+            for position in range(self.count)
+        ]
+        self._sum = math.fsum(values)
+        self._sum_squares = math.fsum(value * value for value in values)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Return the statistics of the samples held, None when empty."""
+        if not self.count:
+            return dict.fromkeys(ROLLING_STATS)
+        mean = self._sum / self.count
+        variance = max(self._sum_squares / self.count - mean * mean, 0.0)
+        return {
+            STAT_MIN: self._minima[0][1],
+            STAT_MAX: self._maxima[0][1],
+            STAT_MEAN: round(mean, 3),
+            STAT_STDDEV: round(math.sqrt(variance), 3),
+        }
+
+
+class RollingStatistics:
+    """The rolling windows of a device's values, shared by all its statistic sensors."""
+
+    def __init__(
+        self,
+        keys: Sequence[str] = ROLLING_SOURCES,
+        window: float = ROLLING_WINDOW,
+        capacity: int = ROLLING_CAPACITY,
+        spacing: float = ROLLING_SPACING,
+    ) -> None:
+        """Initialize a window per value."""
+        self.windows = {key: RollingWindow(window, capacity) for key in keys}
+        self.spacing = spacing
+        # Timestamp of the last snapshot that added samples
+        self._sampled_at = -math.inf
+
+    def add(self, timestamp: float, data: Mapping[str, Any]) -> Dict[str, Any]:
+        """Add a snapshot taken at a monotonic timestamp and return the statistics.
+
+        Statistics are only returned for values the snapshot reports, so
+        devices without them never get the statistic entities. A value that
+        is missing from one snapshot adds no sample, while its older samples
+        keep expiring. A snapshot taken within the spacing of the last one
+        that was sampled adds none either.
+        """
+        sample = timestamp - self._sampled_at >= self.spacing
+        if sample:
+            self._sampled_at = timestamp
+        stats: Dict[str, Any] = {}
+        for key, window in self.windows.items():
+            if key not in data:
+                continue
+            value = data[key]
+            numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if sample and numeric:
+                window.add(timestamp, float(value))
+            else:
+                window.expire(timestamp)
+            for stat, result in window.stats().items():
+                stats[rolling_key(key, stat)] = result
+        return stats
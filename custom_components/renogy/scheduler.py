@@ -0,0 +1,81 @@
+"""Priority scheduling of transactions on a shared bus."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, List, Tuple
+
+
+class Priority(IntEnum):
+    """Transaction priorities, lower values are served first."""
+
+    CONTROL = 0
+    ON_DEMAND = 1
+    POLL = 2
+    BACKGROUND = 3
+
+
+class TransactionScheduler:
+    """Grant access to a bus to a limited number of transactions at a time.
+
+    Waiting transactions are served by priority and then in arrival order.
+    Callers submit one transaction (a single request/response) at a time, so
+    a multi-block poll yields the bus between blocks and a control write only
+    ever waits for the block currently on the wire. A capacity above one
+    bounds concurrent transactions across several buses.
+    """
+
+    def __init__(self, capacity: int = 1) -> None:
+        """Initialize the scheduler."""
+        self._capacity = capacity
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def depth(self) -> int:
+        """Return the number of transactions waiting for the bus."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @property
+    def active(self) -> int:
+        """Return the number of transactions holding the bus."""
+        return self._active
+
+    @asynccontextmanager
+    async def transaction(self, priority: Priority) -> AsyncIterator[None]:
+        """Hold the bus for one transaction."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: Priority) -> None:
+        """Wait until the bus is granted; the caller must release it."""
+        if self._active < self._capacity and not self._waiters:
+            self._active += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled; pass the bus on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Hand the bus to the next waiting transaction, if any."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
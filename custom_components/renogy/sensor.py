@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
@@ -20,17 +21,39 @@ from homeassistant.const import (
     UnitOfEnergy,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .ble_signal import KEY_BLE_SIGNAL_FAILURES
+from .ble_slots import KEY_BLE_SLOT_WAIT
+from .bus import KEY_BUS_QUEUE_DEPTH
+from .derived import (
+    KEY_BATTERY_POWER,
+    KEY_CHARGING_EFFICIENCY,
+    KEY_LOAD_SHARE,
+    KEY_TIME_TO_EMPTY,
+    KEY_TIME_TO_FULL,
+)
+from .energy import KEY_BATTERY_ENERGY, KEY_LOAD_ENERGY, KEY_PV_ENERGY
+from .failover import KEY_ACTIVE_TRANSPORT
+from .rolling import (
+    ROLLING_SOURCES,
+    ROLLING_STATS,
+    STAT_MAX,
+    STAT_MEAN,
+    STAT_MIN,
+    STAT_STDDEV,
+    rolling_key,
+)
 from .uart import RenogyActiveUARTCoordinator, RenogyUARTDevice
 from .const import (
     ATTR_MANUFACTURER,
-    CONF_DEVICE_TYPE,
     DEFAULT_DEVICE_TYPE,
     DOMAIN,
     LOGGER,
@@ -69,8 +92,14 @@ KEY_MAX_DISCHARGING_POWER_TODAY = "max_discharging_power_today"
 class RenogySensorDescription(SensorEntityDescription):
     """Describes a Renogy UART sensor."""
 
-    # Function to extract value from the device's parsed data
+    # Optional function to extract the value; defaults to a lookup of `key`
     value_fn: Optional[Callable[[Dict[str, Any]], Any]] = None
+    # Divide the raw value by this to convert it to the native unit
+    divisor: Optional[float] = None
+    # Restore the last state on startup and hand it back to the coordinator
+    restore_state: bool = False
+    # Net flows are negative in one direction, as large as they are positive
+    signed: bool = False
 
 
 BATTERY_SENSORS: tuple[RenogySensorDescription, ...] = (
@@ -80,7 +109,6 @@ BATTERY_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_VOLTAGE),
     ),
     RenogySensorDescription(
         key=KEY_BATTERY_CURRENT,
@@ -88,7 +116,6 @@ BATTERY_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_CURRENT),
     ),
     RenogySensorDescription(
         key=KEY_BATTERY_PERCENTAGE,
@@ -96,7 +123,6 @@ BATTERY_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.BATTERY,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_PERCENTAGE),
     ),
     RenogySensorDescription(
         key=KEY_BATTERY_TEMPERATURE,
@@ -104,13 +130,11 @@ BATTERY_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_BATTERY_TEMPERATURE),
     ),
     RenogySensorDescription(
         key=KEY_BATTERY_TYPE,
         name="Battery Type",
         device_class=None,
-        value_fn=lambda data: data.get(KEY_BATTERY_TYPE),
     ),
     RenogySensorDescription(
         key=KEY_CHARGING_AMP_HOURS_TODAY,
@@ -118,7 +142,6 @@ BATTERY_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement="Ah",
         device_class=None,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_CHARGING_AMP_HOURS_TODAY),
     ),
     RenogySensorDescription(
         key=KEY_DISCHARGING_AMP_HOURS_TODAY,
@@ -126,13 +149,11 @@ BATTERY_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement="Ah",
         device_class=None,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_DISCHARGING_AMP_HOURS_TODAY),
     ),
     RenogySensorDescription(
         key=KEY_CHARGING_STATUS,
         name="Charging Status",
         device_class=None,
-        value_fn=lambda data: data.get(KEY_CHARGING_STATUS),
     ),
 )
 
@@ -143,7 +164,6 @@ PV_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_PV_VOLTAGE),
     ),
     RenogySensorDescription(
         key=KEY_PV_CURRENT,
@@ -151,7 +171,6 @@ PV_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_PV_CURRENT),
     ),
     RenogySensorDescription(
         key=KEY_PV_POWER,
@@ -159,7 +178,6 @@ PV_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_PV_POWER),
     ),
     RenogySensorDescription(
         key=KEY_MAX_CHARGING_POWER_TODAY,
@@ -167,7 +185,6 @@ PV_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_MAX_CHARGING_POWER_TODAY),
     ),
     RenogySensorDescription(
         key=KEY_POWER_GENERATION_TODAY,
@@ -175,7 +192,6 @@ PV_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_POWER_GENERATION_TODAY),
     ),
     RenogySensorDescription(
         key=KEY_POWER_GENERATION_TOTAL,
@@ -183,11 +199,7 @@ PV_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: (
-            None
-            if data.get(KEY_POWER_GENERATION_TOTAL) is None
-            else data.get(KEY_POWER_GENERATION_TOTAL) / 1000
-        ),
+        divisor=1000,
     ),
 )
 
@@ -198,7 +210,6 @@ LOAD_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_LOAD_VOLTAGE),
     ),
     RenogySensorDescription(
         key=KEY_LOAD_CURRENT,
@@ -206,7 +217,6 @@ LOAD_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_LOAD_CURRENT),
     ),
     RenogySensorDescription(
         key=KEY_LOAD_POWER,
@@ -214,13 +224,11 @@ LOAD_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_LOAD_POWER),
     ),
     RenogySensorDescription(
         key=KEY_LOAD_STATUS,
         name="Load Status",
         device_class=None,
-        value_fn=lambda data: data.get(KEY_LOAD_STATUS),
     ),
     RenogySensorDescription(
         key=KEY_POWER_CONSUMPTION_TODAY,
@@ -228,7 +236,6 @@ LOAD_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(KEY_POWER_CONSUMPTION_TODAY),
     ),
 )
 
@@ -239,21 +246,20 @@ CONTROLLER_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_CONTROLLER_TEMPERATURE),
     ),
     RenogySensorDescription(
         key=KEY_DEVICE_ID,
         name="Device ID",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_DEVICE_ID),
+        entity_registry_enabled_default=False,
     ),
     RenogySensorDescription(
         key=KEY_MODEL,
         name="Model",
         device_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(KEY_MODEL),
+        entity_registry_enabled_default=False,
     ),
     RenogySensorDescription(
         key=KEY_MAX_DISCHARGING_POWER_TODAY,
@@ -261,12 +267,213 @@ CONTROLLER_SENSORS: tuple[RenogySensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.WATT,
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(KEY_MAX_DISCHARGING_POWER_TODAY),
+    ),
+    RenogySensorDescription(
+        key=KEY_BUS_QUEUE_DEPTH,
+        name="Bus Queue Depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    RenogySensorDescription(
+        key=KEY_BLE_SLOT_WAIT,
+        name="Bluetooth Slot Wait",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        suggested_display_precision=1,
+    ),
+    RenogySensorDescription(
+        key=KEY_BLE_SIGNAL_FAILURES,
+        name="Bluetooth Signal Failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    RenogySensorDescription(
+        key=KEY_ACTIVE_TRANSPORT,
+        name="Active Transport",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+)
+
+# Energy integrated locally by the coordinator from sampled power readings
+ENERGY_SENSORS: tuple[RenogySensorDescription, ...] = (
+    RenogySensorDescription(
+        key=KEY_PV_ENERGY,
+        name="PV Energy",
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+        restore_state=True,
+    ),
+    RenogySensorDescription(
+        key=KEY_LOAD_ENERGY,
+        name="Load Energy",
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+        restore_state=True,
+    ),
+    RenogySensorDescription(
+        key=KEY_BATTERY_ENERGY,
+        name="Battery Energy",
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+        restore_state=True,
     ),
 )
 
+# Values derived by the coordinator from each snapshot
+DERIVED_SENSORS: tuple[RenogySensorDescription, ...] = (
+    RenogySensorDescription(
+        key=KEY_BATTERY_POWER,
+        name="Battery Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        signed=True,
+    ),
+    RenogySensorDescription(
+        key=KEY_CHARGING_EFFICIENCY,
+        name="Charging Efficiency",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    RenogySensorDescription(
+        key=KEY_TIME_TO_FULL,
+        name="Time to Full",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        suggested_display_precision=1,
+    ),
+    RenogySensorDescription(
+        key=KEY_TIME_TO_EMPTY,
+        name="Time to Empty",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        suggested_display_precision=1,
+    ),
+    RenogySensorDescription(
+        key=KEY_LOAD_SHARE,
+        name="Load Share",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+)
+
+STAT_NAMES = {
+    STAT_MIN: "Min",
+    STAT_MAX: "Max",
+    STAT_MEAN: "Mean",
+    STAT_STDDEV: "Std Dev",
+}
+
+
+def _rolling_sensors(
+    sources: Iterable[RenogySensorDescription],
+) -> tuple[RenogySensorDescription, ...]:
+    """Describe the rolling statistics of the values that have them."""
+    by_key = {description.key: description for description in sources}
+    return tuple(
+        RenogySensorDescription(
+            key=rolling_key(key, stat),
+            name=f"{by_key[key].name} 1h {STAT_NAMES[stat]}",
+            native_unit_of_measurement=by_key[key].native_unit_of_measurement,
+            # The spread of a power reading is not itself a power reading
+            device_class=None if stat == STAT_STDDEV else by_key[key].device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+            entity_registry_enabled_default=False,
+            signed=by_key[key].signed,
+        )
+        for key in ROLLING_SOURCES
+        for stat in ROLLING_STATS
+    )
+
+
+# Statistics over the last hour, kept in memory by the coordinator
+ROLLING_SENSORS = _rolling_sensors(
+    BATTERY_SENSORS + PV_SENSORS + LOAD_SENSORS + DERIVED_SENSORS
+)
+
 # All sensors combined
-ALL_SENSORS = BATTERY_SENSORS + PV_SENSORS + LOAD_SENSORS + CONTROLLER_SENSORS
+ALL_SENSORS = (
+    BATTERY_SENSORS
+    + PV_SENSORS
+    + LOAD_SENSORS
+    + CONTROLLER_SENSORS
+    + ENERGY_SENSORS
+    + DERIVED_SENSORS
+    + ROLLING_SENSORS
+)
+
+# Device classes whose values are validated as numbers within a sane range
+NUMERIC_DEVICE_CLASSES = frozenset(
+    {
+        SensorDeviceClass.VOLTAGE,
+        SensorDeviceClass.CURRENT,
+        SensorDeviceClass.TEMPERATURE,
+        SensorDeviceClass.POWER,
+    }
+)
+MIN_NUMERIC_VALUE = -1000
+MAX_NUMERIC_VALUE = 10000
+
+
+class SensorProjection:
+    """Projection of a parsed snapshot onto entity values.
+
+    The table is compiled once from the sensor descriptions so that every
+    coordinator update converts and validates all values in a single pass.
+    """
+
+    def __init__(self, descriptions: Iterable[RenogySensorDescription]) -> None:
+        """Compile the projection table."""
+        self._slots = tuple(
+            (
+                description.key,
+                description.value_fn,
+                description.divisor,
+                description.device_class in NUMERIC_DEVICE_CLASSES,
+                -MAX_NUMERIC_VALUE if description.signed else MIN_NUMERIC_VALUE,
+            )
+            for description in descriptions
+        )
+
+    def __call__(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the entity values for a parsed snapshot."""
+        values: Dict[str, Any] = {}
+        for key, value_fn, divisor, numeric, minimum in self._slots:
+            try:
+                value = value_fn(data) if value_fn else data.get(key)
+            except Exception as err:  # pylint: disable=broad-except
+                LOGGER.warning("Error getting value for %s: %s", key, err)
+                value = None
+
+            if value is not None and (numeric or divisor):
+                try:
+                    value = float(value)
+                except (ValueError, TypeError):
+                    LOGGER.warning("Invalid numeric value for %s: %s", key, value)
+                    value = None
+                else:
+                    if divisor:
+                        value /= divisor
+                    if numeric and not minimum <= value <= MAX_NUMERIC_VALUE:
+                        LOGGER.warning(
+                            "Value %s out of reasonable range for %s", value, key
+                        )
+                        value = None
+
+            values[key] = value
+        return values
 
 
 async def async_setup_entry(
@@ -276,19 +483,50 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Renogy UART sensors."""
     coordinator: RenogyActiveUARTCoordinator = hass.data[DOMAIN][config_entry.entry_id]
-    device_type = config_entry.data.get(CONF_DEVICE_TYPE, DEFAULT_DEVICE_TYPE)
-    entities = create_device_entities(coordinator, coordinator.device, device_type)
+    coordinator.async_set_projection(SensorProjection(ALL_SENSORS))
+    device_type = coordinator.device.device_type
+
+    # Only create entities for keys present in the first successful snapshot
+    entities = create_device_entities(
+        coordinator, coordinator.device, device_type, coordinator.known_keys
+    )
     if entities:
         async_add_entities(entities)
 
+    @callback
+    def _async_add_new_keys(keys: Set[str]) -> None:
+        """Add entities for keys the device started reporting later."""
+        new_entities = create_entities_helper(
+            coordinator, coordinator.device, device_type, keys
+        )
+        if new_entities:
+            LOGGER.info(
+                "Adding %s entities for newly reported keys on %s",
+                len(new_entities),
+                coordinator.address,
+            )
+            async_add_entities(new_entities)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, coordinator.new_keys_signal, _async_add_new_keys
+        )
+    )
+
 
 def create_entities_helper(
     coordinator: RenogyActiveUARTCoordinator,
     device: Optional[RenogyUARTDevice],
     device_type: str = DEFAULT_DEVICE_TYPE,
+    keys: Optional[Iterable[str]] = None,
 ) -> List[RenogySensor]:
-    """Create sensor entities with provided coordinator and optional device."""
+    """Create sensor entities with provided coordinator and optional device.
+
+    If keys is given, only descriptions for those keys are instantiated.
+    """
     entities = []
+    if keys is not None:
+        keys = set(keys)
 
     # Group sensors by category
     for category_name, sensor_list in {
@@ -296,9 +534,17 @@ def create_entities_helper(
         "PV": PV_SENSORS,
         "Load": LOAD_SENSORS,
         "Controller": CONTROLLER_SENSORS,
+        "Energy": ENERGY_SENSORS,
+        "Derived": DERIVED_SENSORS,
+        "Statistics": ROLLING_SENSORS,
     }.items():
         for description in sensor_list:
-            sensor = RenogySensor(
+            if keys is not None and description.key not in keys:
+                continue
+            sensor_class = (
+                RenogyRestoreSensor if description.restore_state else RenogySensor
+            )
+            sensor = sensor_class(
                 coordinator, device, description, category_name, device_type
             )
             entities.append(sensor)
@@ -320,9 +566,10 @@ def create_device_entities(
     coordinator: RenogyActiveUARTCoordinator,
     device: RenogyUARTDevice,
     device_type: str = DEFAULT_DEVICE_TYPE,
+    keys: Optional[Iterable[str]] = None,
 ) -> List[RenogySensor]:
     """Create sensor entities for a device."""
-    entities = create_entities_helper(coordinator, device, device_type)
+    entities = create_entities_helper(coordinator, device, device_type, keys)
     LOGGER.info("Created %s entities for device %s", len(entities), device.name)
     return entities
 
@@ -347,7 +594,6 @@ class RenogySensor(CoordinatorEntity, SensorEntity):
         self._device = device
         self._category = category
         self._device_type = device_type
-        self._attr_native_value = None
 
         # Generate a device model name that includes the device type
         device_model = f"Renogy {device_type.capitalize()}"
@@ -388,37 +634,7 @@ class RenogySensor(CoordinatorEntity, SensorEntity):
     @property
     def device(self) -> Optional[RenogyUARTDevice]:
         """Get the current device - either stored or from coordinator."""
-        if self._device:
-            return self._device
-
-        # Try to get device from coordinator
-        if hasattr(self.coordinator, "device") and self.coordinator.device:
-            self._device = self.coordinator.device
-
-            # Generate a device model name that includes the device type
-            device_model = f"Renogy {self._device_type.capitalize()}"
-            if self._device.parsed_data and KEY_MODEL in self._device.parsed_data:
-                device_model = self._device.parsed_data[KEY_MODEL]
-
-            # Update our unique_id to match the actual device
-            self._attr_unique_id = (
-                f"{self._device.address}_{self.entity_description.key}"
-            )
-            # Also update our name
-            self._attr_name = f"{self._device.name} {self.entity_description.name}"
-
-            # And device_info
-            self._attr_device_info = DeviceInfo(
-                identifiers={(DOMAIN, self._device.address)},
-                name=self._device.name,
-                manufacturer=ATTR_MANUFACTURER,
-                model=device_model,
-                hw_version=f"Serial Port: {self._device.address}",
-                sw_version=self._device_type.capitalize(),  # Add device type as software version
-            )
-            LOGGER.debug("Updated device info with real name: %s", self._device.name)
-
-        return self._device
+        return self._device or getattr(self.coordinator, "device", None)
 
     @property
     def available(self) -> bool:
@@ -442,86 +658,13 @@ class RenogySensor(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self) -> Any:
-        """Return the sensor's value."""
-        # Use cached value if available
-        if self._attr_native_value is not None:
-            return self._attr_native_value
-
-        device = self.device
-        data = None
-
-        # Get data from device if available, otherwise from coordinator
-        if device and device.parsed_data:
-            data = device.parsed_data
-        elif self.coordinator.data:
-            data = self.coordinator.data
-
-        if not data:
-            return None
-
-        try:
-            if self.entity_description.value_fn:
-                value = self.entity_description.value_fn(data)
-                # Basic type validation based on device_class
-                if value is not None:
-                    if self.device_class in [
-                        SensorDeviceClass.VOLTAGE,
-                        SensorDeviceClass.CURRENT,
-                        SensorDeviceClass.TEMPERATURE,
-                        SensorDeviceClass.POWER,
-                    ]:
-                        try:
-                            value = float(value)
-                            # Basic range validation
-                            if value < -1000 or value > 10000:
-                                LOGGER.warning(
-                                    "Value %s out of reasonable range for %s",
-                                    value,
-                                    self.name,
-                                )
-                                return None
-                        except (ValueError, TypeError):
-                            LOGGER.warning(
-                                "Invalid numeric value for %s: %s",
-                                self.name,
-                                value,
-                            )
-                            return None
-
-                # Cache the value
-                self._attr_native_value = value
-                return value
-        except Exception as e:
-            LOGGER.warning("Error getting native value for %s: %s", self.name, e)
-        return None
+        """Return the sensor's value as projected by the coordinator."""
+        return self.coordinator.values.get(self.entity_description.key)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        LOGGER.debug("Coordinator update for %s", self.name)
-
-        # Clear cached value to force a refresh on next state read
-        self._attr_native_value = None
-
-        # If we don't have a device yet, check if coordinator now has one
-        if (
-            not self._device
-            and hasattr(self.coordinator, "device")
-            and self.coordinator.device
-        ):
-            self._device = self.coordinator.device
-            # Update our unique_id and name to match the actual device
-            self._attr_unique_id = (
-                f"{self._device.address}_{self.entity_description.key}"
-            )
-            self._attr_name = f"{self._device.name} {self.entity_description.name}"
-
         self._last_updated = datetime.now()
-
-        # Explicitly get our value before updating state, so it's cached
-        self.native_value
-
-        # Update entity state
         self.async_write_ha_state()
 
     @property
@@ -543,3 +686,19 @@ class RenogySensor(CoordinatorEntity, SensorEntity):
             attrs["data_source"] = "coordinator"
 
         return attrs
+
+
+class RenogyRestoreSensor(RenogySensor, RestoreSensor):
+    """Renogy sensor whose value survives restarts, such as integrated energy."""
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last value and hand it back to the coordinator."""
+        await super().async_added_to_hass()
+        last_data = await self.async_get_last_sensor_data()
+        if last_data is None or last_data.native_value is None:
+            return
+        try:
+            value = float(last_data.native_value)
+        except (ValueError, TypeError):
+            return
+        self.coordinator.async_restore_value(self.entity_description.key, value)
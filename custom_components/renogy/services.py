@@ -0,0 +1,199 @@
+"""Services for the Renogy UART integration."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import COMMANDS, DOMAIN
+from .history import DEFAULT_HISTORY_DAYS, MAX_HISTORY_DAYS, async_import_history
+from .profiles import CHARGE_PROFILES, async_apply_profile
+from .timeseries import TIER_NAMES, TIMESERIES_KEYS
+from .uart import RenogyActiveUARTCoordinator
+
+SERVICE_IMPORT_HISTORY = "import_history"
+SERVICE_APPLY_CHARGE_PROFILE = "apply_charge_profile"
+SERVICE_REFRESH = "refresh"
+SERVICE_QUERY_TIMESERIES = "query_timeseries"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DAYS = "days"
+ATTR_PROFILE = "profile"
+ATTR_KEYS = "keys"
+ATTR_MAX_AGE = "max_age"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_RESOLUTION = "resolution"
+ATTR_AGGREGATE = "aggregate"
+
+# Range queried when no start is given
+DEFAULT_QUERY_PERIOD = timedelta(hours=1)
+
+IMPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DAYS, default=DEFAULT_HISTORY_DAYS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_HISTORY_DAYS)
+        ),
+    }
+)
+
+APPLY_CHARGE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PROFILE): vol.In(CHARGE_PROFILES),
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_KEYS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MAX_AGE, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+QUERY_TIMESERIES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_KEYS): vol.All(cv.ensure_list, [vol.In(TIMESERIES_KEYS)]),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_RESOLUTION): vol.In(TIER_NAMES),
+        vol.Optional(ATTR_AGGREGATE, default=False): cv.boolean,
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall) -> RenogyActiveUARTCoordinator:
+    """Return the coordinator of the config entry targeted by a service call."""
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(f"Unknown Renogy config entry: {entry_id}")
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"Renogy config entry {entry.title} is not loaded")
+    return hass.data[DOMAIN][entry_id]
+
+
+async def _async_import_history(call: ServiceCall) -> ServiceResponse:
+    """Import the controller's daily history into long-term statistics."""
+    hass = call.hass
+    if "recorder" not in hass.config.components:
+        raise HomeAssistantError("The recorder integration is required to import history")
+    coordinator = _get_coordinator(hass, call)
+    try:
+        imported = await async_import_history(hass, coordinator, call.data[ATTR_DAYS])
+    except Exception as err:  # pylint: disable=broad-except
+        raise HomeAssistantError(f"Error reading history from device: {err}") from err
+    return {"imported_days": imported}
+
+
+async def _async_apply_charge_profile(call: ServiceCall) -> ServiceResponse:
+    """Write a named charge profile to the controller."""
+    coordinator = _get_coordinator(call.hass, call)
+    try:
+        changed = await async_apply_profile(
+            coordinator, CHARGE_PROFILES[call.data[ATTR_PROFILE]]
+        )
+    except HomeAssistantError:
+        raise
+    except Exception as err:  # pylint: disable=broad-except
+        raise HomeAssistantError(f"Error writing charge profile to device: {err}") from err
+    return {"changed": changed}
+
+
+async def _async_refresh(call: ServiceCall) -> ServiceResponse:
+    """Re-read the blocks behind the requested values if they are too old."""
+    coordinator = _get_coordinator(call.hass, call)
+    blocks = COMMANDS[coordinator.device.device_type]
+    names = call.data.get(ATTR_KEYS) or list(blocks)
+    try:
+        stale = coordinator.blocks_for(names)
+    except KeyError as err:
+        raise ServiceValidationError(f"Unknown sensor key or block: {err.args[0]}") from err
+    try:
+        refreshed = await coordinator.async_refresh_blocks(stale, call.data[ATTR_MAX_AGE])
+    except Exception as err:  # pylint: disable=broad-except
+        raise HomeAssistantError(f"Error reading from device: {err}") from err
+
+    # Block names stand for every value decoded from the block
+    keys = set()
+    for name in names:
+        keys |= coordinator.block_keys.get(name, set()) if name in blocks else {name}
+    data = coordinator.data or {}
+    return {
+        "refreshed": refreshed,
+        "values": {key: data.get(key) for key in sorted(keys)},
+    }
+
+
+def _timestamp(value: datetime) -> float:
+    """Return the POSIX timestamp of a datetime, naive ones being local time."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.get_default_time_zone())
+    return value.timestamp()
+
+
+async def _async_query_timeseries(call: ServiceCall) -> ServiceResponse:
+    """Return samples or aggregates from a device's high-rate history."""
+    coordinator = _get_coordinator(call.hass, call)
+    if (store := coordinator.timeseries) is None:
+        raise ServiceValidationError(
+            f"High-rate history is not enabled for {coordinator.address}"
+        )
+    end = call.data.get(ATTR_END) or dt_util.now()
+    start = call.data.get(ATTR_START) or end - DEFAULT_QUERY_PERIOD
+    query = store.aggregate if call.data[ATTR_AGGREGATE] else store.query
+    return await call.hass.async_add_executor_job(
+        query,
+        _timestamp(start),
+        _timestamp(end),
+        call.data.get(ATTR_KEYS),
+        call.data.get(ATTR_RESOLUTION),
+    )
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_HISTORY,
+        _async_import_history,
+        schema=IMPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_CHARGE_PROFILE,
+        _async_apply_charge_profile,
+        schema=APPLY_CHARGE_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        _async_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_TIMESERIES,
+        _async_query_timeseries,
+        schema=QUERY_TIMESERIES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,23 @@
+"""Bounded shutdown of in-flight device polls."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+
+async def async_finish_task(task: Optional[asyncio.Task[Any]], timeout: float) -> bool:
+    """Give a task until the deadline to finish, then cancel it.
+
+    The owner is expected to have asked the task to stop at its next safe
+    point first, so a healthy poll ends on its own. A task stuck waiting on
+    a hung device is cancelled at the deadline; the owner then closes the
+    connection it was waiting on. Returns whether the task finished in time.
+    """
+    if task is None or task.done() or task is asyncio.current_task():
+        return True
+    done, _ = await asyncio.wait({task}, timeout=timeout)
+    if done:
+        return True
+    task.cancel()
+    return False
@@ -0,0 +1,59 @@
+"""Coalescing of concurrent refresh requests into a single device cycle."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Coroutine, Generic, Optional, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+_T = TypeVar("_T")
+
+
+class SingleFlight(Generic[_T]):
+    """Run at most one refresh cycle at a time and share its outcome.
+
+    Callers arriving while a cycle is in flight await that cycle instead of
+    starting another. The cycle runs in its own task and is shielded from
+    the callers, so one caller being cancelled does not abort it for the
+    others. Callers may also skip a new cycle while the last successful one
+    is within the freshness window.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str, freshness: float) -> None:
+        """Initialize the single-flight guard."""
+        self._hass = hass
+        self._name = name
+        self.freshness = freshness
+        self.task: Optional[asyncio.Task[_T]] = None
+        self._completed: Optional[float] = None
+
+    @property
+    def fresh(self) -> bool:
+        """Return whether the last successful cycle is within the freshness window."""
+        return (
+            self._completed is not None
+            and time.monotonic() - self._completed < self.freshness
+        )
+
+    async def async_run(self, cycle: Coroutine[Any, Any, _T]) -> _T:
+        """Run a cycle, or await the one in flight and discard this one."""
+        if (task := self.task) is None:
+            task = self.task = self._hass.async_create_task(
+                cycle, self._name, eager_start=True
+            )
+            if task.done():
+                self._async_done(task)
+            else:
+                task.add_done_callback(self._async_done)
+        else:
+            cycle.close()
+        return await asyncio.shield(task)
+
+    def _async_done(self, task: asyncio.Task[_T]) -> None:
+        """Forget the finished cycle, recording when it last succeeded."""
+        if self.task is task:
+            self.task = None
+        if not task.cancelled() and task.exception() is None:
+            self._completed = time.monotonic()
@@ -0,0 +1,90 @@
+"""Support for Renogy UART switches."""
+
+from __future__ import annotations
+
+from typing import Any, Set
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, LOGGER
+from .uart import RenogyActiveUARTCoordinator
+
+KEY_LOAD_STATUS = "load_status"
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Renogy UART switches."""
+    coordinator: RenogyActiveUARTCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    # Only devices with a load output get a load switch
+    if KEY_LOAD_STATUS in coordinator.known_keys:
+        async_add_entities([RenogyLoadSwitch(coordinator)])
+        return
+
+    @callback
+    def _async_add_new_keys(keys: Set[str]) -> None:
+        """Add the load switch once the device reports a load output."""
+        if KEY_LOAD_STATUS in keys:
+            async_add_entities([RenogyLoadSwitch(coordinator)])
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, coordinator.new_keys_signal, _async_add_new_keys
+        )
+    )
+
+
+class RenogyLoadSwitch(CoordinatorEntity, SwitchEntity):
+    """Switch for the load output of a Renogy charge controller."""
+
+    coordinator: RenogyActiveUARTCoordinator
+
+    def __init__(self, coordinator: RenogyActiveUARTCoordinator) -> None:
+        """Initialize the switch."""
+        super().__init__(coordinator)
+        device = coordinator.device
+        self._attr_unique_id = f"{device.address}_load"
+        self._attr_name = f"{device.name} Load"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, device.address)})
+
+    @property
+    def available(self) -> bool:
+        """Return if the switch is available."""
+        return super().available and self.coordinator.device.is_available
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if the load output is on."""
+        if not self.coordinator.data:
+            return None
+        status = self.coordinator.data.get(KEY_LOAD_STATUS)
+        return None if status is None else status == "on"
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the load output on."""
+        await self._async_set_load(True)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the load output off."""
+        await self._async_set_load(False)
+
+    async def _async_set_load(self, on: bool) -> None:
+        """Switch the load output."""
+        LOGGER.debug("Switching load %s on %s", "on" if on else "off", self.name)
+        try:
+            await self.coordinator.async_set_load(on)
+        except Exception as err:  # pylint: disable=broad-except
+            raise HomeAssistantError(
+                f"Error switching load on {self.coordinator.address}: {err}"
+            ) from err
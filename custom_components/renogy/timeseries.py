@@ -0,0 +1,372 @@
+"""High-rate history of decoded snapshots in a memory-mapped ring file.
+
+Each device gets one fixed-size file holding three tiers: every raw sample,
+and means over 1 and 15 minute buckets. Each tier is a ring of rows stored
+column by column (float64 timestamps, float32 values, native byte order),
+so range queries slice the columns they need straight from the mapping.
+"""
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+from .const import LOGGER
+
+STORE_MAGIC = b"RNGYTS01"
+# magic, schema checksum
+STORE_HEADER = struct.Struct("<8sI4x")
+# next row to write, rows held
+TIER_STATE = struct.Struct("<II")
+
+# Values kept, in column order
+TIMESERIES_KEYS = (
+    "battery_voltage",
+    "battery_current",
+    "battery_percentage",
+    "battery_temperature",
+    "controller_temperature",
+    "pv_voltage",
+    "pv_current",
+    "pv_power",
+    "load_voltage",
+    "load_current",
+    "load_power",
+)
+
+
+class Tier(NamedTuple):
+    """A ring of rows at one resolution."""
+
+    name: str
+    # Seconds per bucket; 0 keeps every sample
+    resolution: int
+    capacity: int
+
+
+TIER_RAW = "raw"
+TIERS = (
+    # Two days at the shortest (10 s) poll interval
+    Tier(TIER_RAW, 0, 17280),
+    # A week
+    Tier("1min", 60, 10080),
+    # A year
+    Tier("15min", 900, 35040),
+)
+TIER_NAMES = [tier.name for tier in TIERS]
+
+
+class SampleClock:
+    """Wall-clock timestamps for samples that never go backwards.
+
+    When the wall clock steps back (e.g. an NTP correction), timestamps carry
+    on from the last one by the monotonic time elapsed since, until the wall
+    clock has caught up again. Without this every sample until then would be
+    dropped as out of order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self._last = -math.inf
+        self._last_monotonic = 0.0
+
+    def now(self) -> float:
+        """Return the timestamp of a sample taken now."""
+        timestamp, monotonic = time.time(), time.monotonic()
+        if timestamp <= self._last:
+            timestamp = self._last + max(monotonic - self._last_monotonic, 1e-3)
+        self._last, self._last_monotonic = timestamp, monotonic
+        return timestamp
+
+
+def _schema_checksum(keys: Sequence[str], tiers: Sequence[Tier]) -> int:
+    """Return a checksum of the layout, to detect files written with another one."""
+    return zlib.crc32(repr((tuple(keys), tuple(tiers))).encode())
+
+
+class _Bucket:
+    """Running sums of the samples in a downsampling bucket."""
+
+    def __init__(self, start: float, columns: int) -> None:
+        self.start = start
+        self.sums = [0.0] * columns
+        self.counts = [0] * columns
+
+    def add(self, values: Sequence[float]) -> None:
+        for index, value in enumerate(values):
+            if not math.isnan(value):
+                self.sums[index] += value
+                self.counts[index] += 1
+
+    def means(self) -> List[float]:
+        return [
+            total / count if count else math.nan
+            for total, count in zip(self.sums, self.counts)
+        ]
+
+
+class _TierRing:
+    """The columns and ring state of one tier inside the mapping."""
+
+    def __init__(
+        self, buffer: memoryview, state_offset: int, offset: int, tier: Tier, columns: int
+    ) -> None:
+        self.tier = tier
+        self._state = buffer[state_offset : state_offset + TIER_STATE.size]
+        self.head, self.count = TIER_STATE.unpack(self._state)
+        capacity = tier.capacity
+        if self.head >= capacity or self.count > capacity:
+            self.head = self.count = 0
+        self.timestamps = buffer[offset : offset + capacity * 8].cast("d")
+        offset += capacity * 8
+        self.columns = []
+        for _ in range(columns):
+            self.columns.append(buffer[offset : offset + capacity * 4].cast("f"))
+            offset += capacity * 4
+        self.size = offset
+        # Partial bucket of a downsampled tier, written out on closing
+        self.bucket: Optional[_Bucket] = None
+
+    def index(self, position: int) -> int:
+        """Return the physical row of the position-th oldest row."""
+        return (self.head - self.count + position) % self.tier.capacity
+
+    @property
+    def last_timestamp(self) -> float:
+        """Return the timestamp of the newest row, or -inf if empty."""
+        return self.timestamps[self.index(self.count - 1)] if self.count else -math.inf
+
+    @property
+    def first_timestamp(self) -> float:
+        """Return the timestamp of the oldest row, or inf if empty."""
+        return self.timestamps[self.index(0)] if self.count else math.inf
+
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        """Write a row over the oldest one once the ring is full."""
+        row = self.head
+        self.timestamps[row] = timestamp
+        for column, value in zip(self.columns, values):
+            column[row] = value
+        self.head = (row + 1) % self.tier.capacity
+        self.count = min(self.count + 1, self.tier.capacity)
+        self._state[:] = TIER_STATE.pack(self.head, self.count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, position: int) -> float:
+        """Return the timestamp at a chronological position, for bisecting."""
+        return self.timestamps[self.index(position)]
+
+    def release(self) -> None:
+        self._state.release()
+        self.timestamps.release()
+        for column in self.columns:
+            column.release()
+
+
+class TimeSeriesStore:
+    """A device's high-rate history in a memory-mapped file.
+
+    Samples must arrive in time order; one not newer than the last is
+    dropped. The file is created on first open and recreated if it was
+    written with a different set of values or tiers.
+
+    Every method touching the mapping does blocking I/O, as reading or
+    writing a page may fault it in from disk, and runs in the executor. The
+    lock serializes appends, queries and closing, so a query never sees a
+    half-written row and the file stays mapped while it is used.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        keys: Sequence[str] = TIMESERIES_KEYS,
+        tiers: Sequence[Tier] = TIERS,
+    ) -> None:
+        """Initialize the store."""
+        self.path = path
+        self.keys = tuple(keys)
+        self.tiers = tuple(tiers)
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._buffer: Optional[memoryview] = None
+        self._rings: Dict[str, _TierRing] = {}
+        self._lock = threading.Lock()
+
+    def _layout_size(self) -> int:
+        """Return the size of the file."""
+        row = 8 + 4 * len(self.keys)
+        return (
+            STORE_HEADER.size
+            + TIER_STATE.size * len(self.tiers)
+            + sum(tier.capacity * row for tier in self.tiers)
+        )
+
+    def open(self) -> None:
+        """Map the file, creating it if needed. Does blocking I/O."""
+        size = self._layout_size()
+        header = STORE_HEADER.pack(STORE_MAGIC, _schema_checksum(self.keys, self.tiers))
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        file = os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+        if file.read(STORE_HEADER.size) != header or os.fstat(file.fileno()).st_size != size:
+            if file.tell():
+                LOGGER.warning("Recreating time series %s for a new layout", self.path)
+            file.truncate(0)
+            file.truncate(size)
+            file.seek(0)
+            file.write(header)
+            file.flush()
+        self._file = file
+        self._mmap = mmap.mmap(file.fileno(), size)
+        self._buffer = memoryview(self._mmap)
+        state_offset = STORE_HEADER.size
+        offset = STORE_HEADER.size + TIER_STATE.size * len(self.tiers)
+        for tier in self.tiers:
+            ring = _TierRing(self._buffer, state_offset, offset, tier, len(self.keys))
+            self._rings[tier.name] = ring
+            state_offset += TIER_STATE.size
+            offset = ring.size
+
+    def close(self) -> None:
+        """Write the partial buckets, flush the mapping to disk and unmap it.
+
+        Does blocking I/O.
+        """
+        with self._lock:
+            if self._mmap is None:
+                return
+            for ring in self._rings.values():
+                if ring.bucket is not None:
+                    ring.append(ring.bucket.start, ring.bucket.means())
+                    ring.bucket = None
+                ring.release()
+            self._rings = {}
+            self._buffer.release()
+            self._mmap.flush()
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._buffer = self._file = None
+
+    def append(self, timestamp: float, data: Mapping[str, Any]) -> None:
+        """Add a snapshot, rolling it into the downsampled tiers.
+
+        Does blocking I/O. A snapshot arriving after closing is dropped.
+        """
+        values = [_as_float(data.get(key)) for key in self.keys]
+        with self._lock:
+            if self._mmap is None:
+                return
+            self._append(timestamp, values)
+
+    def _append(self, timestamp: float, values: List[float]) -> None:
+        """Add a row of values to every tier."""
+        rings = list(self._rings.values())
+        if timestamp <= rings[0].last_timestamp:
+            return
+        for ring in rings:
+            resolution = ring.tier.resolution
+            if not resolution:
+                ring.append(timestamp, values)
+                continue
+            start = timestamp - timestamp % resolution
+            if start <= ring.last_timestamp:
+                # Written partially before the store was last closed
+                continue
+            bucket = ring.bucket
+            if bucket is not None and bucket.start != start:
+                ring.append(bucket.start, bucket.means())
+                bucket = None
+            if bucket is None:
+                bucket = ring.bucket = _Bucket(start, len(self.keys))
+            bucket.add(values)
+
+    def choose_tier(self, start: float) -> str:
+        """Return the finest tier still holding samples from `start`."""
+        for name, ring in self._rings.items():
+            if ring.count and ring.first_timestamp <= start:
+                return name
+        return min(self._rings, key=lambda name: self._rings[name].first_timestamp)
+
+    def _ring(self, start: float, tier: Optional[str]) -> _TierRing:
+        """Return the requested tier, or the one chosen for `start`."""
+        if self._mmap is None:
+            raise ValueError(f"Time series {self.path} is closed")
+        return self._rings[tier or self.choose_tier(start)]
+
+    def _range(self, ring: _TierRing, start: float, end: float) -> range:
+        """Return the chronological positions of the rows between start and end."""
+        return range(bisect_left(ring, start), bisect_right(ring, end))
+
+    def query(
+        self,
+        start: float,
+        end: float,
+        keys: Optional[Sequence[str]] = None,
+        tier: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return the rows between start and end, as [timestamp, values...]."""
+        keys = list(keys or self.keys)
+        with self._lock:
+            ring = self._ring(start, tier)
+            columns = [ring.columns[self.keys.index(key)] for key in keys]
+            rows = []
+            for position in self._range(ring, start, end):
+                row = ring.index(position)
+                rows.append(
+                    [ring.timestamps[row]]
+                    + [_as_value(column[row]) for column in columns]
+                )
+        return {"tier": ring.tier.name, "keys": keys, "rows": rows}
+
+    def aggregate(
+        self,
+        start: float,
+        end: float,
+        keys: Optional[Sequence[str]] = None,
+        tier: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return the min, max, mean and count of each value between start and end.
+
+        On a downsampled tier these are taken over its bucket means.
+        """
+        stats: Dict[str, Any] = {}
+        with self._lock:
+            ring = self._ring(start, tier)
+            positions = self._range(ring, start, end)
+            for key in keys or self.keys:
+                column = ring.columns[self.keys.index(key)]
+                values = [
+                    value
+                    for value in (column[ring.index(position)] for position in positions)
+                    if not math.isnan(value)
+                ]
+                stats[key] = {
+                    "min": _as_value(min(values)) if values else None,
+                    "max": _as_value(max(values)) if values else None,
+                    "mean": _as_value(sum(values) / len(values)) if values else None,
+                    "count": len(values),
+                }
+        return {"tier": ring.tier.name, "aggregates": stats}
+
+
+def _as_float(value: Any) -> float:
+    """Return a snapshot value as a float, NaN when missing or not numeric."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+
+def _as_value(value: float) -> Optional[float]:
+    """Return a stored value for a response, None when missing.
+
+    Values are stored as float32, so digits past the third decimal are noise.
+    """
+    return None if math.isnan(value) else round(value, 3)
@@ -0,0 +1,365 @@
+"""Modbus transports used by the shared Renogy buses."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+from typing import List, Optional, Tuple
+
+from .capture import (
+    DIRECTION_REQUEST,
+    DIRECTION_RESPONSE,
+    FRAMING_RTU,
+    FRAMING_TCP,
+    FrameRecorder,
+)
+from .const import LOGGER, TRANSPORT_RTU_OVER_TCP, TRANSPORT_SERIAL, TRANSPORT_TCP
+from .modbus import (
+    EXCEPTION_FLAG,
+    EXCEPTION_RESPONSE_LENGTH,
+    EXCEPTION_RESPONSE_PDU_LENGTH,
+    MAX_PDU_LENGTH,
+    MBAP_HEADER,
+    MODBUS_TCP_PROTOCOL,
+    WRITE_RESPONSE_PDU_LENGTH,
+    ModbusError,
+    ModbusExceptionResponse,
+    build_rtu_frame,
+    build_tcp_frame,
+    check_crc,
+    check_pdu,
+    decode_registers,
+    frame_silence,
+    read_pdu,
+    read_response_pdu_length,
+    write_register_pdu,
+    write_registers_pdu,
+)
+
+try:
+    from serial_asyncio_fast import open_serial_connection
+
+    NATIVE_RTU_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency guard
+    open_serial_connection = None  # type: ignore
+    NATIVE_RTU_AVAILABLE = False
+
+DEFAULT_BAUDRATE = 9600
+DEFAULT_TIMEOUT = 3  # seconds
+
+# TCP keepalive: first probe after this many idle seconds, then every interval
+KEEPALIVE_IDLE = 30
+KEEPALIVE_INTERVAL = 10
+KEEPALIVE_COUNT = 3
+
+Streams = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+def _enable_keepalive(writer: asyncio.StreamWriter) -> None:
+    """Enable TCP keepalive so dead gateway connections are detected."""
+    sock = writer.get_extra_info("socket")
+    if sock is None:
+        return
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, KEEPALIVE_COUNT)
+
+
+class StreamTransport:
+    """Base of the transports exchanging Modbus frames over asyncio streams.
+
+    The connection is opened on first use and kept open. Any transport error
+    closes it, so the next request reconnects and a late reply to a timed out
+    request can never be mistaken for the answer to the next one.
+    """
+
+    # Minimum silence between frames, in seconds
+    silence = 0.0
+    # How frames are laid out in captures
+    framing = FRAMING_RTU
+
+    def __init__(self, endpoint: str, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """Initialize the transport."""
+        self.endpoint = endpoint
+        self._timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._last_frame_end = 0.0
+        # Set while the raw frames are being captured
+        self.recorder: Optional[FrameRecorder] = None
+
+    async def _async_open(self) -> Streams:
+        """Open the underlying connection."""
+        raise NotImplementedError
+
+    async def _async_connect(self) -> None:
+        """Open the connection if it is not open, or was closed by the peer."""
+        if self._writer is not None:
+            if not self._writer.is_closing() and not self._reader.at_eof():
+                return
+            LOGGER.debug("Connection to %s was closed, reconnecting", self.endpoint)
+            self.close()
+        self._reader, self._writer = await self._async_open()
+
+    async def _async_exchange(self, device_id: int, pdu: bytes, response_length: int) -> bytes:
+        """Send a request PDU and return the raw response PDU."""
+        raise NotImplementedError
+
+    async def _async_request(self, device_id: int, pdu: bytes, response_length: int) -> bytes:
+        """Send a request PDU and return the validated response PDU."""
+        loop = asyncio.get_running_loop()
+        if (wait := self._last_frame_end + self.silence - loop.time()) > 0:
+            await asyncio.sleep(wait)
+        try:
+            async with asyncio.timeout(self._timeout):
+                await self._async_connect()
+                response = await self._async_exchange(device_id, pdu, response_length)
+        except (TimeoutError, asyncio.IncompleteReadError, OSError) as err:
+            self.close()
+            raise ModbusError(f"No response from device on {self.endpoint}") from err
+        except (ModbusError, asyncio.CancelledError):
+            # A cancelled request may still be answered; drop the connection
+            self.close()
+            raise
+        finally:
+            self._last_frame_end = loop.time()
+        check_pdu(pdu, response)
+        return response
+
+    async def async_read_registers(
+        self, device_id: int, register: int, word_count: int
+    ) -> List[int]:
+        """Read a block of holding registers (function 0x03)."""
+        response = await self._async_request(
+            device_id,
+            read_pdu(register, word_count),
+            read_response_pdu_length(word_count),
+        )
+        return decode_registers(response)
+
+    async def async_write_register(
+        self, device_id: int, register: int, value: int
+    ) -> None:
+        """Write a single holding register (function 0x06)."""
+        await self._async_request(
+            device_id, write_register_pdu(register, value), WRITE_RESPONSE_PDU_LENGTH
+        )
+
+    async def async_write_registers(
+        self, device_id: int, register: int, values: List[int]
+    ) -> None:
+        """Write a block of holding registers (function 0x10)."""
+        await self._async_request(
+            device_id, write_registers_pdu(register, values), WRITE_RESPONSE_PDU_LENGTH
+        )
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+class RtuTransport(StreamTransport):
+    """Modbus RTU framing: precomputed frames, exact-length reads, CRC checks."""
+
+    async def _async_exchange(self, device_id: int, pdu: bytes, response_length: int) -> bytes:
+        """Send an RTU frame and return the PDU of the response."""
+        frame = build_rtu_frame(device_id, pdu)
+        if (recorder := self.recorder) is not None:
+            recorder.record(DIRECTION_REQUEST, frame)
+        self._writer.write(frame)
+        await self._writer.drain()
+        response = await self._reader.readexactly(EXCEPTION_RESPONSE_LENGTH)
+        if not response[1] & EXCEPTION_FLAG:
+            # device ID + PDU + CRC
+            response += await self._reader.readexactly(
+                1 + response_length + 2 - EXCEPTION_RESPONSE_LENGTH
+            )
+        if recorder is not None:
+            recorder.record(DIRECTION_RESPONSE, response)
+        if not check_crc(response):
+            raise ModbusError(f"CRC error in response {response.hex()}")
+        if response[0] != device_id:
+            raise ModbusError(f"Response from unexpected device {response[0]}")
+        return response[1:-2]
+
+
+class RtuSerialTransport(RtuTransport):
+    """Modbus RTU on a local serial port."""
+
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = DEFAULT_BAUDRATE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        """Initialize the transport."""
+        super().__init__(port, timeout)
+        self._baudrate = baudrate
+        self.silence = frame_silence(baudrate)
+
+    async def _async_open(self) -> Streams:
+        """Open the serial port."""
+        return await open_serial_connection(url=self.endpoint, baudrate=self._baudrate)
+
+
+class RtuOverTcpTransport(RtuTransport):
+    """Raw Modbus RTU frames tunnelled through a TCP serial gateway."""
+
+    def __init__(self, host: str, port: int, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """Initialize the transport."""
+        super().__init__(f"{host}:{port}", timeout)
+        self._host = host
+        self._port = port
+
+    async def _async_open(self) -> Streams:
+        """Connect to the gateway."""
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        _enable_keepalive(writer)
+        return reader, writer
+
+
+class ModbusTcpTransport(StreamTransport):
+    """Modbus TCP (MBAP framing) to a gateway or TCP-capable device."""
+
+    framing = FRAMING_TCP
+
+    def __init__(self, host: str, port: int, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """Initialize the transport."""
+        super().__init__(f"{host}:{port}", timeout)
+        self._host = host
+        self._port = port
+        self._transaction_id = 0
+
+    async def _async_open(self) -> Streams:
+        """Connect to the gateway."""
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        _enable_keepalive(writer)
+        return reader, writer
+
+    async def _async_exchange(self, device_id: int, pdu: bytes, response_length: int) -> bytes:
+        """Send an MBAP frame and return the PDU of the response."""
+        self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+        frame = build_tcp_frame(self._transaction_id, device_id, pdu)
+        if (recorder := self.recorder) is not None:
+            recorder.record(DIRECTION_REQUEST, frame)
+        self._writer.write(frame)
+        await self._writer.drain()
+        header = await self._reader.readexactly(MBAP_HEADER.size)
+        transaction_id, protocol_id, length, unit_id = MBAP_HEADER.unpack(header)
+        # The length is checked before it sizes a read: unit ID plus at least a
+        # function code, and no more than a PDU can hold
+        if protocol_id != MODBUS_TCP_PROTOCOL or not 2 <= length <= MAX_PDU_LENGTH + 1:
+            if recorder is not None:
+                recorder.record(DIRECTION_RESPONSE, header)
+            raise ModbusError(f"Invalid MBAP header {header.hex()} in response")
+        response = await self._reader.readexactly(length - 1)
+        if recorder is not None:
+            recorder.record(DIRECTION_RESPONSE, header + response)
+        if transaction_id != self._transaction_id:
+            raise ModbusError(f"Unexpected transaction ID {transaction_id} in response")
+        if unit_id != device_id:
+            raise ModbusError(f"Response from unexpected device {unit_id}")
+        expected = (
+            EXCEPTION_RESPONSE_PDU_LENGTH
+            if response[0] & EXCEPTION_FLAG
+            else response_length
+        )
+        if len(response) != expected:
+            raise ModbusError(
+                f"Response PDU of {len(response)} bytes, expected {expected}"
+            )
+        return response
+
+
+class PymodbusSerialTransport:
+    """Modbus RTU transport using the pymodbus serial client."""
+
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = DEFAULT_BAUDRATE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        """Initialize the transport."""
+        # Imported here so the native transports do not pay for pymodbus
+        from pymodbus.client import AsyncModbusSerialClient
+
+        self.endpoint = port
+        self._client = AsyncModbusSerialClient(port, baudrate=baudrate, timeout=timeout)
+
+    async def _async_ensure_connected(self) -> None:
+        """Open the connection if it is not open yet."""
+        if not self._client.connected:
+            await self._client.connect()
+
+    async def async_read_registers(
+        self, device_id: int, register: int, word_count: int
+    ) -> List[int]:
+        """Read a block of holding registers (function 0x03)."""
+        await self._async_ensure_connected()
+        response = await self._client.read_holding_registers(
+            register, count=word_count, device_id=device_id
+        )
+        if response.isError():
+            raise ModbusExceptionResponse(str(response))
+        return response.registers
+
+    async def async_write_register(
+        self, device_id: int, register: int, value: int
+    ) -> None:
+        """Write a single holding register (function 0x06)."""
+        await self._async_ensure_connected()
+        response = await self._client.write_register(
+            register, value, device_id=device_id
+        )
+        if response.isError():
+            raise ModbusExceptionResponse(str(response))
+
+    async def async_write_registers(
+        self, device_id: int, register: int, values: List[int]
+    ) -> None:
+        """Write a block of holding registers (function 0x10)."""
+        await self._async_ensure_connected()
+        response = await self._client.write_registers(
+            register, values, device_id=device_id
+        )
+        if response.isError():
+            raise ModbusExceptionResponse(str(response))
+
+    def close(self) -> None:
+        """Close the connection."""
+        try:
+            self._client.close()
+        except Exception:  # pragma: no cover - best effort
+            pass
+
+
+def bus_key(transport: str, port: str | int, host: Optional[str] = None) -> str:
+    """Return the key of the bus behind an endpoint.
+
+    Every device reached through the same serial port or gateway shares it.
+    """
+    if transport == TRANSPORT_SERIAL:
+        return str(port)
+    return f"{transport}://{host}:{port}"
+
+
+def create_transport(
+    transport: str, port: str | int, host: Optional[str] = None
+) -> StreamTransport | PymodbusSerialTransport:
+    """Return a transport for an endpoint.
+
+    Serial ports use the native RTU transport, or pymodbus if it is unavailable.
+    """
+    if transport == TRANSPORT_RTU_OVER_TCP:
+        return RtuOverTcpTransport(host, int(port))
+    if transport == TRANSPORT_TCP:
+        return ModbusTcpTransport(host, int(port))
+    if NATIVE_RTU_AVAILABLE:
+        return RtuSerialTransport(str(port))
+    LOGGER.debug("Native RTU transport unavailable, using pymodbus for %s", port)
+    return PymodbusSerialTransport(str(port))
@@ -1,19 +1,68 @@
+import asyncio
 import logging
+import math
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
-from pymodbus.client import AsyncModbusSerialClient
-from pymodbus.exceptions import ModbusException
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import slugify
 
 from .const import (
+    BATTERY_CAPACITY_REGISTER,
     COMMANDS,
     DEFAULT_DEVICE_ID,
     DEFAULT_DEVICE_TYPE,
+    DEFAULT_REFRESH_FRESHNESS,
+    DEFAULT_SHUTDOWN_TIMEOUT,
+    DEFAULT_TRANSPORT,
+    DOMAIN,
+    ENERGY_MAX_GAP_INTERVALS,
+    FAULT_REGISTER,
+    LOAD_CONTROL_REGISTER,
     LOGGER,
-    UNAVAILABLE_RETRY_INTERVAL,
+    SIGNAL_NEW_KEYS,
+    TIMESERIES_DIRECTORY,
+    TRANSPORT_SERIAL,
+)
+from .adaptive import AdaptiveInterval
+from .ble_signal import KEY_BLE_SIGNAL_FAILURES
+from .ble_slots import KEY_BLE_SLOT_WAIT
+from .bus import KEY_BUS_QUEUE_DEPTH, async_acquire_bus, async_release_bus
+from .derived import KEY_BATTERY_CAPACITY, derive
+from .device import RenogyDevice
+from .energy import ENERGY_SOURCES, EnergyIntegrator
+from .events import (
+    KEY_FAULTS,
+    decode_faults,
+    detect_transitions,
+    event_type,
+    watched_states,
 )
+from .failover import KEY_ACTIVE_TRANSPORT, BusLink, FailoverLink, RegisterLink
+from .phase import async_get_phase_planner, next_refresh
+from .rolling import RollingStatistics
+from .scheduler import Priority
+from .shutdown import async_finish_task
+from .singleflight import SingleFlight
+from .timeseries import SampleClock, TimeSeriesStore
+
+if TYPE_CHECKING:
+    from .ble import RenogyBleLink
 
 try:
     from renogy_ble import RenogyParser
@@ -25,67 +74,26 @@ except Exception:  # pragma: no cover - library import guard
     LOGGER.error("renogy-ble library not found! Please install the requirements.")
 
 
-class RenogyUARTDevice:
+def device_address(
+    transport: str, port: str | int, host: Optional[str], slave_id: int
+) -> str:
+    """Return the address identifying a device in unique IDs and names.
+
+    Serial devices at the default slave ID keep the bare port path.
+    """
+    address = str(port) if transport == TRANSPORT_SERIAL else f"{host}:{port}"
+    if slave_id != DEFAULT_DEVICE_ID:
+        address = f"{address}/{slave_id}"
+    return address
+
+
+class RenogyUARTDevice(RenogyDevice):
     """Representation of a Renogy device connected over USB UART."""
 
     def __init__(self, port: str, device_type: str = DEFAULT_DEVICE_TYPE) -> None:
+        # The address doubles as the name, for compatibility with sensor unique IDs
+        super().__init__(port, port, device_type)
         self.port = port
-        self.address = port  # For compatibility with sensor unique IDs
-        self.name = port
-        self.device_type = device_type
-        self.failure_count = 0
-        self.max_failures = 3
-        self.available = True
-        self.parsed_data: Dict[str, Any] = {}
-        self.last_unavailable_time: Optional[datetime] = None
-
-    @property
-    def is_available(self) -> bool:
-        """Return True if device communication is healthy."""
-        return self.available and self.failure_count < self.max_failures
-
-    @property
-    def should_retry_connection(self) -> bool:
-        """Determine if we should attempt to reconnect to an unavailable device."""
-        if self.is_available:
-            return True
-        if self.last_unavailable_time is None:
-            self.last_unavailable_time = datetime.now()
-            return False
-        retry_time = self.last_unavailable_time + timedelta(
-            minutes=UNAVAILABLE_RETRY_INTERVAL
-        )
-        if datetime.now() >= retry_time:
-            self.last_unavailable_time = datetime.now()
-            return True
-        return False
-
-    def update_availability(
-        self, success: bool, error: Optional[Exception] = None
-    ) -> None:
-        """Update availability based on communication success."""
-        if success:
-            if self.failure_count > 0:
-                LOGGER.info(
-                    "Device %s communication restored after %s consecutive failures",
-                    self.name,
-                    self.failure_count,
-                )
-            self.failure_count = 0
-            if not self.available:
-                LOGGER.info("Device %s is now available", self.name)
-                self.available = True
-                self.last_unavailable_time = None
-        else:
-            self.failure_count += 1
-            if self.failure_count >= self.max_failures and self.available:
-                LOGGER.error(
-                    "Renogy device %s marked unavailable after %s consecutive polling failures",
-                    self.name,
-                    self.max_failures,
-                )
-                self.available = False
-                self.last_unavailable_time = datetime.now()
 
 
 class RenogyActiveUARTCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
@@ -97,55 +105,460 @@ class RenogyActiveUARTCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         port: str,
         device_type: str,
         scan_interval: int,
+        transport: str = DEFAULT_TRANSPORT,
+        host: Optional[str] = None,
+        slave_id: int = DEFAULT_DEVICE_ID,
+        adaptive_bounds: Optional[Tuple[float, float]] = None,
+        shutdown_timeout: float = DEFAULT_SHUTDOWN_TIMEOUT,
+        refresh_freshness: float = DEFAULT_REFRESH_FRESHNESS,
+        bluetooth_address: Optional[str] = None,
+        bluetooth_keep_connected: bool = True,
+        capture_frames: bool = False,
     ) -> None:
-        super().__init__(
-            hass,
-            LOGGER,
-            name="Renogy UART",
-            update_interval=timedelta(seconds=scan_interval),
-        )
-        self.address = port
-        self.device = RenogyUARTDevice(port, device_type)
-        self._client = AsyncModbusSerialClient(port, baudrate=9600, timeout=3)
+        # Polls are scheduled by the coordinator itself, at its phase
+        super().__init__(hass, LOGGER, name="Renogy UART", update_interval=None)
+        self.scan_interval = timedelta(seconds=scan_interval)
+        self._unsub_poll: Optional[CALLBACK_TYPE] = None
+        self.address = device_address(transport, port, host, slave_id)
+        self.slave_id = slave_id
+        self.device = RenogyUARTDevice(self.address, device_type)
+        # Shared with every other device on the same port or gateway
+        self._bus = async_acquire_bus(hass, transport, port, host)
+        # A BT module on the same device takes over while the bus fails
+        self.bluetooth_address = bluetooth_address
+        # Whether its connection is held between polls while failed over
+        self.bluetooth_keep_connected = bluetooth_keep_connected
+        self._link: RegisterLink = BusLink(self._bus, slave_id)
+        self._ble_link: Optional["RenogyBleLink"] = None
+        if bluetooth_address is not None:
+            # Imported here so wired-only setups don't load the Bluetooth stack
+            from .ble import RenogyBleLink
+
+            self._ble_link = RenogyBleLink(
+                hass, bluetooth_address, keep_connected=bluetooth_keep_connected
+            )
+            self._link = FailoverLink([self._link, self._ble_link])
+        # High-rate history of every snapshot, when enabled
+        self.timeseries: Optional[TimeSeriesStore] = None
+        self._timeseries_clock = SampleClock()
+        # Whether the raw frames on the bus are captured for this device
+        self.capture_frames = capture_frames
+        if capture_frames:
+            self._bus.async_start_capture(hass)
         self._parser = RenogyParser() if PARSER_AVAILABLE else None
+        # Entity values projected from the latest snapshot, keyed by sensor key
+        self.projection: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+        self.values: Dict[str, Any] = {}
+        # Keys the device has reported so far; new ones are announced via dispatcher
+        self.known_keys: Set[str] = set()
+        self.new_keys_signal = SIGNAL_NEW_KEYS.format(self.address)
+        self.energy = {key: EnergyIntegrator() for key in ENERGY_SOURCES}
+        # Last hour of the main values, shared by the rolling statistic sensors
+        self.rolling = RollingStatistics()
+        # Values transitions are detected on, as of the previous update
+        self._watched_states: Optional[Dict[str, Any]] = None
+        # Monotonic time each block was last read, and the keys it decoded to
+        self.block_read_at: Dict[str, float] = {}
+        self.block_keys: Dict[str, Set[str]] = {}
+        # Read once; 0 once the device turned out not to report it
+        self.battery_capacity: Optional[int] = None
+        # When set, the scan interval follows device activity within these bounds
+        self.adaptive = AdaptiveInterval(*adaptive_bounds) if adaptive_bounds else None
+        # Longest an unload waits for an in-flight poll before cancelling it
+        self.shutdown_timeout = shutdown_timeout
+        self._closing = False
+        # Concurrent refreshes share one poll
+        self._refresh: SingleFlight[Dict[str, Any]] = SingleFlight(
+            hass, f"{self.name} {self.address} poll", refresh_freshness
+        )
+        # Held while a poll or targeted refresh reads the device, so one never
+        # overwrites the other's blocks with older values
+        self._cycle_lock = asyncio.Lock()
+        # Devices on the same bus poll back-to-back, different buses are spread out
+        self._phase_planner = async_get_phase_planner(hass)
+        self._unregister_phase = self._phase_planner.async_register(
+            self.address, self._bus.key, self._async_phase_changed
+        )
 
-    async def async_close(self) -> None:
-        """Close the modbus client."""
+    @callback
+    def _async_phase_changed(self) -> None:
+        """Move the pending poll to the device's new phase."""
+        if self._unsub_poll is not None:
+            self.async_start_polling()
+
+    @callback
+    def async_set_polling(
+        self,
+        scan_interval: int,
+        adaptive_bounds: Optional[Tuple[float, float]],
+        refresh_freshness: float = DEFAULT_REFRESH_FRESHNESS,
+    ) -> None:
+        """Apply new polling settings without interrupting the connection."""
+        self._refresh.freshness = refresh_freshness
+        if adaptive_bounds is None:
+            self.adaptive = None
+        elif self.adaptive is None or (
+            self.adaptive.min_interval,
+            self.adaptive.max_interval,
+        ) != tuple(adaptive_bounds):
+            self.adaptive = AdaptiveInterval(*adaptive_bounds)
+        interval = self.adaptive.interval if self.adaptive else scan_interval
+        LOGGER.debug("Scan interval of %s is now %ss", self.address, interval)
+        self.scan_interval = timedelta(seconds=interval)
+        if self._unsub_poll is not None:
+            self.async_start_polling()
+
+    async def async_set_capture(self, enabled: bool) -> None:
+        """Start or stop capturing the raw frames on the device's bus."""
+        if enabled == self.capture_frames:
+            return
+        self.capture_frames = enabled
+        if enabled:
+            self._bus.async_start_capture(self.hass)
+        else:
+            await self._bus.async_stop_capture()
+
+    async def async_set_timeseries(self, enabled: bool) -> None:
+        """Open or close the device's high-rate history."""
+        if enabled == (self.timeseries is not None):
+            return
+        if enabled:
+            path = self.hass.config.path(
+                TIMESERIES_DIRECTORY, f"{slugify(self.address)}.ts"
+            )
+            store = TimeSeriesStore(path)
+            await self.hass.async_add_executor_job(store.open)
+            self.timeseries = store
+        else:
+            store, self.timeseries = self.timeseries, None
+            await self.hass.async_add_executor_job(store.close)
+
+    @callback
+    def async_start_polling(self) -> None:
+        """Schedule the next poll at the device's phase within the scan interval."""
+        self._async_stop_polling()
+        if self._closing or (
+            self.config_entry is not None and self.config_entry.pref_disable_polling
+        ):
+            return
+        now = self.hass.loop.time()
+        interval = self.scan_interval.total_seconds()
+        when = next_refresh(
+            now, interval, self._phase_planner.offset(self.address, interval)
+        )
+        self._unsub_poll = async_call_later(self.hass, when - now, self._async_poll_tick)
+
+    @callback
+    def _async_stop_polling(self) -> None:
+        """Cancel the scheduled poll."""
+        if self._unsub_poll is not None:
+            self._unsub_poll()
+            self._unsub_poll = None
+
+    @callback
+    def _async_poll_tick(self, _now: datetime) -> None:
+        """Start the scheduled poll and schedule the next one.
+
+        Not async_request_refresh: its cooldown is as long as the shortest
+        scan interval and would hold polls back from their phase.
+        """
+        self._unsub_poll = None
+        self.async_start_polling()
+        name = f"{self.name} {self.address} poll"
+        if self.config_entry is not None:
+            self.config_entry.async_create_background_task(
+                self.hass, self.async_refresh(), name
+            )
+        else:
+            self.hass.async_create_background_task(self.async_refresh(), name)
+
+    @callback
+    def async_set_projection(
+        self, projection: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> None:
+        """Set the projection used to compute entity values from each snapshot."""
+        self.projection = projection
+        self.values = projection(self.data) if self.data else {}
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Project the latest snapshot once, then update all listeners."""
+        if self.data:
+            if self.projection is not None:
+                self.values = self.projection(self.data)
+            self._async_fire_transitions()
+            if new_keys := self.data.keys() - self.known_keys:
+                self.known_keys |= new_keys
+                LOGGER.debug("Device %s reported new keys: %s", self.address, new_keys)
+                async_dispatcher_send(self.hass, self.new_keys_signal, new_keys)
+        super().async_update_listeners()
+
+    @callback
+    def _async_fire_transitions(self) -> None:
+        """Fire an event for every state transition and fault edge."""
+        states = watched_states(self.data)
+        transitions = detect_transitions(self._watched_states, states)
+        self._watched_states = states
+        if not transitions:
+            return
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, self.address)}
+        )
+        for trigger_type, data in transitions:
+            LOGGER.debug("Device %s: %s %s", self.address, trigger_type, data)
+            self.hass.bus.async_fire(
+                event_type(trigger_type),
+                {
+                    "device_id": device.id if device else None,
+                    "address": self.address,
+                    **data,
+                },
+            )
+
+    @callback
+    def async_restore_value(self, key: str, value: float) -> None:
+        """Restore a persisted total for a locally integrated key."""
+        if (integrator := self.energy.get(key)) is None:
+            return
+        integrator.restore(value)
+        if self.data and key in self.data:
+            self.data[key] = integrator.total
+            self.values[key] = integrator.total
+
+    def _integrate_energy(self, parsed: Dict[str, Any], timestamp: float) -> None:
+        """Integrate the power readings of a snapshot into the energy totals."""
+        max_gap = ENERGY_MAX_GAP_INTERVALS * self.scan_interval.total_seconds()
+        for key, power_fn in ENERGY_SOURCES.items():
+            power = power_fn(parsed)
+            if power is None and key not in self.known_keys:
+                continue
+            parsed[key] = self.energy[key].add_sample(power, timestamp, max_gap)
+
+    async def _async_read_battery_capacity(self) -> None:
+        """Read the nominal battery capacity used for time estimates."""
         try:
-            await self._client.close()
-        except Exception:  # pragma: no cover - best effort
-            pass
+            (self.battery_capacity,) = await self.async_read_registers(
+                BATTERY_CAPACITY_REGISTER, 1, Priority.BACKGROUND
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.debug("Device %s does not report battery capacity: %s", self.address, err)
+            self.battery_capacity = 0
+
+    async def _async_read_block(
+        self, block: str, priority: Priority = Priority.POLL
+    ) -> Dict[str, Any]:
+        """Read and decode one block of registers, recording when it was read."""
+        function, register, word_count = COMMANDS[self.device.device_type][block]
+        registers = await self.async_read_registers(register, word_count, priority)
+        byte_count = word_count * 2
+        payload = (
+            bytes([self.slave_id, function, byte_count])
+            + b"".join(reg.to_bytes(2, "big") for reg in registers)
+        )
+        values = self._parser.parse(payload, self.device.device_type, register)
+        if register <= FAULT_REGISTER < register + word_count:
+            values[KEY_FAULTS] = decode_faults(registers[FAULT_REGISTER - register])
+        self.block_keys[block] = set(values)
+        self.block_read_at[block] = time.monotonic()
+        return values
+
+    def blocks_for(self, names: Iterable[str]) -> List[str]:
+        """Return the blocks to read for a set of sensor keys or block names.
+
+        Values no single block reports (derived values, energy totals) need
+        every block. Raises KeyError for a name that is neither.
+        """
+        blocks = COMMANDS[self.device.device_type]
+        needed: Set[str] = set()
+        for name in names:
+            if name in blocks:
+                needed.add(name)
+            elif owners := {
+                block for block, keys in self.block_keys.items() if name in keys
+            }:
+                needed |= owners
+            elif self.data and name in self.data:
+                needed.update(blocks)
+            else:
+                raise KeyError(name)
+        return [block for block in blocks if block in needed]
+
+    async def async_refresh_blocks(
+        self, blocks: Iterable[str], max_age: float = 0
+    ) -> List[str]:
+        """Re-read the given blocks if older than max_age seconds; return those read.
+
+        Runs between polls, never alongside one, and merges only the blocks
+        it read into the current snapshot before updating listeners. Energy
+        totals, rolling statistics and the history are only sampled by the
+        regular poll, so on-demand reads don't skew them.
+        """
+        if self._closing:
+            raise UpdateFailed("Device is shutting down")
+        if not PARSER_AVAILABLE:
+            raise UpdateFailed("renogy-ble parser library not available")
+        if not self.device.should_retry_connection:
+            raise UpdateFailed("Device marked unavailable")
+
+        async with self._cycle_lock:
+            now = time.monotonic()
+            stale = [
+                block
+                for block in blocks
+                if now - self.block_read_at.get(block, -math.inf) >= max_age
+            ]
+            if not stale:
+                return []
+            values: Dict[str, Any] = {}
+            try:
+                for block in stale:
+                    if self._closing:
+                        raise UpdateFailed("Device is shutting down")
+                    values.update(await self._async_read_block(block, Priority.ON_DEMAND))
+            except Exception as err:  # pylint: disable=broad-except
+                if self._closing:
+                    raise UpdateFailed("Device is shutting down") from err
+                self.device.update_availability(False, err)
+                raise UpdateFailed(f"Error communicating with device: {err}") from err
+            finally:
+                if self._ble_link is not None:
+                    await self._ble_link.async_release()
+            self.device.update_availability(True, None)
+            data = {**(self.data or {}), **values}
+            data.update(derive(data))
+            self.data = data
+            self.device.parsed_data = data
+        self.async_update_listeners()
+        return stale
+
+    def _adapt_interval(self, parsed: Dict[str, Any]) -> None:
+        """Set the interval until the next poll from the device's activity."""
+        sun = self.hass.states.get("sun.sun")
+        elevation = sun.attributes.get("elevation") if sun is not None else None
+        interval = self.adaptive.update(parsed, elevation)
+        if interval != self.scan_interval.total_seconds():
+            LOGGER.debug("Adaptive scan interval of %s is now %.0fs", self.address, interval)
+            self.scan_interval = timedelta(seconds=interval)
+            if self._unsub_poll is not None:
+                self.async_start_polling()
+
+    async def async_shutdown(self) -> None:
+        """Stop polling, giving an in-flight poll until the deadline to finish.
+
+        A poll stops at the next block boundary once shutdown is requested;
+        one stuck on a hung device is cancelled when the deadline passes.
+        """
+        self._closing = True
+        self._async_stop_polling()
+        await super().async_shutdown()
+        if not await async_finish_task(self._refresh.task, self.shutdown_timeout):
+            LOGGER.warning(
+                "Poll of %s did not finish within %ss and was cancelled",
+                self.address,
+                self.shutdown_timeout,
+            )
+
+    async def async_close(self) -> None:
+        """Stop polling, then release the transports and the device's poll phase."""
+        await self.async_shutdown()
+        self._unregister_phase()
+        await self._link.async_close()
+        await self.async_set_capture(False)
+        await self.async_set_timeseries(False)
+        async_release_bus(self.hass, self._bus)
+
+    async def async_read_registers(
+        self, register: int, word_count: int, priority: Priority = Priority.POLL
+    ) -> List[int]:
+        """Read a block of holding registers from the device."""
+        return await self._link.async_read_registers(register, word_count, priority)
+
+    async def async_write_register(
+        self, register: int, value: int, priority: Priority = Priority.CONTROL
+    ) -> None:
+        """Write a single holding register on the device."""
+        await self._link.async_write_register(register, value, priority)
+
+    async def async_write_registers(
+        self, register: int, values: List[int], priority: Priority = Priority.CONTROL
+    ) -> None:
+        """Write a block of holding registers on the device in one transaction."""
+        await self._link.async_write_registers(register, values, priority)
+
+    async def async_set_load(self, on: bool) -> None:
+        """Switch the load output and reflect the new state immediately."""
+        await self.async_write_register(LOAD_CONTROL_REGISTER, int(on))
+        if self.data is not None:
+            self.data["load_status"] = "on" if on else "off"
+            self.async_update_listeners()
 
     async def _async_update_data(self) -> Dict[str, Any]:
-        """Fetch data from the Renogy device."""
+        """Fetch data from the Renogy device.
+
+        Concurrent refreshes share one poll, and a refresh shortly after a
+        successful poll is served from its snapshot. The poll runs as its own
+        task so that shutdown can cancel it without cancelling whoever
+        requested the refresh.
+        """
+        if self._closing:
+            raise UpdateFailed("Device is shutting down")
+        if self._refresh.task is None and self._refresh.fresh and self.data:
+            LOGGER.debug("Serving refresh of %s from the last poll", self.address)
+            return self.data
+        try:
+            return await self._refresh.async_run(self._async_poll())
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and not current.cancelling():
+                raise UpdateFailed("Poll cancelled by shutdown") from None
+            raise
+
+    async def _async_poll(self) -> Dict[str, Any]:
+        """Read every block of the device and decode the snapshot."""
         if not PARSER_AVAILABLE:
             raise UpdateFailed("renogy-ble parser library not available")
 
         if not self.device.should_retry_connection:
             raise UpdateFailed("Device marked unavailable")
 
-        try:
-            await self._client.connect()
-            parsed: Dict[str, Any] = {}
-            for _, (function, register, word_count) in COMMANDS[self.device.device_type].items():
-                response = await self._client.read_holding_registers(
-                    register,
-                    count=word_count,
-                    device_id=DEFAULT_DEVICE_ID,
-                )
-                if hasattr(response, "isError") and response.isError():
-                    raise ModbusException(str(response))
-                byte_count = word_count * 2
-                payload = (
-                    bytes([DEFAULT_DEVICE_ID, function, byte_count])
-                    + b"".join(reg.to_bytes(2, "big") for reg in response.registers)
-                )
-                parsed.update(
-                    self._parser.parse(payload, self.device.device_type, register)
-                )
-            self.device.update_availability(True, None)
-            self.device.parsed_data = parsed
-            return parsed
-        except Exception as err:  # pylint: disable=broad-except
-            self.device.update_availability(False, err)
-            raise UpdateFailed(f"Error communicating with device: {err}") from err
+        async with self._cycle_lock:
+            try:
+                parsed: Dict[str, Any] = {}
+                queue_depth = 0
+                for block in COMMANDS[self.device.device_type]:
+                    if self._closing:
+                        raise UpdateFailed("Device is shutting down")
+                    queue_depth = max(queue_depth, self._bus.scheduler.depth)
+                    parsed.update(await self._async_read_block(block))
+                parsed[KEY_BUS_QUEUE_DEPTH] = queue_depth
+                if isinstance(self._link, FailoverLink):
+                    parsed[KEY_ACTIVE_TRANSPORT] = self._link.name
+                if (ble_link := self._ble_link) is not None:
+                    parsed[KEY_BLE_SLOT_WAIT] = ble_link.slot_wait
+                    ble_link.slot_wait = 0.0
+                    parsed[KEY_BLE_SIGNAL_FAILURES] = ble_link.signal_failures
+                if self.battery_capacity is None:
+                    await self._async_read_battery_capacity()
+                if self.battery_capacity:
+                    parsed[KEY_BATTERY_CAPACITY] = self.battery_capacity
+                now = time.monotonic()
+                self._integrate_energy(parsed, now)
+                parsed.update(derive(parsed))
+                parsed.update(self.rolling.add(now, parsed))
+                if (store := self.timeseries) is not None:
+                    await self.hass.async_add_executor_job(
+                        store.append, self._timeseries_clock.now(), parsed
+                    )
+                self.device.update_availability(True, None)
+                self.device.parsed_data = parsed
+                if self.adaptive is not None:
+                    self._adapt_interval(parsed)
+                return parsed
+            except Exception as err:  # pylint: disable=broad-except
+                if self._closing:
+                    raise UpdateFailed("Device is shutting down") from err
+                self.device.update_availability(False, err)
+                raise UpdateFailed(f"Error communicating with device: {err}") from err
+            finally:
+                if self._ble_link is not None:
+                    await self._ble_link.async_release()
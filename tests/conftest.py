@@ -0,0 +1,104 @@
+"""Shared fixtures: a bare Home Assistant core and a controller on a loopback gateway."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import frame
+
+from custom_components.renogy.const import TRANSPORT_RTU_OVER_TCP
+from custom_components.renogy.modbus import modbus_crc
+from custom_components.renogy.uart import RenogyActiveUARTCoordinator
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path):
+    """Return a Home Assistant core that is never started."""
+    hass = HomeAssistant(str(tmp_path))
+    frame.async_setup(hass)
+    yield hass
+    await hass.async_stop(force=True)
+
+
+class FakeController:
+    """A controller behind an RTU-over-TCP gateway.
+
+    Read requests are answered with the low byte of each register address,
+    unless the register is overridden, refused, delayed or the device is hung.
+    """
+
+    def __init__(self):
+        self.registers = {}
+        # Start registers of the read requests received, in order
+        self.reads = []
+        # Start registers answered with an exception response
+        self.refused = set()
+        # Seconds to wait before answering reads of a start register
+        self.delays = {}
+        self.hung = False
+        self.port = None
+        self._server = None
+        self._connections = set()
+
+    async def _handle(self, reader, writer):
+        self._connections.add(asyncio.current_task())
+        try:
+            while True:
+                request = await reader.readexactly(8)
+                register = int.from_bytes(request[2:4], "big")
+                word_count = int.from_bytes(request[4:6], "big")
+                self.reads.append(register)
+                if self.hung:
+                    await asyncio.sleep(3600)
+                await asyncio.sleep(self.delays.get(register, 0))
+                if register in self.refused:
+                    frame = bytes([request[0], request[1] | 0x80, 0x02])
+                else:
+                    frame = bytes([request[0], request[1], word_count * 2]) + b"".join(
+                        self.registers.get(address, address & 0xFF).to_bytes(2, "big")
+                        for address in range(register, register + word_count)
+                    )
+                writer.write(frame + bytes(modbus_crc(frame)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def async_start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def close(self):
+        self._server.close()
+        for connection in list(self._connections):
+            connection.cancel()
+
+
+@pytest_asyncio.fixture
+async def controller():
+    """Return a fake controller listening on a loopback port."""
+    device = FakeController()
+    await device.async_start()
+    yield device
+    device.close()
+
+
+@pytest.fixture
+def make_coordinator(hass, controller):
+    """Return a factory of coordinators polling the fake controller."""
+
+    def make(**kwargs):
+        return RenogyActiveUARTCoordinator(
+            hass,
+            str(controller.port),
+            "controller",
+            60,
+            transport=TRANSPORT_RTU_OVER_TCP,
+            host="127.0.0.1",
+            **kwargs,
+        )
+
+    return make
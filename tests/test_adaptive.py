@@ -0,0 +1,43 @@
+"""Tests for the adaptive scan interval."""
+
+import pytest
+
+from custom_components.renogy.adaptive import AdaptiveInterval
+
+
+def test_steady_signals_lengthen_gradually():
+    """A quiet device backs off towards the longest interval, step by step."""
+    adaptive = AdaptiveInterval(10, 300)
+    intervals = [adaptive.update({"pv_power": 0, "load_power": 12}) for _ in range(12)]
+    assert intervals[0] == pytest.approx(15)
+    assert all(b >= a for a, b in zip(intervals, intervals[1:]))
+    assert intervals[-1] == pytest.approx(300)
+
+
+def test_variable_signals_shorten_immediately():
+    """Passing clouds bring the interval straight back down."""
+    adaptive = AdaptiveInterval(10, 300)
+    for _ in range(12):
+        adaptive.update({"pv_power": 400})
+    assert adaptive.interval == pytest.approx(300)
+    adaptive.update({"pv_power": 150})
+    assert adaptive.interval == pytest.approx(10)
+
+
+def test_charging_state_transition_is_full_activity():
+    """A charging state change polls at the shortest interval."""
+    adaptive = AdaptiveInterval(10, 300)
+    for _ in range(12):
+        adaptive.update({"charging_status": "boost"})
+    assert adaptive.update({"charging_status": "float"}) == pytest.approx(10)
+
+
+def test_twilight_prior():
+    """Around sunrise and sunset the interval stays short even when quiet."""
+    adaptive = AdaptiveInterval(10, 360)
+    for _ in range(12):
+        adaptive.update({"pv_power": 0}, sun_elevation=2.0)
+    assert adaptive.interval == pytest.approx(60)
+    for _ in range(12):
+        adaptive.update({"pv_power": 0}, sun_elevation=-30.0)
+    assert adaptive.interval == pytest.approx(360)
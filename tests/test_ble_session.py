@@ -0,0 +1,226 @@
+"""Tests for the BLE GATT session."""
+
+import asyncio
+
+import pytest
+from bleak.exc import BleakError
+
+from custom_components.renogy import ble_session
+from custom_components.renogy.ble_session import RenogyBleSession
+from custom_components.renogy.ble_slots import BleSlotScheduler
+from custom_components.renogy.modbus import build_read_request, modbus_crc
+
+
+def _read_response(request: bytes) -> bytes:
+    """Answer a read request with registers counting up from the address."""
+    register = int.from_bytes(request[2:4], "big")
+    word_count = int.from_bytes(request[4:6], "big")
+    frame = bytes([request[0], request[1], word_count * 2]) + b"".join(
+        (register + i).to_bytes(2, "big") for i in range(word_count)
+    )
+    return frame + bytes(modbus_crc(frame))
+
+
+class FakeClient:
+    """Stand-in for a BT module answering read requests over notifications."""
+
+    def __init__(self, answers=True, queues=True, ignored=0, latency=0.001):
+        self.is_connected = True
+        self.answers = answers
+        # Modules that don't queue ignore requests while one is in progress
+        self.queues = queues
+        # Number of first requests left unanswered
+        self.ignored = ignored
+        # Seconds until a request is answered
+        self.latency = latency
+        self.busy = False
+        self.handler = None
+        self.writes = []
+
+    async def start_notify(self, _uuid, handler):
+        self.handler = handler
+
+    async def write_gatt_char(self, _uuid, data):
+        self.writes.append(bytes(data))
+        if not self.answers or (self.busy and not self.queues):
+            return
+        if len(self.writes) <= self.ignored:
+            return
+        self.busy = True
+        loop = asyncio.get_running_loop()
+        response = _read_response(bytes(data))
+        # BT modules split responses into notifications of at most 20 bytes
+        for start in range(0, len(response), 20):
+            loop.call_later(
+                self.latency, self.handler, None, bytearray(response[start : start + 20])
+            )
+        loop.call_later(self.latency, setattr, self, "busy", False)
+
+    async def disconnect(self):
+        self.is_connected = False
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Patch connection setup to hand out fake clients."""
+    clients_to_return = []
+    clients = []
+
+    async def establish_connection(_cls, _device, _name, **kwargs):
+        client = clients_to_return.pop(0)
+        if isinstance(client, Exception):
+            raise client
+        client.disconnected_callback = kwargs["disconnected_callback"]
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(ble_session, "establish_connection", establish_connection)
+    monkeypatch.setattr(ble_session, "MAX_NOTIFICATION_WAIT_TIME", 0.05)
+    return clients_to_return, clients
+
+
+REQUESTS = [
+    build_read_request(0xFF, 0x000C, 8),
+    build_read_request(0xFF, 0x0100, 34),
+    build_read_request(0xFF, 0xE004, 1),
+]
+
+
+@pytest.mark.asyncio
+async def test_kept_session_is_reused(connections):
+    """A kept session connects once and reassembles fragmented responses."""
+    to_return, opened = connections
+    to_return.append(FakeClient())
+    session = RenogyBleSession("AA:BB", keep_connected=True)
+
+    for _ in range(2):
+        await session.async_connect(object())
+        assert await session.async_request(REQUESTS[1]) == _read_response(REQUESTS[1])
+        await session.async_release()
+
+    assert len(opened) == 1
+    assert session.connected
+
+
+@pytest.mark.asyncio
+async def test_per_poll_session_disconnects(connections):
+    """Without keep-connected, each poll ends with a disconnect."""
+    to_return, opened = connections
+    to_return.append(FakeClient())
+    session = RenogyBleSession("AA:BB")
+    await session.async_connect(object())
+    await session.async_request(REQUESTS[0])
+    await session.async_release()
+    assert not session.connected
+    assert not opened[0].is_connected
+
+
+@pytest.mark.asyncio
+async def test_pipelined_batch(connections):
+    """A module that queues requests gets the whole batch at once."""
+    to_return, opened = connections
+    to_return.append(FakeClient(queues=True))
+    session = RenogyBleSession("AA:BB")
+    await session.async_connect(object())
+    responses = await session.async_request_many(REQUESTS)
+    assert responses == [_read_response(request) for request in REQUESTS]
+    assert session.pipelining
+    assert opened[0].writes == REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_lockstep_fallback(connections):
+    """A module that drops queued requests is switched to lockstep."""
+    to_return, opened = connections
+    to_return.append(FakeClient(queues=False))
+    session = RenogyBleSession("AA:BB")
+    await session.async_connect(object())
+    responses = await session.async_request_many(REQUESTS)
+    assert responses == [_read_response(request) for request in REQUESTS]
+    assert not session.pipelining
+
+    # Later batches go straight to lockstep
+    opened[0].writes.clear()
+    await session.async_request_many(REQUESTS)
+    assert opened[0].writes == REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_late_responses_are_drained_before_lockstep(connections):
+    """A response arriving after its batch failed is not taken for a lockstep one."""
+    to_return, opened = connections
+    client = FakeClient(ignored=2, latency=0.03)
+    to_return.append(client)
+    session = RenogyBleSession("AA:BB")
+    await session.async_connect(object())
+    # Device ID and battery type reads have responses of the same shape
+    requests = [
+        build_read_request(0xFF, 0x001A, 1),
+        build_read_request(0xFF, 0xE004, 1),
+    ]
+    # The battery read's response arrives after the pipelined batch gave up on it
+    asyncio.get_running_loop().call_later(
+        0.11, client.handler, None, bytearray(_read_response(requests[1]))
+    )
+    responses = await session.async_request_many(requests)
+    assert responses == [_read_response(request) for request in requests]
+    assert opened[0].writes == requests * 2
+
+
+@pytest.mark.asyncio
+async def test_silent_session_is_dropped(connections):
+    """A link that is up but never answers is dropped for the next poll."""
+    to_return, _ = connections
+    to_return.append(FakeClient(answers=False))
+    session = RenogyBleSession("AA:BB", keep_connected=True)
+    await session.async_connect(object())
+    with pytest.raises(TimeoutError):
+        await session.async_request(REQUESTS[0])
+    assert not session.connected
+
+
+@pytest.mark.asyncio
+async def test_reconnect_backs_off(connections):
+    """After a failed connection, reconnecting waits out the backoff."""
+    to_return, _ = connections
+    to_return.append(BleakError("out of slots"))
+    session = RenogyBleSession("AA:BB", keep_connected=True)
+    with pytest.raises(BleakError, match="out of slots"):
+        await session.async_connect(object())
+    # The second attempt fails fast without touching the adapter
+    with pytest.raises(BleakError, match="Reconnecting"):
+        await session.async_connect(object())
+
+
+@pytest.mark.asyncio
+async def test_kept_session_holds_its_slot(connections):
+    """A kept connection counts against the adapter until it drops."""
+    to_return, opened = connections
+    to_return.extend([FakeClient(), FakeClient()])
+    slots = BleSlotScheduler(capacity=1)
+    session = RenogyBleSession("AA:BB", keep_connected=True)
+
+    await session.async_connect(object(), await slots.async_acquire("hci0"))
+    await session.async_release()
+    assert slots.choose([("hci0", -60), ("hci1", -62)]) == "hci1"
+
+    # The adapter dropping the connection frees the slot
+    opened[0].disconnected_callback(opened[0])
+    assert slots.choose([("hci0", -60), ("hci1", -62)]) == "hci0"
+
+    await session.async_connect(object(), await slots.async_acquire("hci0"))
+    await session.async_disconnect()
+    assert slots.choose([("hci0", -60), ("hci1", -62)]) == "hci0"
+
+
+@pytest.mark.asyncio
+async def test_failed_connection_gives_the_slot_back(connections):
+    """A slot taken for a connection that fails is released at once."""
+    to_return, _ = connections
+    to_return.append(BleakError("out of slots"))
+    slots = BleSlotScheduler(capacity=1)
+    lease = await slots.async_acquire("hci0")
+    with pytest.raises(BleakError):
+        await RenogyBleSession("AA:BB").async_connect(object(), lease)
+    assert not lease.held
+
@@ -0,0 +1,43 @@
+"""Tests for signal-aware BLE poll gating."""
+
+import pytest
+
+from custom_components.renogy.ble_signal import (
+    interval_factor,
+    poll_blocker,
+    poll_priority,
+    signal_weak,
+)
+from custom_components.renogy.ble_slots import BleSlotScheduler
+from custom_components.renogy.scheduler import Priority
+
+
+def test_interval_factor():
+    """Strong devices poll every interval, weak ones progressively less often."""
+    assert interval_factor(None) == 1.0
+    assert interval_factor(-70) == 1.0
+    assert interval_factor(-90) == pytest.approx(2.5)
+    assert interval_factor(-99) == pytest.approx(4.0)
+
+
+def test_poll_blocker():
+    """Stale and out-of-range devices are not worth a connection attempt."""
+    assert poll_blocker(-70, 5) is None
+    assert "not seen" in poll_blocker(-70, 300)
+    assert "too weak" in poll_blocker(-96, 5)
+
+
+def test_weak_devices_yield_slots():
+    """Weak devices wait behind strong ones for a connection slot."""
+    assert not signal_weak(-80)
+    assert signal_weak(-88)
+    assert poll_priority(-60) == Priority.POLL
+    assert poll_priority(-88) == Priority.BACKGROUND
+
+
+@pytest.mark.asyncio
+async def test_weak_devices_stick_to_best_adapter():
+    """Without a margin, a busy best adapter is waited for."""
+    slots = BleSlotScheduler(capacity=1)
+    async with slots.slot("proxy"):
+        assert slots.choose([("hci0", -89), ("proxy", -86)], margin=0) == "proxy"
@@ -0,0 +1,58 @@
+"""Tests for the BLE connection slot scheduler."""
+
+import asyncio
+
+import pytest
+
+from custom_components.renogy.ble_slots import BleSlotScheduler
+
+
+def test_choose_best_rssi():
+    """The adapter hearing the device best is used."""
+    slots = BleSlotScheduler()
+    assert slots.choose([("hci0", -85), ("proxy-kitchen", -60)]) == "proxy-kitchen"
+
+
+@pytest.mark.asyncio
+async def test_choose_free_adapter_within_margin():
+    """A nearly as good adapter with a free slot beats a busy one."""
+    slots = BleSlotScheduler(capacity=1)
+    async with slots.slot("proxy-kitchen"):
+        assert slots.choose([("hci0", -65), ("proxy-kitchen", -60)]) == "hci0"
+        # Too weak to be worth it: wait for the best adapter instead
+        assert slots.choose([("hci0", -90), ("proxy-kitchen", -60)]) == "proxy-kitchen"
+
+
+@pytest.mark.asyncio
+async def test_slots_limit_connections_in_arrival_order():
+    """At most `capacity` connections run per adapter, served in order."""
+    slots = BleSlotScheduler(capacity=2)
+    active = 0
+    peak = 0
+    order = []
+    waits = {}
+
+    async def poll(name):
+        nonlocal active, peak
+        async with slots.slot("hci0") as waited:
+            waits[name] = waited
+            active += 1
+            peak = max(peak, active)
+            order.append(name)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+    await asyncio.gather(*(poll(f"dev{i}") for i in range(6)))
+    assert peak == 2
+    assert order == [f"dev{i}" for i in range(6)]
+    assert waits["dev0"] < 0.01
+    assert waits["dev5"] >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_adapters_are_independent():
+    """A full adapter does not hold up devices on another one."""
+    slots = BleSlotScheduler(capacity=1)
+    async with slots.slot("hci0"):
+        async with slots.slot("hci1") as waited:
+            assert waited < 0.01
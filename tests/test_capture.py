@@ -0,0 +1,152 @@
+"""Tests for raw frame capture and replay."""
+
+import asyncio
+
+import pytest
+
+from custom_components.renogy.capture import (
+    DIRECTION_REQUEST,
+    DIRECTION_RESPONSE,
+    FILE_HEADER,
+    FRAMING_TCP,
+    CaptureError,
+    FrameRecorder,
+    read_capture,
+    replay,
+)
+from custom_components.renogy.modbus import build_read_request, build_tcp_frame, modbus_crc
+from custom_components.renogy.transport import RtuOverTcpTransport
+
+
+def _with_crc(frame: bytes) -> bytes:
+    return frame + bytes(modbus_crc(frame))
+
+
+class Hass:
+    """Just enough of Home Assistant to schedule flushes and executor jobs."""
+
+    @property
+    def loop(self):
+        return asyncio.get_running_loop()
+
+    def async_create_task(self, target, name=None, eager_start=True):
+        return asyncio.get_running_loop().create_task(target, name=name)
+
+    async def async_add_executor_job(self, target, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+
+class Parser:
+    """Decode the first register of a read response."""
+
+    def parse(self, payload, device_type, register):
+        return {"device_type": device_type, "first": int.from_bytes(payload[3:5], "big")}
+
+
+@pytest.mark.asyncio
+async def test_frames_round_trip(tmp_path):
+    """Frames are written in order and read back with their direction."""
+    path = str(tmp_path / "captures" / "bus.bin")
+    recorder = FrameRecorder(Hass(), path)
+    request = build_read_request(0x01, 0x0100, 1)
+    response = _with_crc(bytes.fromhex("010302002a"))
+    recorder.record(DIRECTION_REQUEST, request)
+    recorder.record(DIRECTION_RESPONSE, response)
+    await recorder.async_close()
+
+    _, frames = read_capture(path)
+    frames = list(frames)
+    assert [(frame.direction, frame.frame) for frame in frames] == [
+        (DIRECTION_REQUEST, request),
+        (DIRECTION_RESPONSE, response),
+    ]
+    assert frames[0].timestamp <= frames[1].timestamp
+
+    assert list(replay(path, "controller", Parser())) == [
+        (frames[1].timestamp, 0x0100, {"device_type": "controller", "first": 42})
+    ]
+
+
+@pytest.mark.asyncio
+async def test_truncated_record_is_ignored(tmp_path):
+    """A record cut short by a crash does not stop the rest being read."""
+    path = tmp_path / "bus.bin"
+    recorder = FrameRecorder(Hass(), str(path))
+    recorder.record(DIRECTION_REQUEST, b"\x01\x03\x01\x00\x00\x01\x85\xf6")
+    recorder.record(DIRECTION_RESPONSE, b"\x01\x03\x02\x00\x2a\x38\x5b")
+    await recorder.async_close()
+    path.write_bytes(path.read_bytes()[:-3])
+
+    _, frames = read_capture(str(path))
+    assert [frame.direction for frame in frames] == [DIRECTION_REQUEST]
+
+
+def test_rejects_other_files(tmp_path):
+    """Files without the capture header are refused."""
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\x00" * FILE_HEADER.size)
+    with pytest.raises(CaptureError):
+        read_capture(str(path))
+
+
+@pytest.mark.asyncio
+async def test_rotation_keeps_backups(tmp_path):
+    """The file rotates at its size limit, dropping the oldest backup."""
+    path = tmp_path / "bus.bin"
+    recorder = FrameRecorder(Hass(), str(path), max_bytes=64, backups=2)
+    for index in range(4):
+        recorder.record(DIRECTION_REQUEST, bytes([index]) * 40)
+        await recorder.async_flush()
+    await recorder.async_close()
+
+    assert sorted(file.name for file in tmp_path.iterdir()) == [
+        "bus.bin",
+        "bus.bin.1",
+        "bus.bin.2",
+    ]
+    for name, index in (("bus.bin", 3), ("bus.bin.1", 2), ("bus.bin.2", 1)):
+        _, frames = read_capture(str(tmp_path / name))
+        assert [frame.frame for frame in frames] == [bytes([index]) * 40]
+
+
+@pytest.mark.asyncio
+async def test_transport_records_exchanges(tmp_path):
+    """A transport with a recorder captures each request and its response."""
+
+    async def handler(reader, writer):
+        await reader.readexactly(8)
+        writer.write(_with_crc(bytes.fromhex("0103040001" "0002")))
+        await writer.drain()
+
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    transport = RtuOverTcpTransport("127.0.0.1", server.sockets[0].getsockname()[1])
+    transport.recorder = FrameRecorder(Hass(), str(tmp_path / "bus.bin"))
+    try:
+        assert await transport.async_read_registers(0x01, 0x0100, 2) == [1, 2]
+    finally:
+        transport.close()
+        server.close()
+    await transport.recorder.async_close()
+
+    _, frames = read_capture(str(tmp_path / "bus.bin"))
+    assert [frame.frame for frame in frames] == [
+        build_read_request(0x01, 0x0100, 2),
+        _with_crc(bytes.fromhex("0103040001" "0002")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replay_modbus_tcp_capture(tmp_path):
+    """Captures of Modbus TCP frames are replayed from their PDUs."""
+    path = str(tmp_path / "gateway.bin")
+    recorder = FrameRecorder(Hass(), path, framing=FRAMING_TCP)
+    recorder.record(DIRECTION_REQUEST, build_tcp_frame(1, 0x02, bytes.fromhex("0301000001")))
+    recorder.record(DIRECTION_RESPONSE, build_tcp_frame(1, 0x02, bytes.fromhex("0302007b")))
+    # Exception responses are not decoded
+    recorder.record(DIRECTION_REQUEST, build_tcp_frame(2, 0x02, bytes.fromhex("0301000001")))
+    recorder.record(DIRECTION_RESPONSE, build_tcp_frame(2, 0x02, bytes.fromhex("8302")))
+    await recorder.async_close()
+
+    assert [values for _, _, values in replay(path, "controller", Parser())] == [
+        {"device_type": "controller", "first": 123}
+    ]
@@ -0,0 +1,200 @@
+"""Tests for the config and options flows and applying changed options."""
+
+from datetime import timedelta
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.config_entries import (
+    SOURCE_USER,
+    ConfigEntry,
+    ConfigEntryState,
+    current_entry,
+)
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.renogy import _async_update_listener, async_setup_entry
+from custom_components.renogy.config_flow import RenogyConfigFlow, RenogyOptionsFlow
+from custom_components.renogy.const import DOMAIN, TRANSPORT_RTU_OVER_TCP, TRANSPORT_TCP
+
+
+def _entry(gateway_port, **options):
+    return ConfigEntry(
+        data={
+            "transport": TRANSPORT_RTU_OVER_TCP,
+            "host": "127.0.0.1",
+            "port": gateway_port,
+            "device_type": "controller",
+            "scan_interval": 60,
+        },
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options=options,
+        source=SOURCE_USER,
+        subentries_data=None,
+        title=f"127.0.0.1:{gateway_port}",
+        unique_id=None,
+        version=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_config_flow_creates_entry(hass):
+    """A network device is titled by its address and keeps its transport."""
+    flow = RenogyConfigFlow()
+    flow.hass = hass
+
+    result = await flow.async_step_tcp(
+        {
+            "host": "gw",
+            "port": 502,
+            "slave_id": 3,
+            "adaptive_min_interval": 60,
+            "adaptive_max_interval": 30,
+        }
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"adaptive_min_interval": "invalid_adaptive_bounds"}
+
+    result = await flow.async_step_tcp({"host": "gw", "port": 502, "slave_id": 3})
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "gw:502/3"
+    assert result["data"] == {
+        "transport": TRANSPORT_TCP,
+        "host": "gw",
+        "port": 502,
+        "slave_id": 3,
+    }
+
+
+@pytest.mark.asyncio
+async def test_options_flow_clears_the_bluetooth_address(hass):
+    """Options default to the entry's settings; a cleared address is stored empty."""
+    entry = _entry(502, bluetooth_address="AA:BB:CC:DD:EE:FF")
+    hass.config_entries = SimpleNamespace(
+        async_get_known_entry={entry.entry_id: entry}.get
+    )
+    flow = RenogyOptionsFlow()
+    flow.hass = hass
+    flow.handler = entry.entry_id
+
+    result = await flow.async_step_init()
+    assert result["type"] is FlowResultType.FORM
+    schema = result["data_schema"].schema
+    suggested = {
+        str(key): key.description["suggested_value"]
+        for key in schema
+        if key.description
+    }
+    assert suggested["port"] == 502
+    assert suggested["bluetooth_address"] == "AA:BB:CC:DD:EE:FF"
+    # Tuning options are only offered once the device is set up
+    assert {"shutdown_timeout", "refresh_freshness"} <= {str(key) for key in schema}
+
+    result = await flow.async_step_init({"host": "127.0.0.1", "port": 502})
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {
+        "bluetooth_address": "",
+        "host": "127.0.0.1",
+        "port": 502,
+    }
+
+
+@pytest.mark.asyncio
+async def test_polling_options_apply_without_reloading(
+    hass, make_coordinator, controller
+):
+    """Polling, capture and tuning options are applied to the running coordinator."""
+    entry = _entry(
+        controller.port,
+        scan_interval=30,
+        adaptive_scan_interval=True,
+        adaptive_min_interval=20,
+        adaptive_max_interval=120,
+        shutdown_timeout=5.0,
+        refresh_freshness=0.0,
+    )
+    hass.config_entries = SimpleNamespace(async_reload=AsyncMock())
+    coordinator = make_coordinator()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+    try:
+        await _async_update_listener(hass, entry)
+        hass.config_entries.async_reload.assert_not_called()
+        assert coordinator.adaptive.min_interval == 20
+        assert coordinator.adaptive.max_interval == 120
+        assert coordinator.scan_interval == timedelta(
+            seconds=coordinator.adaptive.interval
+        )
+        assert coordinator.shutdown_timeout == 5.0
+        assert coordinator._refresh.freshness == 0.0
+
+        entry = _entry(controller.port, scan_interval=30)
+        hass.data[DOMAIN] = {entry.entry_id: coordinator}
+        await _async_update_listener(hass, entry)
+        assert coordinator.adaptive is None
+        assert coordinator.scan_interval == timedelta(seconds=30)
+    finally:
+        await coordinator.async_close()
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"slave_id": 2},
+        {"port": 1},
+        {"device_type": "battery"},
+        {"bluetooth_address": "aa:bb:cc:dd:ee:ff"},
+        {"bluetooth_keep_connected": False},
+    ],
+)
+@pytest.mark.asyncio
+async def test_connection_options_reload_the_entry(
+    hass, make_coordinator, controller, options
+):
+    """A new address, device type or Bluetooth module reloads the entry."""
+    entry = _entry(controller.port, **options)
+    hass.config_entries = SimpleNamespace(async_reload=AsyncMock())
+    coordinator = make_coordinator()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+    try:
+        await _async_update_listener(hass, entry)
+        hass.config_entries.async_reload.assert_awaited_once_with(entry.entry_id)
+        assert coordinator.scan_interval == timedelta(seconds=60)
+    finally:
+        await coordinator.async_close()
+
+
+@pytest.mark.asyncio
+async def test_bluetooth_keep_connected_option_reaches_the_link(hass, controller):
+    """The keep-connected option set in the options flow configures the BT link."""
+    pytest.importorskip("custom_components.renogy.ble")
+    entry = _entry(controller.port)
+    hass.config_entries = SimpleNamespace(
+        async_get_known_entry={entry.entry_id: entry}.get,
+        async_forward_entry_setups=AsyncMock(),
+    )
+    flow = RenogyOptionsFlow()
+    flow.hass = hass
+    flow.handler = entry.entry_id
+    result = await flow.async_step_init(
+        {
+            "host": "127.0.0.1",
+            "port": controller.port,
+            "bluetooth_address": "AA:BB:CC:DD:EE:FF",
+            "bluetooth_keep_connected": False,
+        }
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+
+    entry = _entry(controller.port, **result["data"])
+    # As set up by Home Assistant
+    current_entry.set(entry)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    assert await async_setup_entry(hass, entry)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    try:
+        assert not coordinator.bluetooth_keep_connected
+        assert not coordinator._ble_link._session.keep_connected
+    finally:
+        await coordinator.async_close()
@@ -0,0 +1,53 @@
+"""Tests for the values derived from each snapshot."""
+
+import pytest
+
+from custom_components.renogy.derived import derive
+
+
+def test_derived_values():
+    """Power, efficiency, load share and time to full are computed together."""
+    derived = derive(
+        {
+            "battery_voltage": 13.0,
+            "battery_current": 7.5,
+            "battery_percentage": 60,
+            "battery_capacity": 100,
+            "pv_power": 120,
+            "load_power": 30,
+            "load_current": 2.5,
+        }
+    )
+    # Net of the 2.5 A the load draws from the 7.5 A charging current
+    assert derived["battery_power"] == pytest.approx(65)
+    assert derived["charging_efficiency"] == pytest.approx(81.25)
+    assert derived["load_share"] == pytest.approx(25)
+    # 40 Ah to go at a net 5 A
+    assert derived["time_to_full"] == pytest.approx(8)
+    assert derived["time_to_empty"] is None
+
+
+def test_time_to_empty_and_night():
+    """At night ratios are undefined and the load drains the battery."""
+    derived = derive(
+        {
+            "battery_voltage": 12.4,
+            "battery_current": 0,
+            "battery_percentage": 50,
+            "battery_capacity": 200,
+            "pv_power": 0,
+            "load_power": 50,
+            "load_current": 4,
+        }
+    )
+    assert derived["battery_power"] == pytest.approx(-49.6)
+    assert derived["charging_efficiency"] is None
+    assert derived["load_share"] is None
+    assert derived["time_to_full"] is None
+    assert derived["time_to_empty"] == pytest.approx(25)
+
+
+def test_missing_inputs_derive_nothing():
+    """Devices without the source readings get no derived keys."""
+    assert derive({"pv_power": 100}) == {}
+    assert "time_to_full" not in derive({"battery_voltage": 12, "battery_current": 1})
@@ -0,0 +1,55 @@
+"""Tests for local energy integration."""
+
+import pytest
+
+from custom_components.renogy.energy import (
+    ENERGY_SOURCES,
+    KEY_BATTERY_ENERGY,
+    EnergyIntegrator,
+)
+
+
+def test_trapezoidal_integration():
+    """Power ramps are integrated with the trapezoidal rule."""
+    integrator = EnergyIntegrator()
+    integrator.add_sample(0, 0.0, max_gap=180)
+    integrator.add_sample(100, 60.0, max_gap=180)
+    total = integrator.add_sample(100, 120.0, max_gap=180)
+    # 60 s ramp 0->100 W (50 W avg) plus 60 s at 100 W
+    assert total == pytest.approx((50 * 60 + 100 * 60) / 3600)
+
+
+def test_gaps_are_not_integrated():
+    """A sample after a long gap only starts a new segment."""
+    integrator = EnergyIntegrator()
+    integrator.add_sample(100, 0.0, max_gap=180)
+    assert integrator.add_sample(100, 600.0, max_gap=180) == 0
+    assert integrator.add_sample(100, 636.0, max_gap=180) == pytest.approx(1.0)
+
+
+def test_missing_power_resets_segment():
+    """A missing reading breaks the segment instead of bridging it."""
+    integrator = EnergyIntegrator()
+    integrator.add_sample(100, 0.0, max_gap=180)
+    integrator.add_sample(None, 60.0, max_gap=180)
+    assert integrator.add_sample(100, 120.0, max_gap=180) == 0
+
+
+def test_restore_applies_once():
+    """A restored total is carried over exactly once."""
+    integrator = EnergyIntegrator()
+    integrator.add_sample(36, 0.0, max_gap=180)
+    integrator.add_sample(36, 100.0, max_gap=180)
+    integrator.restore(500.0)
+    integrator.restore(500.0)
+    assert integrator.total == pytest.approx(501.0)
+
+
+def test_battery_power_source():
+    """Battery energy integrates the net power into the battery."""
+    power_fn = ENERGY_SOURCES[KEY_BATTERY_ENERGY]
+    assert power_fn({"battery_voltage": 12.5, "battery_current": 2.0}) == 25.0
+    assert power_fn(
+        {"battery_voltage": 12.5, "battery_current": 2.0, "load_current": 3.0}
+    ) == pytest.approx(-12.5)
+    assert power_fn({"battery_voltage": 12.5}) is None
@@ -0,0 +1,50 @@
+"""Tests for the state transition and fault events."""
+
+from custom_components.renogy.events import (
+    decode_faults,
+    detect_transitions,
+    event_type,
+    watched_states,
+)
+
+
+def test_decode_faults():
+    """Each set bit maps to its fault name."""
+    assert decode_faults(0) == []
+    assert decode_faults(0b101) == [
+        "battery_over_discharge",
+        "battery_under_voltage_warning",
+    ]
+    # Bit 15 is reserved
+    assert decode_faults(1 << 15) == []
+
+
+def test_first_snapshot_fires_nothing():
+    """Without a previous state there is nothing to compare against."""
+    states = watched_states({"charging_status": "mppt", "faults": ["load_overpower"]})
+    assert detect_transitions(None, states) == []
+
+
+def test_status_transitions():
+    """Charging and load status changes carry the old and new state."""
+    old = watched_states({"charging_status": "mppt", "load_status": "off"})
+    new = watched_states({"charging_status": "floating", "load_status": "off"})
+    assert detect_transitions(old, new) == [
+        ("charging_status_changed", {"old_state": "mppt", "new_state": "floating"})
+    ]
+    assert detect_transitions(new, new) == []
+
+
+def test_fault_edges():
+    """Faults fire once when raised and once when cleared."""
+    old = watched_states({"faults": ["load_overpower"]})
+    new = watched_states({"faults": ["battery_over_voltage"]})
+    assert detect_transitions(old, new) == [
+        ("fault_raised", {"fault": "battery_over_voltage"}),
+        ("fault_cleared", {"fault": "load_overpower"}),
+    ]
+
+
+def test_event_type():
+    """Events are namespaced by the integration domain."""
+    assert event_type("fault_raised") == "renogy_fault_raised"
@@ -0,0 +1,305 @@
+"""Tests for failover between the transports reaching one device."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from bluetooth_data_tools import monotonic_time_coarse
+
+from custom_components.renogy.ble_signal import KEY_BLE_SIGNAL_FAILURES
+from custom_components.renogy.ble_slots import KEY_BLE_SLOT_WAIT, async_get_ble_slots
+from custom_components.renogy.const import (
+    BLE_CONNECTIONS_PER_ADAPTER,
+    FAILOVER_BACKOFF_MIN,
+)
+from custom_components.renogy.failover import (
+    KEY_ACTIVE_TRANSPORT,
+    FailoverLink,
+    TransportHealth,
+)
+from custom_components.renogy.modbus import (
+    ModbusError,
+    ModbusExceptionResponse,
+    modbus_crc,
+)
+from custom_components.renogy.scheduler import Priority
+
+
+class Link:
+    """A transport answering with the register address, or failing on demand."""
+
+    def __init__(self, name, latency=0.0):
+        self.name = name
+        self.latency = latency
+        self.failing = False
+        self.refusing = False
+        self.reads = []
+        self.writes = []
+        self.closed = 0
+
+    async def async_read_registers(self, register, word_count, priority):
+        self.reads.append(register)
+        await asyncio.sleep(self.latency)
+        if self.refusing:
+            raise ModbusExceptionResponse("Device returned exception code 2")
+        if self.failing:
+            raise ModbusError(f"No response from device on {self.name}")
+        return [register] * word_count
+
+    async def async_write_register(self, register, value, priority):
+        if self.failing:
+            raise ModbusError(f"No response from device on {self.name}")
+        self.writes.append((register, value))
+
+    async def async_write_registers(self, register, values, priority):
+        self.writes.append((register, values))
+
+    async def async_close(self):
+        self.closed += 1
+
+
+def test_health_averages_recent_transactions():
+    """Failures lower the success rate and recoveries earn it back gradually."""
+    health = TransportHealth(alpha=0.5)
+    health.record_success(0.2)
+    health.record_success(0.4)
+    assert health.latency == pytest.approx(0.3)
+    assert health.score == pytest.approx(0.3)
+
+    health.record_failure(now=100.0)
+    assert health.success_rate == pytest.approx(0.5)
+    assert health.score == pytest.approx(0.6)
+    assert not health.ready(100.0 + FAILOVER_BACKOFF_MIN - 1)
+    assert health.ready(100.0 + FAILOVER_BACKOFF_MIN)
+
+    health.record_failure(now=200.0)
+    assert not health.ready(200.0 + FAILOVER_BACKOFF_MIN)
+    assert health.ready(200.0 + 2 * FAILOVER_BACKOFF_MIN)
+
+    health.record_success(0.3)
+    assert health.success_rate == pytest.approx(0.625)
+    assert health.ready(0.0)
+
+
+@pytest.mark.asyncio
+async def test_primary_is_preferred_while_healthy():
+    """Traffic stays on the primary unless another link is clearly better."""
+    wired, bluetooth = Link("serial"), Link("bluetooth")
+    link = FailoverLink([wired, bluetooth], primary_bias=2.0)
+    link.health[wired].record_success(0.3)
+    link.health[bluetooth].record_success(0.2)
+
+    assert await link.async_read_registers(0x100, 2, Priority.POLL) == [0x100] * 2
+    assert wired.reads == [0x100]
+    assert not bluetooth.reads
+    assert link.name == "serial"
+
+
+@pytest.mark.asyncio
+async def test_failed_block_is_read_over_the_next_link():
+    """A block whose transport fails mid-poll is still read, and traffic moves."""
+    wired, bluetooth = Link("serial"), Link("bluetooth")
+    link = FailoverLink([wired, bluetooth])
+    assert await link.async_read_registers(0x100, 1, Priority.POLL) == [0x100]
+
+    wired.failing = True
+    assert await link.async_read_registers(0x107, 1, Priority.POLL) == [0x107]
+    assert wired.reads == [0x100, 0x107]
+    assert bluetooth.reads == [0x107]
+    assert link.active is bluetooth
+    assert wired.closed == 1
+
+    # The failed primary is not tried first again while it backs off
+    assert await link.async_read_registers(0x120, 1, Priority.POLL) == [0x120]
+    assert wired.reads == [0x100, 0x107]
+
+
+@pytest.mark.asyncio
+async def test_fails_back_once_the_primary_recovers():
+    """After its backoff the primary is tried first, and takes over when it answers."""
+    wired, bluetooth = Link("serial"), Link("bluetooth", latency=0.02)
+    link = FailoverLink([wired, bluetooth])
+    wired.failing = True
+    await link.async_read_registers(0x100, 1, Priority.POLL)
+    assert link.active is bluetooth
+
+    wired.failing = False
+    link.health[wired].retry_at = 0.0
+    await link.async_read_registers(0x100, 1, Priority.POLL)
+    assert link.active is wired
+    assert bluetooth.reads == [0x100]
+    assert bluetooth.closed == 1
+
+
+@pytest.mark.asyncio
+async def test_backing_off_links_are_still_tried_last():
+    """A transaction is only refused once every link has failed it."""
+    wired, bluetooth = Link("serial"), Link("bluetooth")
+    link = FailoverLink([wired, bluetooth])
+    wired.failing = True
+    await link.async_read_registers(0x100, 1, Priority.POLL)
+
+    wired.failing = False
+    bluetooth.failing = True
+    assert await link.async_read_registers(0x100, 1, Priority.POLL) == [0x100]
+    assert link.active is wired
+
+    wired.failing = True
+    with pytest.raises(ModbusError):
+        await link.async_read_registers(0x100, 1, Priority.POLL)
+
+
+@pytest.mark.asyncio
+async def test_exception_responses_do_not_fail_over():
+    """A device refusing a request is not a transport failure."""
+    wired, bluetooth = Link("serial"), Link("bluetooth")
+    link = FailoverLink([wired, bluetooth])
+    wired.refusing = True
+    with pytest.raises(ModbusExceptionResponse):
+        await link.async_read_registers(0x100, 1, Priority.POLL)
+    assert link.active is wired
+    assert not bluetooth.reads
+    assert link.health[wired].success_rate == 1.0
+    assert link.health[wired].ready(0.0)
+
+
+@pytest.mark.asyncio
+async def test_writes_fail_over_too():
+    """Control writes reach the device over whichever link answers."""
+    wired, bluetooth = Link("serial"), Link("bluetooth")
+    link = FailoverLink([wired, bluetooth])
+    wired.failing = True
+    await link.async_write_register(0x10A, 1, Priority.CONTROL)
+    assert bluetooth.writes == [(0x10A, 1)]
+
+
+class Session:
+    """A BT module session answering reads with zeroed registers."""
+
+    def __init__(self, timeouts=0, keep_connected=True):
+        self.connected = False
+        self.lease = None
+        # Number of first requests that go unanswered
+        self.timeouts = timeouts
+        self.keep_connected = keep_connected
+
+    async def async_connect(self, _device, lease):
+        self.connected = True
+        self.lease = lease
+
+    async def async_request(self, frame):
+        if self.timeouts:
+            self.timeouts -= 1
+            raise TimeoutError("No response")
+        word_count = int.from_bytes(frame[4:6], "big")
+        response = bytes([frame[0], frame[1], 2 * word_count]) + bytes(2 * word_count)
+        return response + bytes(modbus_crc(response))
+
+    async def async_release(self):
+        if not self.keep_connected:
+            await self.async_disconnect()
+
+    async def async_disconnect(self):
+        self.connected = False
+        if self.lease is not None:
+            self.lease.release()
+            self.lease = None
+
+
+@pytest.mark.asyncio
+async def test_bluetooth_slot_wait_is_reported(
+    hass, make_coordinator, controller, monkeypatch
+):
+    """Polls over the BT module report how long connecting waited for a slot."""
+    ble = pytest.importorskip("custom_components.renogy.ble")
+    service_info = SimpleNamespace(
+        source="hci0", device=object(), rssi=-60, time=monotonic_time_coarse()
+    )
+    monkeypatch.setattr(
+        ble.bluetooth, "async_last_service_info", lambda *args, **kwargs: service_info
+    )
+    coordinator = make_coordinator(
+        bluetooth_address="AA:BB:CC:DD:EE:FF", refresh_freshness=0
+    )
+    coordinator._ble_link._session = Session()
+    slots = async_get_ble_slots(hass)
+    held = [
+        await slots.async_acquire("hci0", Priority.POLL)
+        for _ in range(BLE_CONNECTIONS_PER_ADAPTER)
+    ]
+    asyncio.get_running_loop().call_later(0.05, held[0].release)
+    # The gateway is gone, so the poll fails over to Bluetooth
+    controller.close()
+    try:
+        await coordinator.async_refresh()
+        assert coordinator.data[KEY_ACTIVE_TRANSPORT] == "bluetooth:AA:BB:CC:DD:EE:FF"
+        assert coordinator.data[KEY_BLE_SLOT_WAIT] >= 0.04
+
+        # The kept connection polls without waiting again
+        await coordinator.async_refresh()
+        assert coordinator.data[KEY_BLE_SLOT_WAIT] == 0.0
+    finally:
+        await coordinator.async_close()
+
+
+@pytest.mark.asyncio
+async def test_weak_signal_failures_are_counted(
+    hass, make_coordinator, controller, monkeypatch
+):
+    """Requests over the BT module that fail on a weak signal are reported."""
+    ble = pytest.importorskip("custom_components.renogy.ble")
+    service_info = SimpleNamespace(
+        source="hci0", device=object(), rssi=-90, time=monotonic_time_coarse()
+    )
+    monkeypatch.setattr(
+        ble.bluetooth, "async_last_service_info", lambda *args, **kwargs: service_info
+    )
+    coordinator = make_coordinator(
+        bluetooth_address="AA:BB:CC:DD:EE:FF", refresh_freshness=0
+    )
+    coordinator._ble_link._session = Session(timeouts=1)
+    controller.close()
+    try:
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+
+        await coordinator.async_refresh()
+        assert coordinator.data[KEY_BLE_SIGNAL_FAILURES] == 1
+
+        # Failures on a strong signal are the device's, not the signal's
+        service_info.rssi = -60
+        coordinator._ble_link._session.timeouts = 1
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+        assert coordinator.data[KEY_BLE_SIGNAL_FAILURES] == 1
+    finally:
+        await coordinator.async_close()
+
+
+@pytest.mark.asyncio
+async def test_bluetooth_connection_is_released_unless_kept(
+    hass, make_coordinator, controller, monkeypatch
+):
+    """Without keep-connected, polls over the BT module reconnect every time."""
+    ble = pytest.importorskip("custom_components.renogy.ble")
+    service_info = SimpleNamespace(
+        source="hci0", device=object(), rssi=-60, time=monotonic_time_coarse()
+    )
+    monkeypatch.setattr(
+        ble.bluetooth, "async_last_service_info", lambda *args, **kwargs: service_info
+    )
+    coordinator = make_coordinator(
+        bluetooth_address="AA:BB:CC:DD:EE:FF",
+        bluetooth_keep_connected=False,
+        refresh_freshness=0,
+    )
+    assert not coordinator._ble_link._session.keep_connected
+    session = coordinator._ble_link._session = Session(keep_connected=False)
+    controller.close()
+    try:
+        await coordinator.async_refresh()
+        assert coordinator.data[KEY_ACTIVE_TRANSPORT] == "bluetooth:AA:BB:CC:DD:EE:FF"
+        assert not session.connected
+        assert session.lease is None
+    finally:
+        await coordinator.async_close()
@@ -0,0 +1,111 @@
+"""Tests for decoding the controller daily history."""
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.renogy import history
+from custom_components.renogy.history import (
+    HISTORY_START_REGISTER,
+    OPERATING_DAYS_REGISTER,
+    async_import_history,
+    day_start,
+    decode_history,
+    history_reads,
+    statistic_id,
+)
+
+
+def test_history_reads_are_coalesced():
+    """History is read in as few requests as the Modbus limit allows."""
+    assert history_reads(30) == [
+        (HISTORY_START_REGISTER, 120),
+        (HISTORY_START_REGISTER + 120, 120),
+        (HISTORY_START_REGISTER + 240, 60),
+    ]
+    assert history_reads(1) == [(HISTORY_START_REGISTER, 10)]
+
+
+def test_decode_history_records():
+    """Each 10-word record is decoded and scaled."""
+    today = [126, 144, 520, 310, 410, 95, 35, 12, 420, 150]
+    yesterday = [124, 143, 0, 0, 0, 0, 0, 0, 380, 90]
+    records = decode_history(today + yesterday + [1, 2, 3])
+    assert len(records) == 2
+    assert records[0]["battery_min_voltage"] == pytest.approx(12.6)
+    assert records[0]["max_charging_current"] == pytest.approx(5.2)
+    assert records[0]["power_generation"] == 420
+    assert records[1]["power_consumption"] == 90
+
+
+def test_statistic_id():
+    """Statistic IDs are valid external statistic IDs."""
+    assert statistic_id("/dev/ttyUSB0", "power_generation") == (
+        "renogy:dev_ttyusb0_power_generation"
+    )
+
+
+class HistoryController:
+    """A controller with four days of history, today's record first."""
+
+    address = "/dev/ttyUSB0"
+    device = SimpleNamespace(name="Rover")
+
+    async def async_read_registers(self, register, word_count, priority=None):
+        if register == OPERATING_DAYS_REGISTER:
+            return [4]
+        records = []
+        for age in range(4):
+            record = [0] * 10
+            record[4] = 10 * (age + 1)  # max charging power
+            record[8] = 100 * (age + 1)  # power generation
+            records.extend(record)
+        start = register - HISTORY_START_REGISTER
+        return records[start : start + word_count]
+
+
+@pytest.mark.asyncio
+async def test_import_only_adds_new_completed_days(monkeypatch):
+    """Days up to the last imported one and the current day are skipped."""
+    today = dt_util.now().date()
+    generation = statistic_id("/dev/ttyUSB0", "power_generation")
+    # Generation was imported up to two days ago
+    last = {
+        generation: [
+            {"start": day_start(today - timedelta(days=2)).timestamp(), "sum": 1000.0}
+        ]
+    }
+    added = {}
+
+    async def async_add_executor_job(target, *args):
+        return target(*args)
+
+    monkeypatch.setattr(
+        history,
+        "get_instance",
+        lambda hass: SimpleNamespace(async_add_executor_job=async_add_executor_job),
+    )
+    monkeypatch.setattr(
+        history,
+        "get_last_statistics",
+        lambda hass, count, stat_id, convert, types: (
+            {stat_id: last[stat_id]} if stat_id in last else {}
+        ),
+    )
+    monkeypatch.setattr(
+        history,
+        "async_add_external_statistics",
+        lambda hass, metadata, rows: added.update({metadata["statistic_id"]: rows}),
+    )
+
+    assert await async_import_history(None, HistoryController(), days=30) == 3
+
+    yesterday = day_start(today - timedelta(days=1))
+    assert added[generation] == [{"start": yesterday, "state": 200, "sum": 1200.0}]
+    power = added[statistic_id("/dev/ttyUSB0", "max_charging_power")]
+    assert [row["start"] for row in power] == [
+        day_start(today - timedelta(days=age)) for age in (3, 2, 1)
+    ]
+    assert [row["max"] for row in power] == [40, 30, 20]
@@ -0,0 +1,308 @@
+"""Tests for Modbus framing and the native transports."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from custom_components.renogy import transport as transports
+from custom_components.renogy.const import TRANSPORT_SERIAL
+from custom_components.renogy.modbus import (
+    MBAP_HEADER,
+    ModbusError,
+    RtuFrameReassembler,
+    build_read_request,
+    build_tcp_frame,
+    build_write_registers_request,
+    check_crc,
+    frame_silence,
+    modbus_crc,
+)
+from custom_components.renogy.transport import (
+    ModbusTcpTransport,
+    PymodbusSerialTransport,
+    RtuOverTcpTransport,
+    RtuSerialTransport,
+    create_transport,
+)
+
+
+def _with_crc(frame: bytes) -> bytes:
+    return frame + bytes(modbus_crc(frame))
+
+
+def test_read_request_frame():
+    """Request frames match the reference CRC."""
+    assert build_read_request(0x01, 0x0000, 10) == bytes.fromhex("01030000000ac5cd")
+    assert check_crc(build_read_request(0xFF, 0x0100, 34))
+
+
+def test_write_registers_frame():
+    """Multiple register writes carry the byte count and values."""
+    frame = build_write_registers_request(0xFF, 0xE004, [5, 144])
+    assert frame[:9] == bytes.fromhex("ff10e00400020400") + b"\x05"
+    assert check_crc(frame)
+
+
+def test_frame_silence():
+    """The inter-frame silence is 3.5 characters, fixed above 19200 baud."""
+    assert frame_silence(9600) == pytest.approx(0.00401, abs=1e-5)
+    assert frame_silence(115200) == pytest.approx(0.00175)
+
+
+class FakeDevice(threading.Thread):
+    """Answer requests on the master side of a pseudo terminal."""
+
+    def __init__(self, master: int, responses):
+        super().__init__(daemon=True)
+        self.master = master
+        self.responses = list(responses)
+        self.requests = []
+
+    def run(self):
+        while self.responses:
+            self.requests.append(os.read(self.master, 256))
+            os.write(self.master, self.responses.pop(0))
+
+
+@pytest.fixture
+def pty():
+    master, slave = os.openpty()
+    yield master, os.ttyname(slave)
+    os.close(slave)
+    os.close(master)
+
+
+@pytest.mark.asyncio
+async def test_transport_reads_registers(pty):
+    """A read returns the decoded registers of a valid response."""
+    master, port = pty
+    device = FakeDevice(master, [_with_crc(bytes.fromhex("ff0304007b01c8"))])
+    device.start()
+    transport = RtuSerialTransport(port)
+    try:
+        assert await transport.async_read_registers(0xFF, 0x0100, 2) == [123, 456]
+    finally:
+        transport.close()
+    assert device.requests == [build_read_request(0xFF, 0x0100, 2)]
+
+
+@pytest.mark.asyncio
+async def test_pymodbus_fallback_without_native_rtu(pty, monkeypatch):
+    """Serial ports fall back to pymodbus when the native transport can't load."""
+    master, port = pty
+    assert isinstance(create_transport(TRANSPORT_SERIAL, port), RtuSerialTransport)
+
+    monkeypatch.setattr(transports, "NATIVE_RTU_AVAILABLE", False)
+    transport = create_transport(TRANSPORT_SERIAL, port)
+    assert isinstance(transport, PymodbusSerialTransport)
+    device = FakeDevice(master, [_with_crc(bytes.fromhex("ff0304007b01c8"))])
+    device.start()
+    try:
+        assert await transport.async_read_registers(0xFF, 0x0100, 2) == [123, 456]
+    finally:
+        transport.close()
+    assert device.requests == [build_read_request(0xFF, 0x0100, 2)]
+
+
+@pytest.mark.asyncio
+async def test_transport_rejects_bad_crc_and_exceptions(pty):
+    """Corrupted frames and exception responses raise ModbusError."""
+    master, port = pty
+    device = FakeDevice(
+        master,
+        [
+            bytes.fromhex("ff0304007b01c80000"),
+            _with_crc(bytes.fromhex("ff8302")),
+        ],
+    )
+    device.start()
+    transport = RtuSerialTransport(port)
+    try:
+        with pytest.raises(ModbusError, match="CRC"):
+            await transport.async_read_registers(0xFF, 0x0100, 2)
+        with pytest.raises(ModbusError, match="exception code 2"):
+            await transport.async_read_registers(0xFF, 0x0100, 2)
+    finally:
+        transport.close()
+
+
+@pytest.mark.asyncio
+async def test_transport_times_out(pty):
+    """A silent device raises ModbusError after the timeout."""
+    _, port = pty
+    transport = RtuSerialTransport(port, timeout=0.1)
+    try:
+        with pytest.raises(ModbusError, match="No response"):
+            await transport.async_read_registers(0xFF, 0x0100, 2)
+    finally:
+        transport.close()
+
+
+async def _start_gateway(handler):
+    """Start a loopback stand-in for a TCP gateway."""
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_rtu_over_tcp_reconnects():
+    """Raw RTU frames are tunnelled, and a dropped connection is reopened."""
+    connections = []
+
+    async def handler(reader, writer):
+        connections.append(writer)
+        request = await reader.readexactly(8)
+        assert request == build_read_request(0x01, 0x0100, 2)
+        writer.write(_with_crc(bytes.fromhex("0103040001" "0002")))
+        await writer.drain()
+        # Gateways drop idle connections; the transport must reconnect
+        writer.close()
+
+    server, port = await _start_gateway(handler)
+    transport = RtuOverTcpTransport("127.0.0.1", port)
+    try:
+        assert await transport.async_read_registers(0x01, 0x0100, 2) == [1, 2]
+        await asyncio.sleep(0.05)
+        assert await transport.async_read_registers(0x01, 0x0100, 2) == [1, 2]
+    finally:
+        transport.close()
+        server.close()
+    assert len(connections) == 2
+
+
+@pytest.mark.asyncio
+async def test_modbus_tcp_transport():
+    """Modbus TCP requests carry an MBAP header and share one connection."""
+    requests = []
+
+    async def handler(reader, writer):
+        while header := await reader.read(MBAP_HEADER.size):
+            transaction_id, _, length, unit_id = MBAP_HEADER.unpack(header)
+            pdu = await reader.readexactly(length - 1)
+            requests.append((unit_id, pdu))
+            if pdu[0] == 0x03:
+                response = bytes.fromhex("0304007b01c8")
+            else:
+                response = bytes([pdu[0] | 0x80, 0x02])
+            writer.write(build_tcp_frame(transaction_id, unit_id, response))
+            await writer.drain()
+
+    server, port = await _start_gateway(handler)
+    transport = ModbusTcpTransport("127.0.0.1", port)
+    try:
+        assert await transport.async_read_registers(0x02, 0x0100, 2) == [123, 456]
+        with pytest.raises(ModbusError, match="exception code 2"):
+            await transport.async_write_register(0x03, 0x010A, 1)
+    finally:
+        transport.close()
+        server.close()
+    assert requests == [
+        (0x02, bytes.fromhex("0301000002")),
+        (0x03, bytes.fromhex("06010a0001")),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("protocol_id", "length", "unit_id", "message"),
+    [
+        (0, 0, 0x02, "Invalid MBAP header"),
+        (0, 1, 0x02, "Invalid MBAP header"),
+        (0, 300, 0x02, "Invalid MBAP header"),
+        (1, 7, 0x02, "Invalid MBAP header"),
+        (0, 7, 0x05, "unexpected device 5"),
+    ],
+)
+async def test_modbus_tcp_rejects_malformed_responses(
+    protocol_id, length, unit_id, message
+):
+    """A malformed MBAP response raises ModbusError and drops the connection."""
+    connections = []
+
+    async def handler(reader, writer):
+        connections.append(writer)
+        header = await reader.readexactly(MBAP_HEADER.size)
+        transaction_id, _, request_length, _ = MBAP_HEADER.unpack(header)
+        await reader.readexactly(request_length - 1)
+        writer.write(
+            MBAP_HEADER.pack(transaction_id, protocol_id, length, unit_id)
+            + bytes.fromhex("0304007b01c8")
+        )
+        await writer.drain()
+        await reader.read()
+
+    server, port = await _start_gateway(handler)
+    transport = ModbusTcpTransport("127.0.0.1", port)
+    try:
+        with pytest.raises(ModbusError, match=message):
+            await transport.async_read_registers(0x02, 0x0100, 2)
+        assert transport._writer is None
+    finally:
+        transport.close()
+        server.close()
+    assert len(connections) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("pdu", "message"),
+    [
+        ("0304007b", "4 bytes, expected 6"),
+        ("0304007b01c800", "7 bytes, expected 6"),
+        ("83", "1 bytes, expected 2"),
+        ("830200", "3 bytes, expected 2"),
+    ],
+)
+async def test_modbus_tcp_checks_the_response_length(pdu, message):
+    """A response PDU of the wrong length for its request raises ModbusError."""
+
+    async def handler(reader, writer):
+        header = await reader.readexactly(MBAP_HEADER.size)
+        transaction_id, _, request_length, unit_id = MBAP_HEADER.unpack(header)
+        await reader.readexactly(request_length - 1)
+        response = bytes.fromhex(pdu)
+        writer.write(
+            MBAP_HEADER.pack(transaction_id, 0, len(response) + 1, unit_id) + response
+        )
+        await writer.drain()
+        await reader.read()
+
+    server, port = await _start_gateway(handler)
+    transport = ModbusTcpTransport("127.0.0.1", port)
+    try:
+        with pytest.raises(ModbusError, match=message):
+            await transport.async_read_registers(0x02, 0x0100, 2)
+        assert transport._writer is None
+    finally:
+        transport.close()
+        server.close()
+
+
+def test_reassembler_split_and_concatenated():
+    """Frames split across chunks or sharing one are both recovered."""
+    first = _with_crc(bytes.fromhex("0103040001" "0002"))
+    second = _with_crc(bytes.fromhex("0106010a0001"))
+    reassembler = RtuFrameReassembler()
+    assert reassembler.feed(first[:3]) == []
+    assert reassembler.feed(first[3:] + second[:2]) == [first]
+    assert reassembler.pending == 2
+    assert reassembler.feed(second[2:]) == [second]
+    assert reassembler.pending == 0
+
+
+def test_reassembler_resyncs_after_garbage():
+    """Noise and corrupted frames are skipped until a valid frame starts."""
+    frame = _with_crc(bytes.fromhex("0103020007"))
+    corrupted = bytearray(frame)
+    corrupted[3] ^= 0xFF
+    reassembler = RtuFrameReassembler()
+    assert reassembler.feed(b"\x00\x55" + bytes(corrupted) + frame) == [frame]
+    assert reassembler.pending == 0
+
+
+def test_exception_response_is_framed():
+    """Exception responses are five bytes whatever function they answer."""
+    frame = _with_crc(bytes.fromhex("018302"))
+    assert RtuFrameReassembler().feed(frame) == [frame]
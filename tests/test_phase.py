@@ -0,0 +1,66 @@
+"""Tests for phase-aligned poll scheduling."""
+
+import asyncio
+
+import pytest
+
+from custom_components.renogy.phase import POLL_SLOT_SECONDS, PhasePlanner, next_refresh
+
+
+def test_next_refresh_lands_on_phase():
+    """Refreshes fall on the phase, at least half an interval ahead."""
+    assert next_refresh(100.0, 60, 15) == 135
+    assert next_refresh(130.0, 60, 15) == 195
+    assert next_refresh(135.0, 60, 15) == 195
+
+
+def test_buses_spread_and_devices_packed():
+    """Buses are spread over the interval; devices on one bus go back-to-back."""
+    planner = PhasePlanner()
+    planner.async_register("/dev/ttyUSB0", "/dev/ttyUSB0", lambda: None)
+    planner.async_register("/dev/ttyUSB1", "/dev/ttyUSB1", lambda: None)
+    planner.async_register("gw:502/1", "tcp://gw:502", lambda: None)
+    planner.async_register("gw:502/2", "tcp://gw:502", lambda: None)
+
+    offsets = {
+        member: planner.offset(member, 60)
+        for member in ("/dev/ttyUSB0", "/dev/ttyUSB1", "gw:502/1", "gw:502/2")
+    }
+    assert offsets == {
+        "/dev/ttyUSB0": 0,
+        "/dev/ttyUSB1": 20,
+        "gw:502/1": 40,
+        "gw:502/2": 40 + POLL_SLOT_SECONDS,
+    }
+
+
+def test_phases_rebalance_on_removal():
+    """Removing a device moves the others and notifies them."""
+    planner = PhasePlanner()
+    moved = []
+    unregister = planner.async_register("a", "a", lambda: moved.append("a"))
+    planner.async_register("b", "b", lambda: moved.append("b"))
+    assert planner.offset("b", 60) == 30
+
+    moved.clear()
+    unregister()
+    assert moved == ["b"]
+    assert planner.offset("b", 60) == pytest.approx(0)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_polls_on_its_phase(make_coordinator, controller):
+    """Polls follow the scan interval until the coordinator shuts down."""
+    coordinator = make_coordinator()
+    coordinator.async_set_polling(0.1, None, refresh_freshness=0)
+    coordinator.async_start_polling()
+    try:
+        await asyncio.sleep(0.35)
+        polls = controller.reads.count(0x0100)
+        assert 2 <= polls <= 4
+        assert coordinator.data["pv_power"] == 9
+    finally:
+        await coordinator.async_close()
+    assert coordinator._unsub_poll is None
+    await asyncio.sleep(0.2)
+    assert controller.reads.count(0x0100) == polls
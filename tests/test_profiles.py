@@ -0,0 +1,110 @@
+"""Tests for writing charge profiles."""
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.renogy.profiles import (
+    CHARGE_PROFILES,
+    CHARGE_SETTINGS_REGISTER,
+    CHARGE_SETTINGS_WORDS,
+    async_apply_profile,
+    encode_profile,
+    plan_writes,
+)
+
+BASE = CHARGE_SETTINGS_REGISTER
+
+
+class FakeController:
+    """Charge settings block that can reject or ignore writes."""
+
+    def __init__(self, fail_at=(), ignore=()):
+        self.address = "/dev/ttyUSB0"
+        self.registers = [0] * CHARGE_SETTINGS_WORDS
+        self.writes = []
+        # Start registers whose next write fails, once per listing
+        self.fail_at = list(fail_at)
+        self.failed = 0
+        self.ignore = set(ignore)
+
+    async def async_read_registers(self, register, word_count, priority=None):
+        start = register - BASE
+        return list(self.registers[start : start + word_count])
+
+    async def async_write_registers(self, register, values, priority=None):
+        if register in self.fail_at:
+            self.fail_at.remove(register)
+            self.failed += 1
+            raise OSError(f"no response to write {self.failed}")
+        self.writes.append((register, list(values)))
+        for offset, value in enumerate(values):
+            if register + offset not in self.ignore:
+                self.registers[register - BASE + offset] = value
+
+
+def test_encode_profile_scales_values():
+    """Voltages are written in units of 0.1 V."""
+    encoded = encode_profile({"battery_type": 5, "boost_charging_voltage": 14.4})
+    assert encoded == {0xE004: 5, 0xE008: 144}
+
+
+def test_plan_writes_only_changed_registers():
+    """Nothing is written when the device already holds the profile."""
+    current = [0] * CHARGE_SETTINGS_WORDS
+    current[0xE004 - BASE] = 2
+    assert plan_writes(current, {0xE004: 2}) == []
+    assert plan_writes(current, {0xE004: 4}) == [(0xE004, [4])]
+
+
+def test_plan_writes_coalesces_runs():
+    """Changes are bridged into one write but never span read-only registers."""
+    current = list(range(CHARGE_SETTINGS_WORDS))
+    desired = {0xE005: 150, 0xE008: 144, 0xE00E: 106, 0xE010: 5}
+    assert plan_writes(current, desired) == [
+        (0xE005, [150, 4, 5, 144, 7, 8, 9, 10, 11, 106]),
+        (0xE010, [5]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_apply_profile_verifies_readback():
+    """A profile is written and read back."""
+    controller = FakeController()
+    changed = await async_apply_profile(controller, CHARGE_PROFILES["lifepo4_12v"])
+    assert "battery_type" in changed
+    assert controller.registers[0xE008 - BASE] == 144
+    # One write per run of writable registers that changed
+    assert [register for register, _ in controller.writes] == [0xE004, 0xE010]
+
+    controller.writes.clear()
+    assert await async_apply_profile(controller, CHARGE_PROFILES["lifepo4_12v"]) == []
+    assert controller.writes == []
+
+
+@pytest.mark.asyncio
+async def test_apply_profile_reports_rejected_settings():
+    """Settings the controller did not store are reported."""
+    controller = FakeController(ignore={0xE009})
+    with pytest.raises(HomeAssistantError, match="floating_charging_voltage"):
+        await async_apply_profile(controller, CHARGE_PROFILES["lifepo4_12v"])
+
+
+@pytest.mark.asyncio
+async def test_apply_profile_rolls_back_on_failure():
+    """Registers written before a failed write are restored."""
+    controller = FakeController(fail_at=[0xE010])
+    with pytest.raises(OSError):
+        await async_apply_profile(controller, CHARGE_PROFILES["lifepo4_12v"])
+    assert controller.registers == [0] * CHARGE_SETTINGS_WORDS
+    # The failed write is restored too, in case the controller applied it
+    assert [register for register, _ in controller.writes] == [0xE004, 0xE010, 0xE004]
+
+
+@pytest.mark.asyncio
+async def test_apply_profile_rollback_survives_failed_restores():
+    """A failed restore does not stop the others or hide the original error."""
+    controller = FakeController(fail_at=[0xE010, 0xE010])
+    with pytest.raises(OSError, match="write 1"):
+        await async_apply_profile(controller, CHARGE_PROFILES["lifepo4_12v"])
+    assert controller.failed == 2
+    assert controller.registers[0xE004 - BASE] == 0
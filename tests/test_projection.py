@@ -0,0 +1,57 @@
+"""Tests for the precompiled sensor value projection."""
+
+import pytest
+
+from custom_components.renogy.sensor import ALL_SENSORS, SensorProjection
+
+
+@pytest.fixture
+def projection():
+    """Create a projection compiled from every sensor description."""
+    return SensorProjection(ALL_SENSORS)
+
+
+def test_projection_covers_all_sensors(projection):
+    """Every description gets a slot, even when the snapshot lacks the key."""
+    values = projection({})
+    assert set(values) == {description.key for description in ALL_SENSORS}
+    assert all(value is None for value in values.values())
+
+
+def test_projection_converts_values(projection):
+    """Numeric values are coerced and unit conversions are applied."""
+    values = projection(
+        {
+            "battery_voltage": "12.6",
+            "pv_power": 51,
+            "power_generation_total": 1250,
+            "charging_status": "mppt",
+            "model": "RNG-CTRL-RVR40",
+        }
+    )
+    assert values["battery_voltage"] == 12.6
+    assert values["pv_power"] == 51.0
+    assert values["power_generation_total"] == 1.25
+    assert values["charging_status"] == "mppt"
+    assert values["model"] == "RNG-CTRL-RVR40"
+
+
+def test_projection_rejects_invalid_values(projection):
+    """Unparseable or out-of-range numeric values project to None."""
+    values = projection({"battery_voltage": "invalid", "pv_power": 65535 * 10})
+    assert values["battery_voltage"] is None
+    assert values["pv_power"] is None
+
+
+def test_projection_accepts_large_signed_power(projection):
+    """Net battery power may be as negative as it can be positive."""
+    values = projection(
+        {
+            "battery_power": -2400.0,
+            "battery_power_min_1h": -2400.0,
+            "pv_power": -2400,
+        }
+    )
+    assert values["battery_power"] == -2400.0
+    assert values["battery_power_min_1h"] == -2400.0
+    assert values["pv_power"] is None
@@ -0,0 +1,130 @@
+"""Tests for targeted refreshes of register blocks."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.renogy.const import DOMAIN
+from custom_components.renogy.services import _async_refresh
+
+PV = 0x0100
+BATTERY = 0xE004
+
+
+@pytest.mark.asyncio
+async def test_blocks_for_keys_and_block_names(make_coordinator):
+    """Keys map to the blocks decoding them; unknown names raise KeyError."""
+    coordinator = make_coordinator()
+    await coordinator.async_refresh()
+    try:
+        assert coordinator.blocks_for(["battery_voltage"]) == ["pv"]
+        assert coordinator.blocks_for(["battery_type", "device_id"]) == [
+            "device_id",
+            "battery",
+        ]
+        assert coordinator.blocks_for(["pv", "pv_power"]) == ["pv"]
+        # Derived values depend on more than one block
+        assert coordinator.blocks_for(["battery_power"]) == [
+            "device_info",
+            "device_id",
+            "battery",
+            "pv",
+        ]
+        with pytest.raises(KeyError):
+            coordinator.blocks_for(["no_such_key"])
+    finally:
+        await coordinator.async_close()
+
+
+@pytest.mark.asyncio
+async def test_max_age_skips_recent_blocks(make_coordinator, controller):
+    """Blocks read more recently than max_age are not read again."""
+    coordinator = make_coordinator()
+    await coordinator.async_refresh()
+    try:
+        controller.reads.clear()
+        assert await coordinator.async_refresh_blocks(["pv", "battery"], 60) == []
+        assert controller.reads == []
+
+        coordinator.block_read_at["battery"] -= 120
+        assert await coordinator.async_refresh_blocks(["pv", "battery"], 60) == [
+            "battery"
+        ]
+        assert await coordinator.async_refresh_blocks(["pv"], 0) == ["pv"]
+        assert controller.reads == [BATTERY, PV]
+        # Only the regular poll samples the rolling statistics
+        assert coordinator.rolling.windows["pv_power"].count == 1
+    finally:
+        await coordinator.async_close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_merges_into_the_latest_poll(make_coordinator, controller):
+    """A refresh during a poll keeps the blocks the poll read and it did not."""
+    coordinator = make_coordinator(refresh_freshness=0)
+    await coordinator.async_refresh()
+    try:
+        controller.registers[0xE004] = 1
+        controller.registers[0x0101] = 135
+        controller.delays[PV] = 0.05
+        controller.reads.clear()
+        poll = asyncio.ensure_future(coordinator.async_refresh())
+        while PV not in controller.reads:
+            await asyncio.sleep(0.001)
+        # Requested while the poll's last block is on the wire
+        assert await coordinator.async_refresh_blocks(["battery"]) == ["battery"]
+        await poll
+        # The poll's pv block survives the refresh that ran after it
+        assert coordinator.data["battery_voltage"] == 13.5
+        assert coordinator.data["battery_type"] == "open"
+    finally:
+        await coordinator.async_close()
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_marks_the_device(make_coordinator, controller):
+    """A refresh the device refuses counts against its availability."""
+    coordinator = make_coordinator()
+    await coordinator.async_refresh()
+    try:
+        controller.refused.add(PV)
+        with pytest.raises(Exception, match="Error communicating"):
+            await coordinator.async_refresh_blocks(["pv"])
+        assert coordinator.device.failure_count == 1
+    finally:
+        await coordinator.async_close()
+
+    with pytest.raises(Exception, match="shutting down"):
+        await coordinator.async_refresh_blocks(["pv"])
+
+
+@pytest.mark.asyncio
+async def test_refresh_service_response(hass, make_coordinator):
+    """The service returns what it read and the values asked for."""
+    coordinator = make_coordinator()
+    await coordinator.async_refresh()
+    entry = SimpleNamespace(
+        entry_id="abc", domain=DOMAIN, title="Rover", state=ConfigEntryState.LOADED
+    )
+    hass.config_entries = SimpleNamespace(async_get_entry={"abc": entry}.get)
+    hass.data[DOMAIN] = {"abc": coordinator}
+
+    def call(**data):
+        return SimpleNamespace(
+            hass=hass, data={"config_entry_id": "abc", "max_age": 0, **data}
+        )
+
+    try:
+        response = await _async_refresh(call(keys=["battery_voltage"]))
+        assert response == {"refreshed": ["pv"], "values": {"battery_voltage": 0.1}}
+
+        response = await _async_refresh(call(keys=["battery"], max_age=60))
+        assert response == {"refreshed": [], "values": {"battery_type": "lithium"}}
+
+        with pytest.raises(ServiceValidationError):
+            await _async_refresh(call(keys=["no_such_key"]))
+    finally:
+        await coordinator.async_close()
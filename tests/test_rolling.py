@@ -0,0 +1,91 @@
+"""Tests for the rolling statistics of a device's values."""
+
+import random
+import statistics
+
+import pytest
+
+from custom_components.renogy.rolling import RollingStatistics, RollingWindow
+
+
+def test_statistics_of_the_window():
+    """The statistics cover exactly the samples still inside the window."""
+    window = RollingWindow(window=10.0, capacity=16)
+    assert window.stats() == {"min": None, "max": None, "mean": None, "stddev": None}
+
+    for timestamp, value in ((0, 4.0), (2, 1.0), (4, 3.0), (6, 2.0)):
+        window.add(float(timestamp), value)
+    assert window.stats() == {
+        "min": 1.0,
+        "max": 4.0,
+        "mean": 2.5,
+        "stddev": pytest.approx(statistics.pstdev([4, 1, 3, 2]), abs=1e-3),
+    }
+
+    # The sample at 0 and then the one at 2 leave the window
+    window.add(11.0, 2.0)
+    assert window.count == 4
+    assert window.stats()["max"] == 3.0
+    window.expire(12.0)
+    assert window.stats()["min"] == 2.0
+    assert window.stats()["mean"] == pytest.approx(7 / 3, abs=1e-3)
+
+
+def test_full_ring_drops_the_oldest_samples():
+    """A window with more samples than its capacity keeps the most recent ones."""
+    window = RollingWindow(window=1000.0, capacity=4)
+    for timestamp, value in enumerate((9.0, 1.0, 5.0, 6.0, 7.0, 8.0)):
+        window.add(float(timestamp), value)
+    assert window.count == 4
+    assert window.stats()["min"] == 5.0
+    assert window.stats()["max"] == 8.0
+    assert window.stats()["mean"] == 6.5
+
+
+def test_matches_a_full_recomputation():
+    """The incremental aggregates agree with recomputing over the window."""
+    rng = random.Random(4)
+    window = RollingWindow(window=60.0, capacity=8)
+    samples = []
+    for timestamp in range(200):
+        value = rng.uniform(1000, 1001)
+        window.add(float(timestamp), value)
+        samples.append((timestamp, value))
+        held = [value for sample, value in samples if sample > timestamp - 60][-8:]
+        stats = window.stats()
+        assert stats["min"] == min(held)
+        assert stats["max"] == max(held)
+        assert stats["mean"] == pytest.approx(statistics.fmean(held), abs=1e-3)
+        assert stats["stddev"] == pytest.approx(statistics.pstdev(held), abs=1e-3)
+
+
+def test_snapshot_statistics_follow_reported_values():
+    """Statistics are returned for the values a snapshot reports, missing ones expiring."""
+    rolling = RollingStatistics(keys=("pv_power", "load_power"), window=10.0)
+    assert rolling.add(0.0, {"pv_power": 100, "battery_voltage": 13.1}) == {
+        "pv_power_min_1h": 100.0,
+        "pv_power_max_1h": 100.0,
+        "pv_power_mean_1h": 100.0,
+        "pv_power_stddev_1h": 0.0,
+    }
+
+    stats = rolling.add(5.0, {"pv_power": 300})
+    assert stats["pv_power_mean_1h"] == 200.0
+    assert stats["pv_power_stddev_1h"] == 100.0
+
+    stats = rolling.add(12.0, {"pv_power": None})
+    assert stats["pv_power_min_1h"] == stats["pv_power_max_1h"] == 300.0
+    assert rolling.add(20.0, {"pv_power": None})["pv_power_mean_1h"] is None
+
+
+def test_fast_snapshots_are_thinned_to_cover_the_window():
+    """Snapshots faster than the spacing cannot push samples out of a full ring."""
+    rolling = RollingStatistics(
+        keys=("pv_power",), window=60.0, capacity=12, spacing=5.0
+    )
+    for timestamp in range(60):
+        stats = rolling.add(float(timestamp), {"pv_power": timestamp})
+    assert rolling.windows["pv_power"].count == 12
+    # The oldest sample is still held, as the window has not passed it yet
+    assert stats["pv_power_min_1h"] == 0.0
+    assert stats["pv_power_max_1h"] == 55.0
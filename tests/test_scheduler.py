@@ -0,0 +1,84 @@
+"""Tests for the bus transaction scheduler."""
+
+import asyncio
+
+import pytest
+
+from custom_components.renogy.scheduler import Priority, TransactionScheduler
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_transactions_go_first():
+    """Waiting transactions are served by priority, then arrival order."""
+    scheduler = TransactionScheduler()
+    order = []
+    release = asyncio.Event()
+
+    async def run(name, priority, hold=None):
+        async with scheduler.transaction(priority):
+            order.append(name)
+            if hold:
+                await hold.wait()
+
+    poll = asyncio.create_task(run("poll-1", Priority.POLL, release))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.create_task(run("backfill", Priority.BACKGROUND)),
+        asyncio.create_task(run("poll-2", Priority.POLL)),
+        asyncio.create_task(run("refresh", Priority.ON_DEMAND)),
+        asyncio.create_task(run("load-off", Priority.CONTROL)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.depth == 4
+
+    release.set()
+    await asyncio.gather(poll, *waiters)
+    assert order == ["poll-1", "load-off", "refresh", "poll-2", "backfill"]
+    assert scheduler.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_block_the_bus():
+    """A waiter cancelled while queued is skipped."""
+    scheduler = TransactionScheduler()
+    release = asyncio.Event()
+
+    async def hold():
+        async with scheduler.transaction(Priority.POLL):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    await holder
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    async with scheduler.transaction(Priority.POLL):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_capacity_bounds_concurrent_transactions():
+    """A scheduler with capacity runs that many transactions at once."""
+    scheduler = TransactionScheduler(capacity=2)
+    release = asyncio.Event()
+    peak = 0
+
+    async def run():
+        nonlocal peak
+        async with scheduler.transaction(Priority.POLL):
+            peak = max(peak, scheduler.active)
+            await release.wait()
+
+    tasks = [asyncio.create_task(run()) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert scheduler.active == 2
+    assert scheduler.depth == 3
+    release.set()
+    await asyncio.gather(*tasks)
+    assert peak == 2
+    assert scheduler.active == 0
@@ -193,3 +193,18 @@ def test_load_status_mapping(mock_sensor_data):
         # In the actual code, this would use the mapping functions
         # We're just testing that the codes are recognized
         assert code in range(2)
+
+
+def test_entities_created_only_for_reported_keys(mock_device, mock_coordinator):
+    """Only descriptions whose key the device reported become entities."""
+    from custom_components.renogy.sensor import create_entities_helper
+
+    mock_device.address = "/dev/ttyUSB0"
+    entities = create_entities_helper(
+        mock_coordinator, mock_device, "controller", {BATTERY_VOLTAGE, PV_POWER}
+    )
+    assert sorted(entity.entity_description.key for entity in entities) == [
+        BATTERY_VOLTAGE,
+        PV_POWER,
+    ]
+    assert entities[0].unique_id == "/dev/ttyUSB0_battery_voltage"
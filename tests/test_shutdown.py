@@ -0,0 +1,81 @@
+"""Tests for the bounded shutdown of in-flight polls."""
+
+import asyncio
+
+import pytest
+
+from custom_components.renogy.shutdown import async_finish_task
+from custom_components.renogy.transport import RtuOverTcpTransport
+
+
+@pytest.mark.asyncio
+async def test_finished_task_is_not_cancelled():
+    """A poll that stops at its next block boundary is left to finish."""
+    task = asyncio.ensure_future(asyncio.sleep(0.01, result="done"))
+    assert await async_finish_task(task, 1.0)
+    assert task.result() == "done"
+
+
+@pytest.mark.asyncio
+async def test_hung_device_is_cancelled_at_deadline():
+    """A request to a device that never answers is cut off at the deadline."""
+    requests = []
+
+    async def hung_device(reader, writer):
+        # Accept the request, then never answer it
+        requests.append(await reader.readexactly(8))
+        await asyncio.sleep(3600)
+
+    server = await asyncio.start_server(hung_device, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    transport = RtuOverTcpTransport("127.0.0.1", port, timeout=30)
+    try:
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(transport.async_read_registers(0x01, 0x0100, 2))
+        await asyncio.sleep(0.1)
+        assert requests
+
+        start = loop.time()
+        assert not await async_finish_task(task, 0.2)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert loop.time() - start < 0.5
+        # The connection is dropped so a late answer can't be misread
+        assert transport._writer is None
+    finally:
+        transport.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_unload_cancels_poll_of_hung_device(make_coordinator, controller):
+    """Closing the coordinator cuts off a poll stuck on a silent device."""
+    coordinator = make_coordinator(shutdown_timeout=0.2)
+    controller.hung = True
+    poll = asyncio.ensure_future(coordinator.async_refresh())
+    while not controller.reads:
+        await asyncio.sleep(0.001)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await coordinator.async_close()
+    assert loop.time() - start < 0.5
+    # The caller that requested the refresh sees a failed update, not a cancellation
+    await poll
+    assert not coordinator.last_update_success
+    assert coordinator._refresh.task is None
+
+
+@pytest.mark.asyncio
+async def test_unload_lets_a_slow_poll_finish(make_coordinator, controller):
+    """A poll answering within the deadline completes before the bus closes."""
+    coordinator = make_coordinator(shutdown_timeout=1.0)
+    controller.delays[0x0100] = 0.1
+    poll = asyncio.ensure_future(coordinator.async_refresh())
+    while 0x0100 not in controller.reads:
+        await asyncio.sleep(0.001)
+
+    await coordinator.async_close()
+    await poll
+    assert coordinator.last_update_success
+    assert coordinator.data["battery_voltage"] == 0.1
@@ -0,0 +1,67 @@
+"""Tests for refresh coalescing."""
+
+import asyncio
+
+import pytest
+
+from custom_components.renogy.singleflight import SingleFlight
+
+
+class Hass:
+    """Just enough of Home Assistant to create tasks."""
+
+    def async_create_task(self, target, name=None, eager_start=True):
+        return asyncio.get_running_loop().create_task(target, name=name)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_cycle():
+    """Requests arriving during a cycle get its result instead of a new one."""
+    flight = SingleFlight(Hass(), "poll", freshness=5)
+    cycles = 0
+
+    async def cycle():
+        nonlocal cycles
+        cycles += 1
+        await asyncio.sleep(0.02)
+        return cycles
+
+    results = await asyncio.gather(*(flight.async_run(cycle()) for _ in range(5)))
+    assert results == [1] * 5
+    assert cycles == 1
+    assert flight.task is None
+    assert flight.fresh
+
+
+@pytest.mark.asyncio
+async def test_failures_are_shared_but_not_fresh():
+    """Every waiter sees the failure, and the next request tries again."""
+    flight = SingleFlight(Hass(), "poll", freshness=5)
+
+    async def cycle():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("no response")
+
+    results = await asyncio.gather(
+        flight.async_run(cycle()), flight.async_run(cycle()), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not flight.fresh
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_abort_cycle():
+    """One caller giving up leaves the cycle running for the others."""
+    flight = SingleFlight(Hass(), "poll", freshness=0)
+
+    async def cycle():
+        await asyncio.sleep(0.02)
+        return "data"
+
+    impatient = asyncio.ensure_future(flight.async_run(cycle()))
+    patient = asyncio.ensure_future(flight.async_run(cycle()))
+    await asyncio.sleep(0.005)
+    impatient.cancel()
+    assert await patient == "data"
+    # With no freshness window, a finished cycle is never reused
+    assert not flight.fresh
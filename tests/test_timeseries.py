@@ -0,0 +1,189 @@
+"""Tests for the memory-mapped time-series store."""
+
+import math
+
+import pytest
+
+from custom_components.renogy import timeseries
+from custom_components.renogy.timeseries import SampleClock, Tier, TimeSeriesStore
+
+KEYS = ("battery_voltage", "pv_power")
+TIERS = (Tier("raw", 0, 8), Tier("1min", 60, 4))
+
+
+def _store(path, keys=KEYS, tiers=TIERS):
+    store = TimeSeriesStore(str(path), keys, tiers)
+    store.open()
+    return store
+
+
+def test_samples_survive_reopening(tmp_path):
+    """Appended samples are read back after the file is closed and reopened."""
+    path = tmp_path / "history" / "device.ts"
+    store = _store(path)
+    store.append(100.0, {"battery_voltage": 13.2, "pv_power": 120})
+    store.append(105.0, {"battery_voltage": 13.3, "pv_power": None})
+    store.close()
+
+    store = _store(path)
+    try:
+        assert store.query(0, 200, tier="raw") == {
+            "tier": "raw",
+            "keys": list(KEYS),
+            "rows": [[100.0, 13.2, 120.0], [105.0, 13.3, None]],
+        }
+        assert store.query(104, 106, ["pv_power"], "raw")["rows"] == [[105.0, None]]
+    finally:
+        store.close()
+
+
+def test_buckets_are_downsampled_to_their_means(tmp_path):
+    """A bucket's mean is stored once a sample from the next bucket arrives."""
+    store = _store(tmp_path / "device.ts")
+    for timestamp, voltage in ((60, 12.0), (90, 13.0), (110, None), (125, 14.0)):
+        store.append(float(timestamp), {"battery_voltage": voltage, "pv_power": 0})
+
+    assert store.query(0, 200, tier="1min")["rows"] == [[60.0, 12.5, 0.0]]
+    store.close()
+
+
+def test_partial_buckets_are_written_on_closing(tmp_path):
+    """The bucket in progress is kept at closing, and not written twice after."""
+    path = tmp_path / "device.ts"
+    store = _store(path)
+    store.append(60.0, {"battery_voltage": 12.0})
+    store.append(70.0, {"battery_voltage": 13.0})
+    store.close()
+
+    store = _store(path)
+    try:
+        assert store.query(0, 200, tier="1min")["rows"] == [[60.0, 12.5, None]]
+        # The rest of the bucket is not continued after reopening
+        store.append(100.0, {"battery_voltage": 14.0})
+        store.append(130.0, {"battery_voltage": 15.0})
+        assert store.query(0, 200, tier="1min")["rows"] == [[60.0, 12.5, None]]
+        store.append(185.0, {"battery_voltage": 16.0})
+        assert store.query(0, 200, tier="1min")["rows"] == [
+            [60.0, 12.5, None],
+            [120.0, 15.0, None],
+        ]
+    finally:
+        store.close()
+
+
+def test_full_ring_overwrites_the_oldest_rows(tmp_path):
+    """Once full, a tier keeps only its most recent rows, in order."""
+    store = _store(tmp_path / "device.ts")
+    for timestamp in range(12):
+        store.append(float(timestamp), {"pv_power": timestamp})
+
+    rows = store.query(0, 100, ["pv_power"], "raw")["rows"]
+    assert rows == [[float(index), float(index)] for index in range(4, 12)]
+    assert store.query(5.5, 8, ["pv_power"], "raw")["rows"] == [
+        [6.0, 6.0],
+        [7.0, 7.0],
+        [8.0, 8.0],
+    ]
+    store.close()
+
+
+def test_samples_out_of_order_are_dropped(tmp_path):
+    """A sample not newer than the last one is ignored."""
+    store = _store(tmp_path / "device.ts")
+    store.append(10.0, {"pv_power": 1})
+    store.append(10.0, {"pv_power": 2})
+    store.append(5.0, {"pv_power": 3})
+    assert store.query(0, 100, ["pv_power"], "raw")["rows"] == [[10.0, 1.0]]
+    store.close()
+
+
+def test_clock_carries_on_through_backward_steps(monkeypatch):
+    """Timestamps keep increasing while the wall clock is behind the last one."""
+    readings = iter([(1000.0, 10.0), (995.0, 15.0), (1004.0, 20.0), (1030.0, 25.0)])
+    wall = monotonic = None
+
+    def tick():
+        nonlocal wall, monotonic
+        wall, monotonic = next(readings)
+
+    monkeypatch.setattr(timeseries.time, "time", lambda: wall)
+    monkeypatch.setattr(timeseries.time, "monotonic", lambda: monotonic)
+    clock = SampleClock()
+    stamps = []
+    for _ in range(4):
+        tick()
+        stamps.append(clock.now())
+    # Stepped back 10 s: carried on by elapsed time until the wall clock caught up
+    assert stamps == [1000.0, 1005.0, 1010.0, 1030.0]
+
+
+def test_samples_after_closing_are_dropped(tmp_path):
+    """An append racing with closing does not write to the unmapped file."""
+    store = _store(tmp_path / "device.ts")
+    store.close()
+    store.append(1.0, {"pv_power": 1})
+
+
+def test_finest_tier_covering_the_start_is_chosen(tmp_path):
+    """Queries reaching past the raw samples are served from a coarser tier."""
+    store = _store(tmp_path / "device.ts")
+    for timestamp in range(0, 600, 30):
+        store.append(float(timestamp), {"pv_power": timestamp})
+
+    assert store.choose_tier(500) == "raw"
+    assert store.query(100, 600)["tier"] == "1min"
+    # Nothing covers a start before every tier; the one reaching back furthest wins
+    assert store.choose_tier(-1000) == "1min"
+    store.close()
+
+
+def test_aggregates(tmp_path):
+    """Aggregates skip missing values and report how many were found."""
+    store = _store(tmp_path / "device.ts")
+    for timestamp, power in ((1, 10), (2, None), (3, 30), (4, 50)):
+        store.append(float(timestamp), {"pv_power": power})
+
+    assert store.aggregate(0, 3, tier="raw") == {
+        "tier": "raw",
+        "aggregates": {
+            "battery_voltage": {"min": None, "max": None, "mean": None, "count": 0},
+            "pv_power": {"min": 10.0, "max": 30.0, "mean": 20.0, "count": 2},
+        },
+    }
+    store.close()
+
+
+def test_file_with_another_layout_is_recreated(tmp_path):
+    """A file written for other values or tiers is started afresh."""
+    path = tmp_path / "device.ts"
+    store = _store(path)
+    store.append(1.0, {"pv_power": 1})
+    store.close()
+
+    store = _store(path, keys=("pv_power",))
+    assert store.query(0, 10, tier="raw")["rows"] == []
+    store.close()
+
+
+def test_closed_store_refuses_queries(tmp_path):
+    """Querying after closing raises instead of reading an unmapped file."""
+    store = _store(tmp_path / "device.ts")
+    store.close()
+    with pytest.raises(ValueError):
+        store.query(0, math.inf)
+
+
+@pytest.mark.asyncio
+async def test_polls_are_recorded(hass, make_coordinator):
+    """Each poll of a device with high-rate history adds a sample."""
+    coordinator = make_coordinator(refresh_freshness=0)
+    await coordinator.async_set_timeseries(True)
+    try:
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+        result = await hass.async_add_executor_job(
+            coordinator.timeseries.query, 0, math.inf, ["pv_power"], "raw"
+        )
+        assert [row[1] for row in result["rows"]] == [9.0, 9.0]
+    finally:
+        await coordinator.async_close()